@@ -48,7 +48,11 @@ from numpy import log, sqrt, exp
 
 # Local application/library specific imports
 from vollib.helper import binary_flag
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import is_vectorized
 from vollib.helper import pdf
+from vollib.helper import curve_cache
+from vollib.helper import vectorized_lets_be_rational
 from lets_be_rational import norm_cdf as cnd
 
 # -----------------------------------------------------------------------------
@@ -229,9 +233,19 @@ def undiscounted_black(F, K, sigma, t, flag):
     >>> t = .5
     >>> undiscounted_black(F, K, sigma, t, flag)
     5.637197779701664
+
+    Any argument may also be a numpy array, in which case the arguments
+    are broadcast against each other and an array of prices is returned.
+
+    >>> prices = undiscounted_black(F, numpy.array([90, 100, 110]), sigma, t, ['p', 'c', 'c'])
+    >>> abs(prices[1] - undiscounted_black(F, K, sigma, t, flag)) < 1e-12
+    True
     
     """
 
+    if is_vectorized(F, K, sigma, t, flag):
+        return vectorized_lets_be_rational.black(F, K, sigma, t, vectorized_binary_flag(flag))
+
     q = binary_flag[flag]
     F = float(F)
     K = float(K)
@@ -265,8 +279,7 @@ def black(flag, F, K, t, r, sigma):
 
     """
     
-    discount_factor = e_to_the_minus_rt = numpy.exp(-r*t)        
-    return undiscounted_black(F, K, sigma, t, flag) * discount_factor
+    return undiscounted_black(F, K, sigma, t, flag) * curve_cache.discount_factor(r, t)
     
 
 
@@ -298,6 +311,9 @@ def normalised_black(x, s, flag):
     
     """
 
+    if is_vectorized(x, s, flag):
+        return vectorized_lets_be_rational.normalised_black(x, s, vectorized_binary_flag(flag))
+
     q = binary_flag[flag]
     
     return lets_be_rational.normalised_black(x, s, q)
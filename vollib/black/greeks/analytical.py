@@ -42,6 +42,11 @@ import numpy
 # Local application/library specific imports
 from lets_be_rational import norm_cdf as cnd
 from vollib.helper import pdf
+from vollib.helper import curve_cache
+from vollib.helper import binary_flag
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import is_vectorized
+from vollib.helper.normaldistribution import norm_cdf
 from vollib.black import d1,d2, black
 
 # -----------------------------------------------------------------------------
@@ -84,9 +89,9 @@ def delta(flag, F, K, t, r, sigma):
     D1 = d1(F, K, t, r, sigma)
 
     if flag == 'p':
-        return - numpy.exp(-r*t) * cnd(-D1)
+        return - curve_cache.discount_factor(r, t) * cnd(-D1)
     else:
-        return numpy.exp(-r*t) * cnd(D1)
+        return curve_cache.discount_factor(r, t) * cnd(D1)
 
 
 def theta(flag, F, K, t, r, sigma):
@@ -126,7 +131,7 @@ def theta(flag, F, K, t, r, sigma):
     True
     """
 
-    e_to_the_minus_rt = numpy.exp(-r*t)
+    e_to_the_minus_rt = curve_cache.discount_factor(r, t)
     two_sqrt_t = 2 * numpy.sqrt(t)
 
     D1 = d1(F, K, t, r, sigma)
@@ -183,7 +188,7 @@ def gamma(flag, F, K, t, r, sigma):
     
 
     D1 = d1(F, K, t, r, sigma)
-    return pdf(D1)*numpy.exp(-r*t)/(F*sigma*numpy.sqrt(t))
+    return pdf(D1)*curve_cache.discount_factor(r, t)/(F*sigma*numpy.sqrt(t))
 
 
 def vega(flag, F, K, t, r, sigma):
@@ -230,7 +235,7 @@ def vega(flag, F, K, t, r, sigma):
     """
 
     D1 = d1(F, K, t, r, sigma)
-    return F * numpy.exp(-r*t) * pdf(D1) * numpy.sqrt(t) * 0.01
+    return F * curve_cache.discount_factor(r, t) * pdf(D1) * numpy.sqrt(t) * 0.01
 
 
 def rho(flag, F, K, t, r, sigma):
@@ -281,6 +286,79 @@ def rho(flag, F, K, t, r, sigma):
     return -t * black(flag, F, K, t, r, sigma) * .01
 
 
+def all_greeks(flag, F, K, t, r, sigma):
+
+    """Return the Black price and all first order greeks of an option on
+    a futures contract in one pass.
+
+    d1, d2, their normal distribution values, pdf(d1), sqrt(t) and the
+    discount factor are computed once and shared; rho and theta are
+    derived from the price rather than by pricing the option again.  The
+    greeks follow the same conventions as delta, gamma, theta, vega and
+    rho: theta is per calendar day, vega and rho per percentage point.
+
+    Arrays may be passed for any argument, including an array of 'c' and
+    'p' flags; the arguments are broadcast against each other.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param F: underlying futures price
+    :type F: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: annual risk-free interest rate
+    :type r: float
+    :param sigma: volatility
+    :type sigma: float
+
+    :returns: dict with keys 'price', 'delta', 'gamma', 'theta', 'vega' and 'rho'
+
+    >>> F = 49
+    >>> K = 50
+    >>> r = .05
+    >>> t = 0.3846
+    >>> sigma = 0.2
+    >>> greeks = all_greeks('p', F, K, t, r, sigma)
+    >>> sorted(greeks)
+    ['delta', 'gamma', 'price', 'rho', 'theta', 'vega']
+    >>> abs(greeks['theta'] - theta('p', F, K, t, r, sigma)) < 1e-12
+    True
+    >>> greeks = all_greeks(['c', 'p'], F, numpy.array([45., 55.]), t, r, sigma)
+    >>> abs(greeks['rho'][1] - rho('p', F, 55., t, r, sigma)) < 1e-12
+    True
+    """
+
+    if is_vectorized(flag, F, K, t, r, sigma):
+        q = vectorized_binary_flag(flag)
+        N = norm_cdf
+    else:
+        q = binary_flag[flag]
+        N = cnd
+
+    sqrt_t = numpy.sqrt(t)
+    sigma_sqrt_t = sigma * sqrt_t
+    discount_factor = curve_cache.discount_factor(r, t)
+    D1 = numpy.log(F / numpy.asarray(K, dtype=float)) / sigma_sqrt_t + sigma_sqrt_t / 2.
+    D2 = D1 - sigma_sqrt_t
+
+    # N(d1) and N(d2) of a call, N(-d1) and N(-d2) of a put
+    N_d1 = N(q * D1)
+    N_d2 = N(q * D2)
+    discounted_pdf_d1 = discount_factor * pdf(D1)
+    price = discount_factor * q * (F * N_d1 - K * N_d2)
+
+    return {
+        'price': price,
+        'delta': discount_factor * q * N_d1,
+        'gamma': discounted_pdf_d1 / (F * sigma_sqrt_t),
+        'theta': (-F * discounted_pdf_d1 * sigma / (2 * sqrt_t) + r * price) / 365.,
+        'vega': F * discounted_pdf_d1 * sqrt_t * 0.01,
+        'rho': -t * price * .01,
+    }
+
+
 # -----------------------------------------------------------------------------
 # MAIN
 if __name__=='__main__':  
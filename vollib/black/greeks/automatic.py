@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.black.greeks.automatic
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Exact first and second order Black greeks of many options from a
+      single evaluation of the Black formula on dual numbers, see
+      vollib.helper.automatic_greeks.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.automatic_greeks import generalized_black_scholes
+from vollib.helper.automatic_greeks import all_greeks as automatic_all_greeks
+from vollib.helper.automatic_greeks import GREEKS
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - AUTOMATIC GREEK CALCULATION
+
+f = lambda binary_flag, F, K, t, r, sigma: generalized_black_scholes(binary_flag, F, K, t, r, sigma, 0.)
+
+
+def all_greeks(flag, F, K, t, r, sigma, greeks=GREEKS):
+
+    """Return the Black price and several greeks of one or many options,
+    differentiated exactly in one evaluation.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param F: underlying futures price
+    :type F: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float or numpy.ndarray
+    :param greeks: names of the greeks to calculate, a subset of
+        vollib.helper.automatic_greeks.GREEKS
+    :type greeks: sequence of str
+
+    :returns: dict mapping 'price' and each requested greek to an array of the broadcast shape
+
+    >>> from vollib.black.greeks.analytical import vega
+    >>> greeks = all_greeks(['c', 'p'], 49., 50., .3846, .05, .2, greeks=['vega', 'volga'])
+    >>> abs(greeks['vega'][1] - vega('p', 49., 50., .3846, .05, .2)) < 1e-12
+    True
+    """
+
+    return automatic_all_greeks(flag, F, K, t, r, sigma, f, greeks)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
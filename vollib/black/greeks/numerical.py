@@ -42,6 +42,8 @@ from vollib.helper.numerical_greeks import vega as numerical_vega
 from vollib.helper.numerical_greeks import theta as numerical_theta
 from vollib.helper.numerical_greeks import rho as numerical_rho
 from vollib.helper.numerical_greeks import gamma as numerical_gamma
+from vollib.helper.numerical_greeks import all_greeks as numerical_all_greeks
+from vollib.helper.numerical_greeks import GREEKS
 
 from vollib.black.greeks.analytical import gamma as agamma
 from vollib.black.greeks.analytical import delta as adelta
@@ -175,6 +177,36 @@ def gamma(flag, F, K, t, r, sigma):
     return numerical_gamma(flag, F, K, t, r, sigma, b, f)
 
 
+def all_greeks(flag, F, K, t, r, sigma, greeks=GREEKS):
+
+    """Return several Black numerical greeks of one or many options,
+    repricing every bumped input only once.
+
+    :param F: underlying futures price
+    :type F: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param greeks: names of the greeks to calculate
+    :type greeks: sequence of str
+
+    >>> greeks = all_greeks(['c', 'p'], 49, 50, 0.3846, .05, 0.2, greeks=['vega'])
+    >>> abs(greeks['vega'][1] - vega('p', 49, 50, 0.3846, .05, 0.2)) < 1e-12
+    True
+    """
+
+    b = 0
+
+    return numerical_all_greeks(flag, F, K, t, r, sigma, b, f, greeks)
+
+
 
 def test():
     
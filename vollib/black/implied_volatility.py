@@ -46,6 +46,14 @@ import numpy
 from vollib.black import black
 from vollib.black import undiscounted_black
 from vollib.black import normalised_black
+from vollib.black.lookup_table import default_normalised_implied_volatility_table
+from vollib.helper import curve_cache
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import vectorized_lets_be_rational
+from vollib.helper import IV_CONVERGED
+from vollib.helper import IV_BELOW_INTRINSIC
+from vollib.helper import IV_ABOVE_MAXIMUM
+from vollib.helper import IV_INVALID_INPUT
 
 # -----------------------------------------------------------------------------
 # DATA
@@ -54,6 +62,34 @@ CALL = 'c'
 PUT = 'p'
 binary_flag = {CALL:1,PUT:-1}
 
+# LetsBeRational signals quotes without a solution with these volatilities
+VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC = \
+    vectorized_lets_be_rational.VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM = \
+    vectorized_lets_be_rational.VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+
+# Householder(3) iterations after which LetsBeRational has reached machine
+# precision from its initial guess
+DEFAULT_MAXIMUM_ITERATIONS = vectorized_lets_be_rational.IMPLIED_VOLATILITY_MAXIMUM_ITERATIONS
+
+# Relative step below which the Householder(3) iteration stops, as a Python
+# float for the scalar functions
+DBL_EPSILON = float(vectorized_lets_be_rational.DBL_EPSILON)
+
+# Absolute tolerance on the volatility, and Householder(3) refinement steps,
+# of the approximate implied volatilities
+DEFAULT_APPROXIMATE_TOLERANCE = 1.0e-4
+DEFAULT_APPROXIMATE_ITERATIONS = 1
+
+# Solvers of the vectorized implied volatility functions: a loop over the
+# compiled LetsBeRational, or its numpy port in
+# vollib.helper.vectorized_lets_be_rational.  The port is slower, about half
+# the speed of the loop on large batches, and is only needed for tolerances
+# and iteration counts.
+LETS_BE_RATIONAL = 'lets_be_rational'
+NUMPY = 'numpy'
+DEFAULT_SOLVER = LETS_BE_RATIONAL
+
 # -----------------------------------------------------------------------------
 # FUNCTIONS - IMPLIED VOLATILITY
 
@@ -184,7 +220,7 @@ def implied_volatility_of_discounted_option_price(discounted_option_price, F, K,
     5.5811067246 0.2
     """
     
-    discount_factor = numpy.exp(-r*t)
+    discount_factor = curve_cache.discount_factor(r, t)
     undiscounted_option_price = discounted_option_price / discount_factor
     
     return lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
@@ -236,6 +272,718 @@ def implied_volatility_of_undiscounted_option_price_limited_iterations(
         N
     )
 
+
+def normalised_implied_volatility_with_tolerance(
+    beta, x, flag, tolerance=None, max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the normalised Black implied volatility to within an
+    absolute tolerance, and return it with the number of iterations used.
+
+    The Householder(3) iteration stops as soon as its last step is below
+    tolerance, or after max_iterations steps; with tolerance None it runs
+    to machine precision, as normalised_implied_volatility does.  The
+    iterations are counted by running the compiled LetsBeRational with 0,
+    1, 2, ... iterations, see
+    implied_volatility_of_undiscounted_option_price_with_tolerance.
+
+    :param beta: the normalized Black price
+    :type beta: float
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float
+    :param flag: 'p' or 'c' for put or call
+    :type flag: str
+    :param tolerance: absolute tolerance on the normalised volatility, or None
+    :type tolerance: float
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (float, int)
+
+    >>> beta = normalised_black(0.0, 0.2, 'c')
+    >>> s, iterations = normalised_implied_volatility_with_tolerance(beta, 0.0, 'c', 1e-2)
+    >>> abs(s - 0.2) < 1e-2, iterations
+    (True, 1)
+    """
+
+    return _limited_iterations_with_tolerance(
+        lets_be_rational.normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations,
+        (beta, x, binary_flag[flag]), tolerance, max_iterations)
+
+
+def implied_volatility_of_undiscounted_option_price_with_tolerance(
+    undiscounted_option_price, F, K, t, flag, tolerance=None, max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the implied volatility of the undiscounted Black option
+    price to within an absolute tolerance, and return it with the number
+    of iterations used.
+
+    The Householder(3) iteration stops as soon as its last step is below
+    tolerance, or after max_iterations steps; as it converges with fourth
+    order, the error is then far below tolerance.  With tolerance None it
+    runs to machine precision, as
+    implied_volatility_of_undiscounted_option_price does.  Prices without
+    an implied volatility give the same sentinel values.
+
+    The compiled LetsBeRational does not report its iterations, so it is
+    run with 0, 1, 2, ... iterations until its last step is below
+    tolerance.  This makes the function slower than
+    implied_volatility_of_undiscounted_option_price, which runs it once:
+    about 3 times at machine precision, and 2 times with a tolerance that
+    saves the last run.  Use it for the iteration counts, not for speed.
+
+    :param undiscounted_option_price: undiscounted Black price of a futures option
+    :type undiscounted_option_price: float
+    :param F: underlying futures price
+    :type F: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param flag: 'p' or 'c' for put or call
+    :type flag: str
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (float, int)
+
+    >>> price = undiscounted_black(100, 110, .2, .5, 'c')
+    >>> iv, iterations = implied_volatility_of_undiscounted_option_price_with_tolerance(
+    ... price, 100, 110, .5, 'c', 1e-3)
+    >>> abs(iv - .2) < 1e-3, iterations
+    (True, 1)
+    """
+
+    return _limited_iterations_with_tolerance(
+        lets_be_rational.implied_volatility_from_a_transformed_rational_guess_with_limited_iterations,
+        (undiscounted_option_price, F, K, t, binary_flag[flag]), tolerance, max_iterations)
+
+
+def implied_volatility_of_discounted_option_price_with_tolerance(
+    discounted_option_price, F, K, r, t, flag, tolerance=None, max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the implied volatility of the Black option price to
+    within an absolute tolerance, and return it with the number of
+    iterations used.
+
+    See implied_volatility_of_undiscounted_option_price_with_tolerance.
+
+    :param discounted_option_price: discounted Black price of a futures option
+    :type discounted_option_price: float
+    :param F: underlying futures price
+    :type F: float
+    :param K: strike price
+    :type K: float
+    :param r: the risk-free interest rate
+    :type r: float
+    :param t: time to expiration in years
+    :type t: float
+    :param flag: 'p' or 'c' for put or call
+    :type flag: str
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (float, int)
+
+    >>> price = black('p', 100, 90, .5, .02, .2)
+    >>> iv, iterations = implied_volatility_of_discounted_option_price_with_tolerance(
+    ... price, 100, 90, .02, .5, 'p')
+    >>> round(iv, 12), iterations <= DEFAULT_MAXIMUM_ITERATIONS
+    (0.2, True)
+    """
+
+    undiscounted_option_price = discounted_option_price / curve_cache.discount_factor(r, t)
+    return implied_volatility_of_undiscounted_option_price_with_tolerance(
+        undiscounted_option_price, F, K, t, flag, tolerance, max_iterations)
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - VECTORIZED IMPLIED VOLATILITY
+
+def implied_volatility_status(sigma, t=None):
+
+    """Split the raw output of LetsBeRational into implied volatilities and
+    per-element status codes.
+
+    Quotes below intrinsic value or above the maximum option value have no
+    implied volatility; they are returned as nan with status
+    IV_BELOW_INTRINSIC or IV_ABOVE_MAXIMUM respectively, and all other
+    elements with status IV_CONVERGED.
+
+    LetsBeRational divides the sentinel values of its normalised solver by
+    sqrt(t), e.g. for prices a few ulps below the maximum.  Pass the times
+    to expiration to recognise these as well.
+
+    :param sigma: volatilities as returned by LetsBeRational
+    :type sigma: numpy.ndarray
+    :param t: times to expiration in years, or None
+    :type t: float or numpy.ndarray
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray)
+
+    >>> sigma, status = implied_volatility_status(numpy.array([
+    ...     0.2, VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC]))
+    >>> sigma.tolist(), status.tolist()
+    ([0.2, nan], [0, 1])
+    >>> sigma, status = implied_volatility_status(numpy.array([
+    ...     0.2, VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM / 2.]), 4.)
+    >>> sigma.tolist(), status.tolist()
+    ([0.2, nan], [0, 2])
+    """
+
+    sigma = numpy.array(sigma, dtype=float)
+    status = numpy.zeros(sigma.shape, dtype=int)
+    status.fill(IV_CONVERGED)
+    below = sigma == VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+    above = sigma == VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+    if t is not None:
+        with numpy.errstate(over='ignore'):
+            sqrt_t = numpy.sqrt(t)
+            below |= sigma == VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC / sqrt_t
+            above |= sigma == VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM / sqrt_t
+    status[below] = IV_BELOW_INTRINSIC
+    status[above] = IV_ABOVE_MAXIMUM
+    sigma[below | above] = numpy.nan
+    return sigma, status
+
+
+def arbitrage_bounds_status(discounted_option_price, F, K, r, t, flag):
+
+    """Check discounted Black option prices against the no-arbitrage
+    bounds of their discounted forwards, without solving for any implied
+    volatility.
+
+    A call price must be at least its discounted intrinsic value
+    exp(-r*t)*max(F-K, 0) and below the discounted forward exp(-r*t)*F; a
+    put price must be at least exp(-r*t)*max(K-F, 0) and below the
+    discounted strike exp(-r*t)*K.  Quotes outside these bounds have no
+    implied volatility, and the vectorized implied volatility functions
+    do not pass them to the solver at all.
+
+    :param discounted_option_price: discounted Black prices of futures options
+    :type discounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+
+    :returns: numpy.ndarray of IV_CONVERGED for quotes within the bounds,
+        IV_BELOW_INTRINSIC, IV_ABOVE_MAXIMUM or IV_INVALID_INPUT
+
+    >>> K = numpy.array([90., 110., 110., 110.])
+    >>> prices = numpy.array([5., 2., 120., numpy.nan])
+    >>> arbitrage_bounds_status(prices, 100., K, .02, .5, 'c').tolist()
+    [1, 0, 2, 3]
+    """
+
+    price, F, K, r, t, q, shape = vectorized_lets_be_rational._as_float_arrays(
+        discounted_option_price, F, K, r, t, vectorized_binary_flag(flag))
+    return _arbitrage_bounds_status(price, F, K, t, q, curve_cache.discount_factor(r, t)).reshape(shape)
+
+
+def prefiltered_implied_volatility(discounted_option_price, F, K, t, q, discount_factor, solve):
+
+    """Return the implied volatilities and status codes of flat arrays of
+    discounted Black option prices, passing only the quotes within the
+    no-arbitrage bounds to a solver.
+
+    This is the common front end of the batch implied volatility
+    functions of vollib: quotes with invalid inputs are flagged
+    IV_INVALID_INPUT and quotes outside the bounds IV_BELOW_INTRINSIC or
+    IV_ABOVE_MAXIMUM, as by arbitrage_bounds_status, without being solved.
+    The sentinel values the solver returns for the other quotes are mapped
+    to status codes by implied_volatility_status.
+
+    :param discounted_option_price: discounted Black prices of futures options
+    :type discounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: numpy.ndarray
+    :param K: strike prices
+    :type K: numpy.ndarray
+    :param t: times to expiration in years
+    :type t: numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: numpy.ndarray
+    :param discount_factor: the discount factors exp(-r*t)
+    :type discount_factor: numpy.ndarray
+    :param solve: a function of the indices of the quotes to solve and of
+        their undiscounted prices, which returns their implied
+        volatilities with the sentinel values of LetsBeRational
+    :type solve: python function object
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+    >>> F, K, t, q = [numpy.array([100., 100., -1.]), numpy.array([90., 90., 90.]),
+    ...               numpy.array([.5, .5, .5]), numpy.array([1., 1., 1.])]
+    >>> discount_factor = numpy.exp(-.02 * t)
+    >>> prices = black('c', 100., 90., .5, .02, numpy.array([.2, 0., .2]))
+    >>> prices[1] = 1.
+    >>> solve = lambda i, price: vectorized_lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
+    ...     price, F[i], K[i], t[i], q[i])
+    >>> sigma, status = prefiltered_implied_volatility(prices, F, K, t, q, discount_factor, solve)
+    >>> sigma.round(12).tolist(), status.tolist()
+    ([0.2, nan, nan], [0, 1, 3])
+    """
+
+    status = _arbitrage_bounds_status(discounted_option_price, F, K, t, q, discount_factor)
+    sigma = numpy.empty(status.shape)
+    sigma.fill(numpy.nan)
+
+    i = numpy.flatnonzero(status == IV_CONVERGED)
+    if i.size:
+        solved = solve(i, discounted_option_price[i] / discount_factor[i])
+        # Quotes on the bounds up to rounding are still flagged by the solver.
+        sigma[i], status[i] = implied_volatility_status(solved, t[i])
+    return sigma, status
+
+
+def vectorized_implied_volatility_of_undiscounted_option_price(
+    undiscounted_option_price, F, K, t, flag, solver=DEFAULT_SOLVER):
+
+    """Calculate the implied volatilities of an array of undiscounted
+    Black option prices.
+
+    The arguments are broadcast against each other and the quotes are
+    solved by the compiled LetsBeRational, or, with solver=NUMPY, all at
+    once by its slower numpy port in
+    vollib.helper.vectorized_lets_be_rational.  Both give the same results.  Rather than failing the whole batch,
+    quotes without an implied volatility are returned as nan and flagged
+    in the status array.  Quotes outside the no-arbitrage bounds, or with
+    invalid inputs, are flagged before the solver runs and are not solved
+    at all; see arbitrage_bounds_status.
+
+    :param undiscounted_option_price: undiscounted Black prices of futures options
+    :type undiscounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param solver: LETS_BE_RATIONAL, the faster default, or NUMPY
+    :type solver: str
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+    >>> F = 100
+    >>> K = numpy.array([90, 100, 110])
+    >>> t = .5
+    >>> flag = ['c', 'p', 'c']
+    >>> prices = undiscounted_black(F, K, numpy.array([.2, .25, .3]), t, flag)
+    >>> prices[2] = 0.0001
+    >>> sigma, status = vectorized_implied_volatility_of_undiscounted_option_price(
+    ... prices, F, K, t, flag)
+    >>> sigma.round(10).tolist(), status.tolist()
+    ([0.2, 0.25, 0.0372454958], [0, 0, 0])
+
+    >>> sigma, status = vectorized_implied_volatility_of_undiscounted_option_price(
+    ... [5., 2., 120.], F, K, t, flag)
+    >>> sigma[2], status.tolist()
+    (nan, [1, 0, 2])
+    >>> sigma, status = vectorized_implied_volatility_of_undiscounted_option_price(
+    ... prices, F, K, t, flag, solver=NUMPY)
+    >>> sigma.round(10).tolist(), status.tolist()
+    ([0.2, 0.25, 0.0372454958], [0, 0, 0])
+    """
+
+    sigma, status, iterations = _vectorized_implied_volatility(
+        undiscounted_option_price, F, K, 0., t, flag, solver=solver)
+    return sigma, status
+
+
+def vectorized_implied_volatility_of_discounted_option_price(
+    discounted_option_price, F, K, r, t, flag, solver=DEFAULT_SOLVER):
+
+    """Calculate the implied volatilities of an array of discounted
+    Black option prices.
+
+    See vectorized_implied_volatility_of_undiscounted_option_price.
+
+    :param discounted_option_price: discounted Black prices of futures options
+    :type discounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param solver: LETS_BE_RATIONAL, the faster default, or NUMPY
+    :type solver: str
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+    >>> F = 100
+    >>> K = numpy.array([90, 100, 110])
+    >>> r = .02
+    >>> t = .5
+    >>> prices = black('p', F, K, t, r, .2)
+    >>> sigma, status = vectorized_implied_volatility_of_discounted_option_price(
+    ... prices, F, K, r, t, 'p')
+    >>> sigma.round(12).tolist(), status.tolist()
+    ([0.2, 0.2, 0.2], [0, 0, 0])
+    """
+
+    sigma, status, iterations = _vectorized_implied_volatility(
+        discounted_option_price, F, K, r, t, flag, solver=solver)
+    return sigma, status
+
+
+def vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance(
+    undiscounted_option_price, F, K, t, flag, tolerance=None, max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the implied volatilities of an array of undiscounted
+    Black option prices to within an absolute tolerance, and return them
+    with their status codes and the number of iterations used per quote.
+
+    See vectorized_implied_volatility_of_undiscounted_option_price and
+    implied_volatility_of_undiscounted_option_price_with_tolerance.  The
+    quotes are always solved by the numpy port of LetsBeRational, which
+    supports tolerances and counts iterations, and which is slower than
+    the default compiled solver of
+    vectorized_implied_volatility_of_undiscounted_option_price: on 200000
+    quotes about 1.6 times at machine precision and still 1.2 times with a
+    tolerance of 1e-2.  Use this function for the iteration counts, not
+    for speed.
+
+    :param undiscounted_option_price: undiscounted Black prices of futures options
+    :type undiscounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float or numpy.ndarray
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray, numpy.ndarray) of volatilities, status codes and iterations
+
+    >>> K = numpy.array([90, 100, 110])
+    >>> prices = undiscounted_black(100, K, .2, .5, 'c')
+    >>> prices[2] = 0.
+    >>> sigma, status, iterations = vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance(
+    ... prices, 100, K, .5, 'c', 1e-3)
+    >>> sigma.round(3).tolist(), status.tolist(), iterations.tolist()
+    ([0.2, 0.2, 0.0], [0, 0, 0], [1, 1, 0])
+    """
+
+    return _vectorized_implied_volatility(
+        undiscounted_option_price, F, K, 0., t, flag, tolerance, max_iterations, NUMPY)
+
+
+def vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+    discounted_option_price, F, K, r, t, flag, tolerance=None, max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the implied volatilities of an array of discounted Black
+    option prices to within an absolute tolerance, and return them with
+    their status codes and the number of iterations used per quote.
+
+    See vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance.
+
+    :param discounted_option_price: discounted Black prices of futures options
+    :type discounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float or numpy.ndarray
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray, numpy.ndarray) of volatilities, status codes and iterations
+
+    >>> K = numpy.array([90, 100, 110])
+    >>> prices = black('p', 100, K, .5, .02, .2)
+    >>> sigma, status, iterations = vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+    ... prices, 100, K, .02, .5, 'p')
+    >>> sigma.round(12).tolist(), status.tolist()
+    ([0.2, 0.2, 0.2], [0, 0, 0])
+    """
+
+    return _vectorized_implied_volatility(
+        discounted_option_price, F, K, r, t, flag, tolerance, max_iterations, NUMPY)
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _arbitrage_bounds_status(price, F, K, t, q, discount_factor):
+
+    """arbitrage_bounds_status of flat arrays, with the flags as +1/-1."""
+
+    status = numpy.zeros(price.shape, dtype=int)
+    status.fill(IV_CONVERGED)
+    with numpy.errstate(invalid='ignore'):
+        valid = numpy.isfinite(price) & numpy.isfinite(discount_factor) & \
+            (F > 0) & (K > 0) & (t > 0) & (F < numpy.inf) & (K < numpy.inf) & (t < numpy.inf)
+        intrinsic = discount_factor * numpy.maximum(numpy.where(q < 0, K - F, F - K), 0.0)
+        below = valid & (price < intrinsic)
+        above = valid & ~below & (price >= discount_factor * numpy.where(q < 0, K, F))
+    status[~valid] = IV_INVALID_INPUT
+    status[below] = IV_BELOW_INTRINSIC
+    status[above] = IV_ABOVE_MAXIMUM
+    return status
+
+
+def _vectorized_implied_volatility(discounted_option_price, F, K, r, t, flag, tolerance=None,
+                                   max_iterations=DEFAULT_MAXIMUM_ITERATIONS, solver=DEFAULT_SOLVER):
+
+    """The implied volatilities, status codes and iterations of discounted
+    Black prices, solving only the quotes within the no-arbitrage bounds.
+    The compiled solver does not report iterations, which are then 0."""
+
+    if solver not in (LETS_BE_RATIONAL, NUMPY):
+        raise ValueError('unknown implied volatility solver %r' % (solver,))
+    price, F, K, r, t, q, shape = vectorized_lets_be_rational._as_float_arrays(
+        discounted_option_price, F, K, r, t, vectorized_binary_flag(flag))
+    iterations = numpy.zeros(price.shape, dtype=int)
+    if tolerance is not None:
+        tolerance = numpy.broadcast_to(tolerance, shape).ravel()
+
+    def solve(i, undiscounted_price):
+        if solver == LETS_BE_RATIONAL:
+            return _compiled_implied_volatility(undiscounted_price, F[i], K[i], t[i], q[i])
+        solved, iterations[i] = vectorized_lets_be_rational.implied_volatility_and_iterations(
+            undiscounted_price, F[i], K[i], t[i], q[i], max_iterations,
+            None if tolerance is None else tolerance[i])
+        return solved
+
+    sigma, status = prefiltered_implied_volatility(price, F, K, t, q, curve_cache.discount_factor(r, t), solve)
+    return sigma.reshape(shape), status.reshape(shape), iterations.reshape(shape)
+
+def _limited_iterations_with_tolerance(solve, args, tolerance, max_iterations):
+
+    """Return the result of the compiled solve(*args + (N,)) with the
+    number N of iterations that the Householder(3) iteration of the numpy
+    port takes: a step is taken while the last one is above tolerance and
+    above DBL_EPSILON relative to the result.  A first step that changes
+    nothing, as for prices without an implied volatility, is not counted.
+    As the steps are taken from the results, a count beyond the two
+    iterations LetsBeRational needs for machine precision may be off by
+    one."""
+
+    result = solve(*args + (0,))
+    if max_iterations < 1:
+        return result, 0
+    refined = solve(*args + (1,))
+    if refined == result:
+        return result, 0
+    threshold = 0. if tolerance is None else tolerance
+    for iterations in range(2, max_iterations + 1):
+        step = abs(refined - result)
+        result = refined
+        if step <= threshold or step <= DBL_EPSILON * abs(result):
+            return result, iterations - 1
+        refined = solve(*args + (iterations,))
+    return refined, max_iterations
+
+
+def _compiled_implied_volatility(price, F, K, t, q):
+
+    """Implied volatilities of flat arrays of undiscounted Black prices,
+    solved one by one by the compiled LetsBeRational."""
+
+    solve = lets_be_rational.implied_volatility_from_a_transformed_rational_guess
+    return numpy.fromiter(
+        (solve(*args) for args in zip(price.tolist(), F.tolist(), K.tolist(), t.tolist(), q.tolist())),
+        dtype=float, count=price.size)
+
+
+def _approximate_normalised_implied_volatility_of_calls(beta, x, tolerance, max_iterations, table):
+
+    """The approximate normalised implied volatilities of out-of-the-money
+    call prices 0 <= beta < exp(x/2), x <= 0, as flat arrays."""
+
+    if table is None:
+        table = default_normalised_implied_volatility_table()
+    s = numpy.zeros_like(beta)
+
+    with numpy.errstate(all='ignore'):
+        # For zero prices we return 0.
+        i = numpy.flatnonzero(beta > 0)
+        beta, x, tolerance = beta[i], x[i], tolerance[i]
+
+        guess, error = table.guess(beta, x)
+        unsolved = error > tolerance
+        s[i[~unsolved]] = guess[~unsolved]
+
+        k = numpy.flatnonzero(unsolved & (guess > 0))
+        if k.size and max_iterations > 0:
+            s_left = numpy.empty(k.shape)
+            s_left.fill(vectorized_lets_be_rational.DBL_MIN)
+            s_right = numpy.empty(k.shape)
+            s_right.fill(vectorized_lets_be_rational.DBL_MAX)
+            objective = numpy.empty(k.shape, dtype=int)
+            objective.fill(vectorized_lets_be_rational.MIDDLE_SEGMENTS)
+            refined, iterations, ds = vectorized_lets_be_rational.householder_iteration(
+                beta[k], x[k], guess[k], s_left, s_right, objective, max_iterations, tolerance[k])
+            converged = numpy.abs(ds) <= tolerance[k]
+            s[i[k[converged]]] = refined[converged]
+            unsolved[k[converged]] = False
+
+        k = numpy.flatnonzero(unsolved)
+        if k.size:
+            s[i[k]], iterations = vectorized_lets_be_rational.\
+                unchecked_normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+                    beta[k], x[k], 1., vectorized_lets_be_rational.IMPLIED_VOLATILITY_MAXIMUM_ITERATIONS)
+
+    return s
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - APPROXIMATE IMPLIED VOLATILITY
+
+def approximate_normalised_implied_volatility(
+    beta, x, flag, tolerance, max_iterations=DEFAULT_APPROXIMATE_ITERATIONS, table=None):
+
+    """Calculate normalised Black implied volatilities to within an
+    absolute tolerance, rather than to machine precision.
+
+    Every quote starts from the tabulated guess of a
+    vollib.black.lookup_table.NormalisedImpliedVolatilityTable, which is
+    accepted as it is if the recorded error bound of its table cell is
+    within tolerance.  The other quotes are refined with up to
+    max_iterations Householder(3) steps, which stop as soon as a step is
+    within tolerance; as the iteration converges with fourth order, the
+    error after such a step is far below the step itself.  Quotes that are
+    still not within tolerance, or that lie off the table, are solved
+    exactly by LetsBeRational.  Sentinel values are as in
+    normalised_implied_volatility.
+
+    :param beta: normalised Black prices
+    :type beta: float or numpy.ndarray
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param tolerance: absolute tolerance on s = sigma*sqrt(t)
+    :type tolerance: float or numpy.ndarray
+    :param max_iterations: maximum number of refinement steps
+    :type max_iterations: int
+    :param table: the table of initial guesses, by default
+        vollib.black.lookup_table.default_normalised_implied_volatility_table()
+    :type table: NormalisedImpliedVolatilityTable
+
+    :returns: float or numpy.ndarray
+
+    >>> x = numpy.array([-0.3, 0., 0.2])
+    >>> beta = normalised_black(x, .4, 'c')
+    >>> s = approximate_normalised_implied_volatility(beta, x, 'c', 1e-6)
+    >>> bool(numpy.all(abs(s - .4) <= 1e-6))
+    True
+    """
+
+    beta, x, q, tolerance, shape = vectorized_lets_be_rational._as_float_arrays(
+        beta, x, vectorized_binary_flag(flag), tolerance)
+    s = numpy.empty_like(beta)
+
+    with numpy.errstate(all='ignore'):
+        # Map in-the-money to out-of-the-money, and puts to calls
+        itm = q * x > 0
+        beta = numpy.where(itm, beta - vectorized_lets_be_rational.normalised_intrinsic(x, q), beta)
+        x = -numpy.abs(x)
+        below = beta < 0
+        above = beta >= numpy.exp(0.5 * x)
+        s[below] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+        s[above] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+
+    i = numpy.flatnonzero(~(below | above))
+    s[i] = _approximate_normalised_implied_volatility_of_calls(
+        beta[i], x[i], tolerance[i], max_iterations, table)
+    return s.reshape(shape)[()]
+
+
+def approximate_implied_volatility_of_discounted_option_price(
+    discounted_option_price, F, K, r, t, flag, tolerance=DEFAULT_APPROXIMATE_TOLERANCE,
+    max_iterations=DEFAULT_APPROXIMATE_ITERATIONS, table=None):
+
+    """Calculate the implied volatilities of an array of discounted Black
+    option prices to within an absolute tolerance on the volatility, for
+    screening and dashboards where machine precision is not needed.
+
+    See approximate_normalised_implied_volatility; quotes with invalid
+    inputs or without an implied volatility are flagged as in
+    vectorized_implied_volatility_of_discounted_option_price.  With the
+    default table and tolerance, nearly all quotes of a typical chain are
+    accepted without any evaluation of the Black function, and the result
+    is several times faster than the exact path.
+
+    :param discounted_option_price: discounted Black prices of futures options
+    :type discounted_option_price: numpy.ndarray
+    :param F: underlying futures prices
+    :type F: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param tolerance: absolute tolerance on the implied volatility
+    :type tolerance: float or numpy.ndarray
+    :param max_iterations: maximum number of refinement steps
+    :type max_iterations: int
+    :param table: the table of initial guesses
+    :type table: vollib.black.lookup_table.NormalisedImpliedVolatilityTable
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+    >>> K = numpy.array([80., 100., 120.])
+    >>> prices = black('p', 100., K, .5, .02, .2)
+    >>> sigma, status = approximate_implied_volatility_of_discounted_option_price(
+    ... prices, 100., K, .02, .5, 'p')
+    >>> bool(numpy.all(abs(sigma - .2) <= 1e-4)), status.tolist()
+    (True, [0, 0, 0])
+    """
+
+    price, F, K, r, t, q, tolerance, shape = vectorized_lets_be_rational._as_float_arrays(
+        discounted_option_price, F, K, r, t, vectorized_binary_flag(flag), tolerance)
+
+    def solve(i, price):
+        with numpy.errstate(all='ignore'):
+            sqrt_t, x = numpy.sqrt(t[i]), numpy.log(F[i] / K[i])
+            # Map in-the-money to out-of-the-money, and puts to calls
+            intrinsic = numpy.abs(numpy.maximum(q[i] * (F[i] - K[i]), 0.0))
+            otm_price = numpy.where(q[i] * x > 0, numpy.abs(numpy.maximum(price - intrinsic, 0.0)), price)
+            sigma = _approximate_normalised_implied_volatility_of_calls(
+                otm_price / (numpy.sqrt(F[i]) * numpy.sqrt(K[i])), -numpy.abs(x), tolerance[i] * sqrt_t,
+                max_iterations, table) / sqrt_t
+        # The bounds on the undiscounted prices, as checked by LetsBeRational
+        below = price < intrinsic
+        sigma[below] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+        sigma[~below & (price >= numpy.where(q[i] < 0, K[i], F[i]))] = \
+            VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+        return sigma
+
+    sigma, status = prefiltered_implied_volatility(price, F, K, t, q, curve_cache.discount_factor(r, t), solve)
+    return sigma.reshape(shape), status.reshape(shape)
+
 # -----------------------------------------------------------------------------
 # MAIN
 if __name__=='__main__':
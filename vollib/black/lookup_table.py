@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.black.lookup_table
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      An approximate Black pricer for scenario grids with millions of
+      revaluations, which interpolates the normalised Black value in a
+      precomputed table instead of evaluating it.
+
+      The time value b(x, s) - intrinsic(x) is the same for calls and puts
+      and even in x, and it is tabulated divided by s over h = |x|/s and s.
+      In these coordinates it is smooth down to s = 0, where the normalised
+      Black value has its kink, and it vanishes to machine precision beyond
+      |h| = 12, so bilinear interpolation on a regular grid is accurate
+      everywhere.  The largest interpolation error is measured when the
+      table is built, at the centres of all cells, where the error of
+      bilinear interpolation peaks, and max_error adds a margin of 25% to
+      it for the points in between.  For the default table max_error is
+      1.5e-6 in normalised units, i.e. 1.5e-6*sqrt(F*K) undiscounted; on
+      random points the error stays within 1.25e-6.  The error is set by
+      the spacing in h and grows with its square, while the spacing in s
+      hardly matters.
+      Values of s beyond the table are evaluated exactly by the numpy port
+      of LetsBeRational.
+
+      The inverse, the normalised implied volatility s of an out-of-the-money
+      call price beta, is tabulated over x <= 0 and w = 1/sqrt(1-ln(v)) of
+      the fraction v = beta/exp(x/2) of the maximum price, which keeps the
+      steep wings of s(v) at both ends apart from the grid.  It serves as
+      the initial guess of the approximate implied volatilities of
+      vollib.black.implied_volatility, and records the interpolation error
+      of every cell, so that quotes whose guess is accurate enough need not
+      be refined.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import curve_cache
+from vollib.helper import vectorized_lets_be_rational
+from vollib.helper.vectorized_lets_be_rational import normalised_intrinsic
+
+# -----------------------------------------------------------------------------
+# DATA
+
+DEFAULT_H_POINTS = 4097
+DEFAULT_S_POINTS = 513
+DEFAULT_H_MAX = 12.
+DEFAULT_S_MAX = 2.
+
+# The largest error at the cell centres is scaled by this margin
+MAX_ERROR_MARGIN = 1.25
+
+DEFAULT_X_POINTS = 513
+DEFAULT_W_POINTS = 513
+DEFAULT_X_MIN = -4.
+
+# The largest error at the centre and edge midpoints of a cell is scaled by
+# this margin to bound the error of the whole cell
+CELL_ERROR_MARGIN = 2.
+
+# The default NormalisedImpliedVolatilityTable, built on first use
+_default_implied_volatility_table = []
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _scaled_time_value(h, s):
+
+    """Return the time value of the normalised Black value divided by s,
+    at x = h*s."""
+
+    x = h * s
+    return (vectorized_lets_be_rational.normalised_black_call(x, s) - normalised_intrinsic(x, 1.)) / s
+
+
+def _w(beta, x):
+
+    """Return the coordinate w = 1/sqrt(1-ln(beta/exp(x/2))) of an
+    out-of-the-money call price."""
+
+    return 1 / numpy.sqrt(1 - (numpy.log(beta) - 0.5 * x))
+
+
+def _normalised_implied_volatility(beta, x):
+
+    """The normalised implied volatility of out-of-the-money call
+    prices, with 0 for beta = 0 and nan where it does not exist."""
+
+    with numpy.errstate(all='ignore'):
+        s = vectorized_lets_be_rational.normalised_implied_volatility_from_a_transformed_rational_guess(
+            beta, x, 1.)
+    s[beta <= 0] = 0.
+    s[numpy.abs(s) >= vectorized_lets_be_rational.DBL_MAX] = numpy.nan
+    return s
+
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class NormalisedBlackTable(object):
+
+    """A table of the normalised Black value for approximate pricing.
+
+    :param h_points: number of grid points of |x|/s, from 0 to h_max
+    :type h_points: int
+    :param s_points: number of grid points of s, from 0 to s_max
+    :type s_points: int
+    :param h_max: largest tabulated |x|/s
+    :type h_max: float
+    :param s_max: largest tabulated volatility times square root of time
+    :type s_max: float
+
+    >>> from vollib.black import normalised_black
+    >>> table = NormalisedBlackTable(h_points=2049, s_points=129)
+    >>> table.max_error < 6e-6
+    True
+    >>> x = numpy.array([-0.3, 0., 0.05, 1.2])
+    >>> s = numpy.array([0.2, 0.35, 0.01, 2.5])
+    >>> error = table.normalised_black(x, s, 'c') - normalised_black(x, s, 'c')
+    >>> bool(numpy.all(abs(error) <= table.max_error))
+    True
+    """
+
+    def __init__(self, h_points=DEFAULT_H_POINTS, s_points=DEFAULT_S_POINTS,
+                 h_max=DEFAULT_H_MAX, s_max=DEFAULT_S_MAX, values=None, max_error=None):
+
+        self.h_max = float(h_max)
+        self.s_max = float(s_max)
+        self.h_points = h_points
+        self.s_points = s_points
+        h = numpy.linspace(0., self.h_max, h_points)
+        s = numpy.linspace(0., self.s_max, s_points)
+        # The limit s -> 0 is taken at a tiny s.
+        s[0] = 1e-8 * s[1]
+
+        if values is None:
+            values = _scaled_time_value(h[:, numpy.newaxis], s[numpy.newaxis, :])
+        self.values = numpy.ascontiguousarray(values, dtype=float).ravel()
+
+        if max_error is None:
+            h_centre = (h[:-1] + h[1:]) / 2
+            s_centre = (s[:-1] + s[1:]) / 2
+            x = h_centre[:, numpy.newaxis] * s_centre[numpy.newaxis, :]
+            s_centre = numpy.broadcast_to(s_centre, x.shape)
+            exact = vectorized_lets_be_rational.normalised_black_call(x, s_centre)
+            max_error = MAX_ERROR_MARGIN * float(numpy.abs(self.normalised_black(x, s_centre, 1.) - exact).max())
+        self.max_error = max_error
+
+    def save(self, path):
+
+        """Save the table to a .npz file.
+
+        :param path: file name or file object
+        :type path: str or file
+        """
+
+        numpy.savez(path, values=self.values, max_error=self.max_error, h_points=self.h_points,
+                    s_points=self.s_points, h_max=self.h_max, s_max=self.s_max)
+
+    @classmethod
+    def load(cls, path):
+
+        """Load a table saved with save, without recomputing it.
+
+        :param path: file name or file object
+        :type path: str or file
+        """
+
+        data = numpy.load(path)
+        return cls(int(data['h_points']), int(data['s_points']), float(data['h_max']),
+                   float(data['s_max']), values=data['values'], max_error=float(data['max_error']))
+
+    def normalised_black(self, x, s, flag):
+
+        """Return the normalised Black value of vollib.black.normalised_black
+        within max_error.
+
+        :param x: ln(F/K) where K is the strike price, and F is the futures price
+        :type x: float or numpy.ndarray
+        :param s: volatility times the square root of time to expiration
+        :type s: float or numpy.ndarray
+        :param flag: 'c' or 'p' for call or put, +1 or -1, or an array of them
+        :type flag: str or float or numpy.ndarray
+        """
+
+        q = numpy.asarray(flag)
+        if q.dtype.kind in 'SU':
+            q = vectorized_binary_flag(q)
+        x, s, q, shape = vectorized_lets_be_rational._as_float_arrays(x, s, q)
+
+        # Elements off the table are evaluated exactly, and meanwhile looked
+        # up at a harmless point.
+        outside = numpy.flatnonzero(~((s > 0) & (s <= self.s_max) & numpy.isfinite(x)))
+        if outside.size:
+            x_outside, s_outside = x[outside], s[outside]
+            x, s = x.copy(), s.copy()
+            x[outside] = 0.
+            s[outside] = self.s_max
+
+        fh = numpy.minimum(numpy.abs(x) / s, self.h_max) * ((self.h_points - 1) / self.h_max)
+        fs = s * ((self.s_points - 1) / self.s_max)
+        i = numpy.minimum(fh.astype(numpy.intp), self.h_points - 2)
+        j = numpy.minimum(fs.astype(numpy.intp), self.s_points - 2)
+        wh = fh - i
+        ws = fs - j
+
+        k = i * self.s_points + j
+        v00 = self.values[k]
+        v01 = self.values[k + 1]
+        v10 = self.values[k + self.s_points]
+        v11 = self.values[k + self.s_points + 1]
+        low = v00 + (v01 - v00) * ws
+        high = v10 + (v11 - v10) * ws
+        result = normalised_intrinsic(x, q) + (low + (high - low) * wh) * s
+
+        if outside.size:
+            result[outside] = vectorized_lets_be_rational.normalised_black(x_outside, s_outside, q[outside])
+        return result.reshape(shape)[()]
+
+    def black(self, flag, F, K, t, r, sigma):
+
+        """Return the discounted Black price of vollib.black.black within
+        exp(-r*t)*sqrt(F*K)*max_error.
+
+        :param flag: 'c' or 'p' for call or put, or an array of flags
+        :type flag: str or numpy.ndarray
+        :param F: underlying futures prices
+        :type F: float or numpy.ndarray
+        :param K: strike prices
+        :type K: float or numpy.ndarray
+        :param t: times to expiration in years
+        :type t: float or numpy.ndarray
+        :param r: risk-free interest rates
+        :type r: float or numpy.ndarray
+        :param sigma: annualized standard deviations, or volatilities
+        :type sigma: float or numpy.ndarray
+
+        >>> from vollib.black import black
+        >>> table = NormalisedBlackTable(h_points=2049, s_points=129)
+        >>> K = numpy.array([80., 100., 120.])
+        >>> error = table.black('p', 100., K, .5, .02, .25) - black('p', 100., K, .5, .02, .25)
+        >>> bool(numpy.all(abs(error) <= numpy.exp(-.02*.5) * numpy.sqrt(100. * K) * table.max_error))
+        True
+        """
+
+        F = numpy.asarray(F, dtype=float)
+        t = numpy.asarray(t, dtype=float)
+        return curve_cache.discount_factor(r, t) * numpy.sqrt(F * K) * self.normalised_black(
+            numpy.log(F / K), sigma * numpy.sqrt(t), flag)
+
+
+class NormalisedImpliedVolatilityTable(object):
+
+    """A table of the normalised implied volatility of out-of-the-money
+    call prices, for initial guesses.
+
+    :param x_points: number of grid points of x, from x_min to 0
+    :type x_points: int
+    :param w_points: number of grid points of w, from 0 to 1
+    :type w_points: int
+    :param x_min: smallest tabulated x = ln(F/K)
+    :type x_min: float
+
+    >>> from vollib.black import normalised_black
+    >>> table = NormalisedImpliedVolatilityTable(x_points=129, w_points=129)
+    >>> x = numpy.array([-0.3, 0., -1.2])
+    >>> s, error = table.guess(normalised_black(x, .4, 'c'), x)
+    >>> bool(numpy.all(abs(s - .4) <= error)), bool(error.max() < 2e-3)
+    (True, True)
+    """
+
+    def __init__(self, x_points=DEFAULT_X_POINTS, w_points=DEFAULT_W_POINTS, x_min=DEFAULT_X_MIN,
+                 values=None, errors=None):
+
+        self.x_min = float(x_min)
+        self.x_points = x_points
+        self.w_points = w_points
+        x = numpy.linspace(self.x_min, 0., x_points)
+        w = numpy.linspace(0., 1., w_points)
+        # w = 1 is the maximum price, which has no implied volatility.
+        self.w_max = w[-2]
+
+        def beta(x, w):
+            with numpy.errstate(divide='ignore'):
+                return numpy.exp(1 - 1 / (w * w)) * numpy.exp(0.5 * x)
+
+        if values is None:
+            values = _normalised_implied_volatility(beta(x[:, numpy.newaxis], w[numpy.newaxis, :]),
+                                                    x[:, numpy.newaxis])
+            values[:, -1] = 0.
+        self.values = numpy.ascontiguousarray(values, dtype=float).ravel()
+
+        if errors is None:
+            x_centre = (x[:-1] + x[1:]) / 2
+            w_centre = (w[:-1] + w[1:]) / 2
+
+            def error(x, w):
+                x, w = numpy.broadcast_arrays(x[:, numpy.newaxis], w[numpy.newaxis, :])
+                guess, cell = self._interpolate(x.ravel(), w.ravel())
+                exact = _normalised_implied_volatility(beta(x, w), x).ravel()
+                return numpy.abs(guess - exact).reshape(x.shape)
+
+            # The interpolation error of a cell is sampled at its centre and
+            # at the middle of its edges.
+            centre = error(x_centre, w_centre)
+            x_edges = error(x, w_centre)
+            w_edges = error(x_centre, w)
+            errors = CELL_ERROR_MARGIN * numpy.maximum(
+                numpy.maximum(centre, numpy.maximum(x_edges[:-1], x_edges[1:])),
+                numpy.maximum(w_edges[:, :-1], w_edges[:, 1:]))
+            # The cells next to the maximum price are never trusted.
+            errors[:, -1] = numpy.inf
+            errors[numpy.isnan(errors)] = numpy.inf
+        self.errors = numpy.ascontiguousarray(errors, dtype=float).ravel()
+
+    def _interpolate(self, x, w):
+
+        """Return the bilinear interpolation at (x, w) inside the table, and
+        the flat index of the cell."""
+
+        fx = (x - self.x_min) * ((self.x_points - 1) / -self.x_min)
+        fw = w * (self.w_points - 1)
+        i = numpy.minimum(fx.astype(numpy.intp), self.x_points - 2)
+        j = numpy.minimum(fw.astype(numpy.intp), self.w_points - 2)
+        wx = fx - i
+        ww = fw - j
+
+        k = i * self.w_points + j
+        v00 = self.values[k]
+        v01 = self.values[k + 1]
+        v10 = self.values[k + self.w_points]
+        v11 = self.values[k + self.w_points + 1]
+        low = v00 + (v01 - v00) * ww
+        high = v10 + (v11 - v10) * ww
+        return low + (high - low) * wx, i * (self.w_points - 1) + j
+
+    def save(self, path):
+
+        """Save the table to a .npz file.
+
+        :param path: file name or file object
+        :type path: str or file
+        """
+
+        numpy.savez(path, values=self.values, errors=self.errors, x_points=self.x_points,
+                    w_points=self.w_points, x_min=self.x_min)
+
+    @classmethod
+    def load(cls, path):
+
+        """Load a table saved with save, without recomputing it.
+
+        :param path: file name or file object
+        :type path: str or file
+        """
+
+        data = numpy.load(path)
+        return cls(int(data['x_points']), int(data['w_points']), float(data['x_min']),
+                   values=data['values'], errors=data['errors'])
+
+    def guess(self, beta, x):
+
+        """Return the interpolated normalised implied volatilities of
+        out-of-the-money call prices, and a bound of their errors.
+
+        Quotes off the table get a guess of nan and an infinite error.
+
+        :param beta: normalised out-of-the-money call prices, 0 < beta < exp(x/2)
+        :type beta: numpy.ndarray
+        :param x: ln(F/K) <= 0
+        :type x: numpy.ndarray
+
+        :returns: tuple of (numpy.ndarray, numpy.ndarray)
+        """
+
+        beta, x, shape = vectorized_lets_be_rational._as_float_arrays(beta, x)
+        with numpy.errstate(all='ignore'):
+            w = _w(beta, x)
+        inside = (x >= self.x_min) & (x <= 0.) & (w >= 0.) & (w <= self.w_max)
+        s = numpy.empty_like(beta)
+        s.fill(numpy.nan)
+        error = numpy.empty_like(beta)
+        error.fill(numpy.inf)
+        index = numpy.flatnonzero(inside)
+        s[index], cell = self._interpolate(x[index], w[index])
+        error[index] = self.errors[cell]
+        return s.reshape(shape)[()], error.reshape(shape)[()]
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def default_normalised_implied_volatility_table():
+
+    """Return the NormalisedImpliedVolatilityTable with the default grid,
+    which is built on the first call (in a few seconds) and shared."""
+
+    if not _default_implied_volatility_table:
+        _default_implied_volatility_table.append(NormalisedImpliedVolatilityTable())
+    return _default_implied_volatility_table[0]
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -46,6 +46,7 @@ from vollib.helper import forward_price
 from vollib.black import black as vollib_black
 from vollib.black import undiscounted_black
 from vollib.helper import pdf
+from vollib.helper import curve_cache
 from lets_be_rational import norm_cdf as cnd
 
 # -----------------------------------------------------------------------------
@@ -197,10 +198,19 @@ def black_scholes(flag, S, K, t, r, sigma):
     >>> python_p = python_black_scholes(flag, S, K, t, r, sigma)
     >>> abs(p - python_p) < .000001
     True
-    
-    """   
-    
-    discount_factor = numpy.exp(-r*t)
+
+    Whole option chains can be priced in one call by passing numpy
+    arrays; scalar arguments are broadcast against the arrays and
+    flag may be an array of 'c' and 'p'.
+
+    >>> K = numpy.array([80., 90., 100.])
+    >>> prices = black_scholes(['c', 'p', 'c'], 100, K, .5, .01, .2)
+    >>> abs(prices[1] - black_scholes('p', 100, 90, .5, .01, .2)) < 1e-12
+    True
+
+    """
+
+    discount_factor = curve_cache.discount_factor(r, t)
     F = S / discount_factor
     return undiscounted_black(F, K, sigma, t, flag) * discount_factor
 
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.black_scholes.greeks.adjoint
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      The Black-Scholes value of a portfolio of options and its gradient
+      with respect to all spot prices, volatilities and interest rates, in
+      one forward and one backward pass, see vollib.helper.adjoint.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.adjoint import portfolio_sensitivities as adjoint_portfolio_sensitivities
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, underlier=None):
+
+    """Return the Black-Scholes value of a portfolio of options and its
+    gradient with respect to the spot prices, volatilities and interest
+    rates, as vollib.helper.adjoint.portfolio_sensitivities with no
+    dividends.
+
+    :param quantity: number of options in every position, negative when short
+    :type quantity: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param S: underlying asset price, per underlier if underlier is given
+    :type S: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: annual risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param sigma: volatility
+    :type sigma: float or numpy.ndarray
+    :param underlier: indices into S of the underlier of every position
+    :type underlier: numpy.ndarray of int
+
+    :returns: dict with keys 'value', 'S', 'sigma' and 'r'
+
+    >>> from vollib.black_scholes.greeks.analytical import rho
+    >>> K = numpy.array([45., 50., 55.])
+    >>> book = portfolio_sensitivities(numpy.array([1., 2., -3.]), 'c', 49., K, .3846, .05, .2)
+    >>> expected = sum(n * rho('c', 49., k, .3846, .05, .2) for n, k in zip([1., 2., -3.], K))
+    >>> abs(book['r'] * .01 - expected) < 1e-12
+    True
+    """
+
+    sensitivities = adjoint_portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, 0., underlier)
+    del sensitivities['q']
+    return sensitivities
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -45,6 +45,11 @@ import numpy
 # Local application/library specific imports
 from lets_be_rational import norm_cdf as cnd
 from vollib.helper import pdf
+from vollib.helper import curve_cache
+from vollib.helper import binary_flag
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import is_vectorized
+from vollib.helper.normaldistribution import norm_cdf
 from vollib.black_scholes import d1,d2
 
 # -----------------------------------------------------------------------------
@@ -155,12 +160,12 @@ def theta(flag, S, K, t, r, sigma):
 
     if flag == 'c':
 
-        second_term = r * K * numpy.exp(-r*t) * cnd(D2)
+        second_term = r * K * curve_cache.discount_factor(r, t) * cnd(D2)
         return (first_term - second_term)/365.0
     
     if flag == 'p':
     
-        second_term = r * K * numpy.exp(-r*t) * cnd(-D2)
+        second_term = r * K * curve_cache.discount_factor(r, t) * cnd(-D2)
         return (first_term + second_term)/365.0
 
 
@@ -284,13 +289,90 @@ def rho(flag, S, K, t, r, sigma):
     """
 
     d_2 = d2(S, K, t, r, sigma)
-    e_to_the_minus_rt = numpy.exp(-r*t)
+    e_to_the_minus_rt = curve_cache.discount_factor(r, t)
     if flag == 'c':
         return t*K*e_to_the_minus_rt * cnd(d_2) * .01
     else:
         return -t*K*e_to_the_minus_rt * cnd(-d_2) * .01
 
 
+# -----------------------------------------------------------------------------
+# FUNCTIONS - FUSED PRICE AND GREEKS
+
+
+def all_greeks(flag, S, K, t, r, sigma):
+
+    """Return the Black-Scholes price and all first order greeks of an
+    option in one pass.
+
+    d1, d2, their normal distribution values, pdf(d1), sqrt(t) and the
+    discount factor are computed once and shared, rather than once per
+    greek as when calling delta, gamma, theta, vega and rho separately.
+    The greeks follow the same conventions as those functions: theta is
+    per calendar day, vega and rho per percentage point.
+
+    Arrays may be passed for any argument, including an array of 'c' and
+    'p' flags; the arguments are broadcast against each other.
+
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+
+    :returns: dict with keys 'price', 'delta', 'gamma', 'theta', 'vega' and 'rho'
+
+    >>> S = 49
+    >>> K = 50
+    >>> r = .05
+    >>> t = 0.3846
+    >>> sigma = 0.2
+    >>> greeks = all_greeks('c', S, K, t, r, sigma)
+    >>> sorted(greeks)
+    ['delta', 'gamma', 'price', 'rho', 'theta', 'vega']
+    >>> abs(greeks['theta'] - theta('c', S, K, t, r, sigma)) < 1e-12
+    True
+    >>> greeks = all_greeks(['c', 'p'], S, numpy.array([45., 55.]), t, r, sigma)
+    >>> abs(greeks['delta'][1] - delta('p', S, 55., t, r, sigma)) < 1e-12
+    True
+    """
+
+    if is_vectorized(flag, S, K, t, r, sigma):
+        q = vectorized_binary_flag(flag)
+        N = norm_cdf
+    else:
+        q = binary_flag[flag]
+        N = cnd
+
+    sqrt_t = numpy.sqrt(t)
+    sigma_sqrt_t = sigma * sqrt_t
+    discount_factor = curve_cache.discount_factor(r, t)
+    D1 = (numpy.log(S / numpy.asarray(K, dtype=float)) + (r + sigma * sigma / 2.) * t) / sigma_sqrt_t
+    D2 = D1 - sigma_sqrt_t
+
+    # N(d1) and N(d2) of a call, N(-d1) and N(-d2) of a put
+    N_d1 = N(q * D1)
+    N_d2 = N(q * D2)
+    pdf_d1 = pdf(D1)
+    discounted_K = K * discount_factor
+
+    return {
+        'price': q * (S * N_d1 - discounted_K * N_d2),
+        'delta': q * N_d1,
+        'gamma': pdf_d1 / (S * sigma_sqrt_t),
+        'theta': (-S * pdf_d1 * sigma / (2 * sqrt_t) - q * r * discounted_K * N_d2) / 365.0,
+        'vega': S * pdf_d1 * sqrt_t * 0.01,
+        'rho': q * t * discounted_K * N_d2 * .01,
+    }
+
+
 # -----------------------------------------------------------------------------
 # MAIN
 if __name__=='__main__':  
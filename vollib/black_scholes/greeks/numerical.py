@@ -51,6 +51,8 @@ from vollib.helper.numerical_greeks import vega as numerical_vega
 from vollib.helper.numerical_greeks import theta as numerical_theta
 from vollib.helper.numerical_greeks import rho as numerical_rho
 from vollib.helper.numerical_greeks import gamma as numerical_gamma
+from vollib.helper.numerical_greeks import all_greeks as numerical_all_greeks
+from vollib.helper.numerical_greeks import GREEKS
 
 # analytical greeks
 from vollib.black_scholes.greeks.analytical import gamma as agamma
@@ -64,6 +66,7 @@ from vollib.black_scholes.greeks.analytical import theta as atheta
 
 
 f = lambda flag, S, K, t, r, sigma, b: python_black_scholes(flag, S, K, t, r, sigma)
+vectorized_f = lambda flag, S, K, t, r, sigma, b: black_scholes(flag, S, K, t, r, sigma)
 
 
 def delta(flag, S, K, t, r, sigma):
@@ -182,6 +185,36 @@ def gamma(flag, S, K, t, r, sigma):
     return numerical_gamma(flag, S, K, t, r, sigma, b, f)
 
 
+def all_greeks(flag, S, K, t, r, sigma, greeks=GREEKS):
+
+    """Return several Black-Scholes numerical greeks of one or many
+    options, repricing every bumped input only once.
+
+    :param S: underlying asset price
+    :type S: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param greeks: names of the greeks to calculate
+    :type greeks: sequence of str
+
+    >>> greeks = all_greeks('p', 49, numpy.array([45., 50.]), 0.3846, .05, 0.2)
+    >>> abs(greeks['delta'][1] - adelta('p', 49, 50., 0.3846, .05, 0.2)) < .0001
+    True
+    """
+
+    b = r
+
+    return numerical_all_greeks(flag, S, K, t, r, sigma, b, vectorized_f, greeks)
+
+
 def test():
     """Test by comparing analytical and numerical values.
     
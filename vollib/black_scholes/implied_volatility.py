@@ -48,10 +48,14 @@ import numpy
 from vollib.helper import forward_price
 from vollib.black_scholes import black_scholes
 from vollib.helper import binary_flag
+from vollib.helper import curve_cache
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_undiscounted_option_price
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance
+from vollib.black.implied_volatility import implied_volatility_of_undiscounted_option_price_with_tolerance
+from vollib.black.implied_volatility import DEFAULT_MAXIMUM_ITERATIONS
+from vollib.black.implied_volatility import DEFAULT_SOLVER
 
 
-e = numpy.e
-
 # -----------------------------------------------------------------------------
 # FUNCTIONS, FOR REFERENCE AND TESTING
 
@@ -92,7 +96,7 @@ def implied_volatility_limited_iterations(price, S, K, t, r, flag, N):
     6.78242400926 0.232323232
     """  
 
-    adjusted_price = price / e**(-r*t)
+    adjusted_price = price / curve_cache.discount_factor(r, t)
 
     return lets_be_rational.implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
         adjusted_price, 
@@ -140,7 +144,7 @@ def implied_volatility(price, S, K, t, r, flag):
     5.87602423383 0.2
     """  
 
-    adjusted_price = price / e**(-r*t)
+    adjusted_price = price / curve_cache.discount_factor(r, t)
 
     return lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
         adjusted_price, 
@@ -149,7 +153,148 @@ def implied_volatility(price, S, K, t, r, flag):
         t, 
         binary_flag[flag]
     )
-    
+
+
+def implied_volatility_with_tolerance(price, S, K, t, r, flag, tolerance=None,
+                                      max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the Black-Scholes implied volatility to within an
+    absolute tolerance, and return it with the number of iterations used.
+
+    The iteration stops as soon as its last step is below tolerance, or
+    after max_iterations steps; with tolerance None it runs to machine
+    precision, as implied_volatility does.  Counting the iterations makes
+    it about twice as slow as implied_volatility.  See
+    vollib.black.implied_volatility.implied_volatility_of_undiscounted_option_price_with_tolerance.
+
+    :param price: the Black-Scholes option price
+    :type price: float
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (float, int)
+
+    >>> price = black_scholes('c', 100, 110, .5, .01, .2)
+    >>> iv, iterations = implied_volatility_with_tolerance(price, 100, 110, .5, .01, 'c', 1e-3)
+    >>> abs(iv - .2) < 1e-3, iterations
+    (True, 1)
+    """
+
+    adjusted_price = price / curve_cache.discount_factor(r, t)
+
+    return implied_volatility_of_undiscounted_option_price_with_tolerance(
+        adjusted_price, forward_price(S, t, r), K, t, flag, tolerance, max_iterations)
+
+
+def vectorized_implied_volatility(price, S, K, t, r, flag, solver=DEFAULT_SOLVER):
+
+    """Calculate the Black-Scholes implied volatilities of an array of
+    option prices, e.g. a full quote snapshot.
+
+    The arguments are broadcast against each other, and the discount
+    factors and forwards are computed once for the whole batch.  Quotes
+    without an implied volatility do not abort the batch; they are
+    returned as nan with a status code of IV_BELOW_INTRINSIC,
+    IV_ABOVE_MAXIMUM or IV_INVALID_INPUT (see vollib.helper), and are not
+    passed to the solver, while solved quotes have status IV_CONVERGED.
+
+    :param price: the Black-Scholes option prices
+    :type price: numpy.ndarray
+    :param S: underlying asset prices
+    :type S: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param solver: the solver of
+        vollib.black.implied_volatility.vectorized_implied_volatility_of_undiscounted_option_price
+    :type solver: str
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+    >>> S = 100
+    >>> K = numpy.array([90, 100, 110, 120])
+    >>> r = .01
+    >>> t = .5
+    >>> flag = numpy.array(['c', 'c', 'p', 'p'])
+    >>> price = black_scholes(flag, S, K, t, r, .2)
+    >>> price[3] = 1.0
+    >>> sigma, status = vectorized_implied_volatility(price, S, K, t, r, flag)
+    >>> sigma[:3].round(12).tolist(), status.tolist()
+    ([0.2, 0.2, 0.2], [0, 0, 0, 1])
+    """
+
+    discount_factor = curve_cache.discount_factor(r, t)
+    undiscounted_price = numpy.asarray(price, dtype=float) / discount_factor
+    F = numpy.asarray(S, dtype=float) / discount_factor
+
+    return vectorized_implied_volatility_of_undiscounted_option_price(
+        undiscounted_price, F, K, t, flag, solver)
+
+
+def vectorized_implied_volatility_with_tolerance(price, S, K, t, r, flag, tolerance=None,
+                                                 max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the Black-Scholes implied volatilities of an array of
+    option prices to within an absolute tolerance, and return them with
+    their status codes and the number of iterations used per quote.
+
+    See vectorized_implied_volatility and implied_volatility_with_tolerance.
+    The quotes are solved by the numpy port of LetsBeRational, which is
+    slower than the default solver of vectorized_implied_volatility for
+    any tolerance.
+
+    :param price: the Black-Scholes option prices
+    :type price: numpy.ndarray
+    :param S: underlying asset prices
+    :type S: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float or numpy.ndarray
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray, numpy.ndarray) of volatilities, status codes and iterations
+
+    >>> K = numpy.array([90, 100, 110])
+    >>> price = black_scholes('c', 100, K, .5, .01, .2)
+    >>> sigma, status, iterations = vectorized_implied_volatility_with_tolerance(
+    ...     price, 100, K, .5, .01, 'c', 1e-3)
+    >>> sigma.round(3).tolist(), status.tolist(), iterations.tolist()
+    ([0.2, 0.2, 0.2], [0, 0, 0], [1, 1, 1])
+    """
+
+    discount_factor = curve_cache.discount_factor(r, t)
+    undiscounted_price = numpy.asarray(price, dtype=float) / discount_factor
+    F = numpy.asarray(S, dtype=float) / discount_factor
+
+    return vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance(
+        undiscounted_price, F, K, t, flag, tolerance, max_iterations)
+
+
 # -----------------------------------------------------------------------------
 # MAIN
 if __name__=='__main__':
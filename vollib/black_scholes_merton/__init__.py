@@ -46,7 +46,11 @@ from lets_be_rational import black
 from lets_be_rational import norm_cdf as cnd
 from vollib.helper import forward_price
 from vollib.helper import binary_flag
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import is_vectorized
 from vollib.helper import pdf
+from vollib.helper import curve_cache
+from vollib.helper import vectorized_lets_be_rational
 
 # -----------------------------------------------------------------------------
 # FUNCTIONS, FOR REFERENCE AND TESTING
@@ -289,11 +293,32 @@ def black_scholes_merton(flag, S, K, t, r, sigma, q):
     >>> c2 = black_scholes_merton('c', S, K, t, r, sigma, q)
     >>> abs(c1-c2) < .0001
     True
+
+    Arrays may be passed for any argument, with flag an array of 'c' and
+    'p' if needed.  The discount factor and the carry-adjusted forward
+    are computed before r, q and t are broadcast against the strikes, so
+    with r and t per expiry and q per underlying each exponential is
+    evaluated once per (r, q, t) rather than once per option.
+
+    >>> t = numpy.array([[.25], [.5]])
+    >>> r = numpy.array([[.01], [.02]])
+    >>> K = numpy.array([90., 100., 110.])
+    >>> prices = black_scholes_merton('p', S, K, t, r, sigma, q)
+    >>> prices.shape
+    (2, 3)
+    >>> abs(prices[1, 1] - black_scholes_merton('p', S, 100., .5, .02, sigma, q)) < 1e-12
+    True
     """
-    
-    S = S * numpy.exp((r-q)*t)
+
+    if is_vectorized(flag, S, K, t, r, sigma, q):
+        discount_factor = curve_cache.discount_factor(r, t)
+        F = S * curve_cache.growth_factor(numpy.asarray(r, dtype=float)-q, t)
+        p = vectorized_lets_be_rational.black(F, K, sigma, t, vectorized_binary_flag(flag))
+        return p * discount_factor
+
+    S = S * curve_cache.growth_factor(r-q, t)
     p = black(S, K, sigma, t, binary_flag[flag])
-    conversion_factor = numpy.exp(-r*t)
+    conversion_factor = curve_cache.discount_factor(r, t)
     return p * conversion_factor
 
 
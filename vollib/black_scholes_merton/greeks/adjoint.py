@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.black_scholes_merton.greeks.adjoint
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      The Black-Scholes-Merton value of a portfolio of options and its
+      gradient with respect to all spot prices, volatilities, interest rates
+      and dividend yields, in one forward and one backward pass, see
+      vollib.helper.adjoint.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.adjoint import portfolio_sensitivities as adjoint_portfolio_sensitivities
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, q, underlier=None):
+
+    """Return the Black-Scholes-Merton value of a portfolio of options and
+    its gradient with respect to the spot prices, volatilities, interest
+    rates and dividend yields, see
+    vollib.helper.adjoint.portfolio_sensitivities.
+
+    :param quantity: number of options in every position, negative when short
+    :type quantity: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param S: underlying asset price, per underlier if underlier is given
+    :type S: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: annual risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param sigma: volatility
+    :type sigma: float or numpy.ndarray
+    :param q: annualized continuous dividend yield, per underlier if underlier is given
+    :type q: float or numpy.ndarray
+    :param underlier: indices into S and q of the underlier of every position
+    :type underlier: numpy.ndarray of int
+
+    :returns: dict with keys 'value', 'S', 'sigma', 'r' and 'q'
+
+    >>> from vollib.black_scholes_merton import black_scholes_merton
+    >>> book = portfolio_sensitivities([2., -1.], ['c', 'p'], 100., 100., .5, .05, .25, .02)
+    >>> expected = 2. * black_scholes_merton('c', 100., 100., .5, .05, .25, .02) - \\
+    ...     black_scholes_merton('p', 100., 100., .5, .05, .25, .02)
+    >>> abs(book['value'] - expected) < 1e-12
+    True
+    """
+
+    return adjoint_portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, q, underlier)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -45,6 +45,7 @@ import numpy
 # Local application/library specific imports
 from lets_be_rational import norm_cdf as cnd
 from vollib.helper import pdf
+from vollib.helper import curve_cache
 from vollib.black_scholes_merton import d1,d2
 
 # -----------------------------------------------------------------------------
@@ -61,6 +62,10 @@ import numpy
 # Local application/library specific imports
 from lets_be_rational import norm_cdf as cnd
 from vollib.helper import pdf
+from vollib.helper import binary_flag
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import is_vectorized
+from vollib.helper.normaldistribution import norm_cdf
 from vollib.black_scholes_merton import d1,d2, black_scholes_merton
 
 
@@ -95,9 +100,9 @@ def delta(flag, S, K, t, r, sigma, q):
     D1 = d1(S, K, t, r, sigma, q)
 
     if flag == 'p':
-        return -numpy.exp(-q*t) * cnd(-D1)
+        return -curve_cache.discount_factor(q, t) * cnd(-D1)
     else:
-        return numpy.exp(-q*t) * cnd(D1)
+        return curve_cache.discount_factor(q, t) * cnd(D1)
 
 
 def theta(flag, S, K, t, r, sigma, q):
@@ -128,19 +133,19 @@ def theta(flag, S, K, t, r, sigma, q):
     D1 = d1(S, K, t, r, sigma, q)
     D2 = d2(S, K, t, r, sigma, q)
 
-    first_term = (S * numpy.exp(-q*t) * pdf(D1) * sigma) / (2 * numpy.sqrt(t))
+    first_term = (S * curve_cache.discount_factor(q, t) * pdf(D1) * sigma) / (2 * numpy.sqrt(t))
 
     if flag == 'c':
 
-        second_term = -q * S * numpy.exp(-q*t) * cnd(D1)
-        third_term = r * K * numpy.exp(-r*t) * cnd(D2)
+        second_term = -q * S * curve_cache.discount_factor(q, t) * cnd(D1)
+        third_term = r * K * curve_cache.discount_factor(r, t) * cnd(D2)
 
         return - (first_term + second_term + third_term) / 365.0
 
     else:
 
-        second_term = -q * S * numpy.exp(-q*t) * cnd(-D1)
-        third_term = r * K * numpy.exp(-r*t) * cnd(-D2)
+        second_term = -q * S * curve_cache.discount_factor(q, t) * cnd(-D1)
+        third_term = r * K * curve_cache.discount_factor(r, t) * cnd(-D2)
 
         return (-first_term + second_term + third_term) / 365.0
 
@@ -172,7 +177,7 @@ def gamma(flag, S, K, t, r, sigma, q):
     """
 
     D1 = d1(S, K, t, r, sigma, q)
-    numerator = numpy.exp(-q*t) * pdf(D1)
+    numerator = curve_cache.discount_factor(q, t) * pdf(D1)
     denominator = S * sigma * numpy.sqrt(t)
 
     return numerator / denominator
@@ -204,7 +209,7 @@ def vega(flag, S, K, t, r, sigma, q):
 
     D1 = d1(S, K, t, r, sigma, q)
 
-    return S * numpy.exp(-q*t) * pdf(D1) * numpy.sqrt(t) * 0.01
+    return S * curve_cache.discount_factor(q, t) * pdf(D1) * numpy.sqrt(t) * 0.01
 
 
 def rho(flag, S, K, t, r, sigma, q):
@@ -237,11 +242,94 @@ def rho(flag, S, K, t, r, sigma, q):
 
     if flag == 'c':
 
-        return t * K * numpy.exp(-r*t) * cnd(D2) * .01
+        return t * K * curve_cache.discount_factor(r, t) * cnd(D2) * .01
 
     else:
 
-        return -t * K * numpy.exp(-r*t) * cnd(-D2) * .01
+        return -t * K * curve_cache.discount_factor(r, t) * cnd(-D2) * .01
+
+
+def higher_order_greeks(flag, S, K, t, r, sigma, q):
+
+    """Return the second and third order Black-Scholes-Merton greeks of an
+    option in one pass, in closed form.
+
+    d1, d2, pdf(d1), sqrt(t) and the dividend discount factor are
+    computed once and shared by all greeks, which are also the
+    intermediates of delta, gamma and vega.  The greeks are scaled as
+    those functions: a volatility change is one percentage point and a
+    time change is one calendar day, as the option ages.
+
+    ::
+
+      ==========================================================
+      vanna: change in delta per point of volatility
+      volga: change in vega per point of volatility
+      charm: change in delta per day
+      speed: change in gamma per unit of the underlying
+      zomma: change in gamma per point of volatility
+      color: change in gamma per day
+      ==========================================================
+
+    Arrays may be passed for any argument, including an array of 'c' and
+    'p' flags; the arguments are broadcast against each other.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: annual risk-free interest rate
+    :type r: float
+    :param sigma: volatility
+    :type sigma: float
+    :param q: annualized continuous dividend yield
+    :type q: float
+
+    :returns: dict with keys 'vanna', 'volga', 'charm', 'speed', 'zomma' and 'color'
+
+    >>> greeks = higher_order_greeks('c', 100., 95., .5, .05, .25, .02)
+    >>> sorted(greeks)
+    ['charm', 'color', 'speed', 'vanna', 'volga', 'zomma']
+    >>> sigma = numpy.array([.2499, .2501])
+    >>> v = [vega('c', 100., 95., .5, .05, s, .02) for s in sigma]
+    >>> abs(greeks['volga'] - (v[1] - v[0]) / .02) < 1e-8
+    True
+    >>> greeks = higher_order_greeks(['c', 'p'], 100., numpy.array([95., 105.]), .5, .05, .25, .02)
+    >>> greeks['charm'].shape
+    (2,)
+    """
+
+    if is_vectorized(flag, S, K, t, r, sigma, q):
+        theta = vectorized_binary_flag(flag)
+        N = norm_cdf
+    else:
+        theta = binary_flag[flag]
+        N = cnd
+
+    sqrt_t = numpy.sqrt(t)
+    sigma_sqrt_t = sigma * sqrt_t
+    b = r - q
+    D1 = (numpy.log(S / numpy.asarray(K, dtype=float)) + (b + sigma * sigma / 2.) * t) / sigma_sqrt_t
+    D2 = D1 - sigma_sqrt_t
+
+    dividend_discounted_pdf_d1 = curve_cache.discount_factor(q, t) * pdf(D1)
+    gamma = dividend_discounted_pdf_d1 / (S * sigma_sqrt_t)
+    # The change of d1 as the option ages, up to a factor of -1/(2t)
+    d1_decay = (2 * b * t - D2 * sigma_sqrt_t) / sigma_sqrt_t
+
+    return {
+        'vanna': -dividend_discounted_pdf_d1 * D2 / sigma * 0.01,
+        'volga': S * dividend_discounted_pdf_d1 * sqrt_t * D1 * D2 / sigma * 0.0001,
+        'charm': (theta * q * curve_cache.discount_factor(q, t) * N(theta * D1) -
+                  dividend_discounted_pdf_d1 * d1_decay / (2 * t)) / 365.,
+        'speed': -gamma / S * (D1 / sigma_sqrt_t + 1),
+        'zomma': gamma * (D1 * D2 - 1) / sigma * 0.01,
+        'color': gamma / (2 * t) * (2 * q * t + 1 + d1_decay * D1) / 365.,
+    }
 
 
 # -----------------------------------------------------------------------------
@@ -51,6 +51,8 @@ from vollib.helper.numerical_greeks import vega as numerical_vega
 from vollib.helper.numerical_greeks import theta as numerical_theta
 from vollib.helper.numerical_greeks import rho as numerical_rho
 from vollib.helper.numerical_greeks import gamma as numerical_gamma
+from vollib.helper.numerical_greeks import all_greeks as numerical_all_greeks
+from vollib.helper.numerical_greeks import GREEKS
 
 # analytical greeks
 from vollib.black_scholes_merton.greeks.analytical import gamma as agamma
@@ -183,9 +185,39 @@ def gamma(flag, S, K, t, r, sigma, q):
     return numerical_gamma(flag, S, K, t, r, sigma, q, f)
 
 
-plot_numerical_vs_analytical('t','p')
+def all_greeks(flag, S, K, t, r, sigma, q, greeks=GREEKS):
 
+    """Return several Black-Scholes-Merton numerical greeks of one or many
+    options, repricing every bumped input only once.
 
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param S: underlying asset price
+    :type S: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: annual risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param sigma: volatility
+    :type sigma: float or numpy.ndarray
+    :param q: annualized continuous dividend yield
+    :type q: float or numpy.ndarray
+    :param greeks: names of the greeks to calculate
+    :type greeks: sequence of str
+
+    >>> greeks = all_greeks('p', 49, numpy.array([45., 50.]), 0.3846, .05, 0.2, .03)
+    >>> abs(greeks['delta'][1] - adelta('p', 49, 50., 0.3846, .05, 0.2, .03)) < .0001
+    True
+    >>> greeks = all_greeks(['c', 'p'], 49, 50, 0.3846, .05, 0.2, numpy.array([.01, .03]), greeks=['rho'])
+    >>> abs(greeks['rho'][0] - arho('c', 49, 50., 0.3846, .05, 0.2, .01)) < .0001
+    True
+    """
+
+    # As in the scalar greeks above, q takes the place of the cost of
+    # carry, so that bumping r leaves it unchanged.
+    return numerical_all_greeks(flag, S, K, t, r, sigma, q, f, greeks)
 
 
 # -----------------------------------------------------------------------------
@@ -42,6 +42,7 @@
 
 # Related third party imports
 from lets_be_rational import implied_volatility_from_a_transformed_rational_guess as iv
+from lets_be_rational import implied_volatility_from_a_transformed_rational_guess_with_limited_iterations as iv_limited
 import numpy
 
 # Local application/library specific imports
@@ -49,10 +50,48 @@ from vollib.helper import forward_price
 from vollib.black_scholes_merton import black_scholes_merton
 from vollib.black_scholes_merton import python_black_scholes_merton
 from vollib.helper import binary_flag
+from vollib.helper import curve_cache
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_undiscounted_option_price
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance
+from vollib.black.implied_volatility import implied_volatility_of_undiscounted_option_price_with_tolerance
+from vollib.black.implied_volatility import DEFAULT_MAXIMUM_ITERATIONS
+from vollib.black.implied_volatility import DEFAULT_SOLVER
 
 # -----------------------------------------------------------------------------
 # FUNCTIONS, FOR REFERENCE AND TESTING
 
+def implied_volatility_limited_iterations(price, S, K, t, r, q, flag, N):
+
+    """Calculate the Black-Scholes-Merton implied volatility with limited
+    iterations.
+
+    :param price: the Black-Scholes-Merton option price
+    :type price: float
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param q: annualized continuous dividend rate
+    :type q: float
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param N: the maximum number of iterations to perform
+    :type N: int
+
+    >>> price = black_scholes_merton('c', 100, 100, .5, .01, .232323232, .02)
+    >>> iv = implied_volatility_limited_iterations(price, 100, 100, .5, .01, .02, 'c', 1)
+    >>> round(iv, 9)
+    0.232323232
+    """
+
+    adjusted_price = price / curve_cache.discount_factor(r, t)
+    F = S * curve_cache.growth_factor(r-q, t)
+    return iv_limited(adjusted_price, F, K, t, binary_flag[flag], N)
+
 
 # -----------------------------------------------------------------------------
 # FUNCTIONS
@@ -96,11 +135,160 @@ def implied_volatility(price, S, K, t, r, q, flag):
     >>> iv = implied_volatility(price, S, K, t, r, q, flag)
 
     """  
-    conversion_factor = numpy.exp(-r*t)
+    conversion_factor = curve_cache.discount_factor(r, t)
     adjusted_price = price / conversion_factor
-    S = S * numpy.exp((r-q)*t)
+    S = S * curve_cache.growth_factor(r-q, t)
     return iv(adjusted_price, S, K, t, binary_flag[flag])
-    
+
+
+def implied_volatility_with_tolerance(price, S, K, t, r, q, flag, tolerance=None,
+                                      max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the Black-Scholes-Merton implied volatility to within an
+    absolute tolerance, and return it with the number of iterations used.
+
+    The iteration stops as soon as its last step is below tolerance, or
+    after max_iterations steps; with tolerance None it runs to machine
+    precision, as implied_volatility does.  Counting the iterations makes
+    it about 1.5 times as slow as implied_volatility.  See
+    vollib.black.implied_volatility.implied_volatility_of_undiscounted_option_price_with_tolerance.
+
+    :param price: the Black-Scholes-Merton option price
+    :type price: float
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param q: annualized continuous dividend rate
+    :type q: float
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (float, int)
+
+    >>> price = black_scholes_merton('p', 100, 90, .5, .01, .2, .02)
+    >>> iv, iterations = implied_volatility_with_tolerance(price, 100, 90, .5, .01, .02, 'p', 1e-3)
+    >>> abs(iv - .2) < 1e-3, iterations
+    (True, 1)
+    """
+
+    adjusted_price = price / curve_cache.discount_factor(r, t)
+    F = S * curve_cache.growth_factor(r-q, t)
+    return implied_volatility_of_undiscounted_option_price_with_tolerance(
+        adjusted_price, F, K, t, flag, tolerance, max_iterations)
+
+
+def vectorized_implied_volatility(price, S, K, t, r, q, flag, solver=DEFAULT_SOLVER):
+
+    """Calculate the Black-Scholes-Merton implied volatilities of an
+    array of option prices, e.g. a full quote snapshot.
+
+    The arguments are broadcast against each other, so r, q and t may be
+    given per row.  The discount factors and carry-adjusted forwards are
+    computed before r, q and t are broadcast against the prices and
+    strikes, i.e. once per (r, q, t) when these are passed per expiry or
+    per underlying.  Quotes without an implied volatility are returned as
+    nan with a status code of IV_BELOW_INTRINSIC, IV_ABOVE_MAXIMUM or
+    IV_INVALID_INPUT (see vollib.helper), and are not passed to the
+    solver, while solved quotes have status IV_CONVERGED.
+
+    :param price: the Black-Scholes-Merton option prices
+    :type price: numpy.ndarray
+    :param S: underlying asset prices
+    :type S: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param q: annualized continuous dividend rates
+    :type q: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param solver: the solver of
+        vollib.black.implied_volatility.vectorized_implied_volatility_of_undiscounted_option_price
+    :type solver: str
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+    >>> S = numpy.array([100., 100., 50., 50.])
+    >>> K = numpy.array([90., 110., 45., 55.])
+    >>> q = numpy.array([.02, .02, .04, .04])
+    >>> t = .5
+    >>> r = .01
+    >>> flag = ['c', 'p', 'c', 'p']
+    >>> price = black_scholes_merton(flag, S, K, t, r, .2, q)
+    >>> price[3] = 1.0
+    >>> sigma, status = vectorized_implied_volatility(price, S, K, t, r, q, flag)
+    >>> sigma[:3].round(12).tolist(), status.tolist()
+    ([0.2, 0.2, 0.2], [0, 0, 0, 1])
+    """
+
+    discount_factor = curve_cache.discount_factor(r, t)
+    undiscounted_price = numpy.asarray(price, dtype=float) / discount_factor
+    F = S * curve_cache.growth_factor(numpy.asarray(r, dtype=float)-q, t)
+
+    return vectorized_implied_volatility_of_undiscounted_option_price(
+        undiscounted_price, F, K, t, flag, solver)
+
+
+def vectorized_implied_volatility_with_tolerance(price, S, K, t, r, q, flag, tolerance=None,
+                                                 max_iterations=DEFAULT_MAXIMUM_ITERATIONS):
+
+    """Calculate the Black-Scholes-Merton implied volatilities of an array
+    of option prices to within an absolute tolerance, and return them with
+    their status codes and the number of iterations used per quote.
+
+    See vectorized_implied_volatility and implied_volatility_with_tolerance.
+    The quotes are solved by the numpy port of LetsBeRational, which is
+    slower than the default solver of vectorized_implied_volatility for
+    any tolerance.
+
+    :param price: the Black-Scholes-Merton option prices
+    :type price: numpy.ndarray
+    :param S: underlying asset prices
+    :type S: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param q: annualized continuous dividend rates
+    :type q: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param tolerance: absolute tolerance on the volatility, or None
+    :type tolerance: float or numpy.ndarray
+    :param max_iterations: the maximum number of iterations to perform
+    :type max_iterations: int
+
+    :returns: tuple of (numpy.ndarray, numpy.ndarray, numpy.ndarray) of volatilities, status codes and iterations
+
+    >>> K = numpy.array([90., 100., 110.])
+    >>> price = black_scholes_merton('c', 100., K, .5, .01, .2, .02)
+    >>> sigma, status, iterations = vectorized_implied_volatility_with_tolerance(
+    ...     price, 100., K, .5, .01, .02, 'c', max_iterations=1)
+    >>> bool(numpy.allclose(sigma, .2, rtol=1e-10)), status.tolist(), iterations.tolist()
+    (True, [0, 0, 0], [1, 1, 1])
+    """
+
+    discount_factor = curve_cache.discount_factor(r, t)
+    undiscounted_price = numpy.asarray(price, dtype=float) / discount_factor
+    F = S * curve_cache.growth_factor(numpy.asarray(r, dtype=float)-q, t)
+
+    return vectorized_implied_volatility_of_undiscounted_option_price_with_tolerance(
+        undiscounted_price, F, K, t, flag, tolerance, max_iterations)
+
 # -----------------------------------------------------------------------------
 # MAIN
 if __name__=='__main__':
@@ -40,6 +40,11 @@
 import numpy
 from numpy import log, sqrt, exp
 
+# Local application/library specific imports
+from vollib.helper.curve_cache import curve_cache
+from vollib.helper.curve_cache import discount_factor
+from vollib.helper.curve_cache import growth_factor
+
 # -----------------------------------------------------------------------------
 # DATA
 
@@ -49,6 +54,14 @@ PUT = 'p'
 
 binary_flag = {CALL:1,PUT:-1}
 
+# status codes returned alongside the vectorized implied volatilities
+IV_CONVERGED = 0
+IV_BELOW_INTRINSIC = 1
+IV_ABOVE_MAXIMUM = 2
+# a price, forward, strike, rate or time that is not a finite number, or a
+# forward, strike or time that is not positive
+IV_INVALID_INPUT = 3
+
 def test_binary_flag():
     
     """
@@ -71,6 +84,43 @@ def test_binary_flag():
     -1
     """
 
+
+def vectorized_binary_flag(flag):
+
+    """Map a 'c'/'p' flag, or an array of them, to +1.0/-1.0.
+
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+
+    >>> vectorized_binary_flag(['c', 'p', 'c']).tolist()
+    [1.0, -1.0, 1.0]
+    >>> vectorized_binary_flag('x')
+    Traceback (most recent call last):
+    ...
+    KeyError: 'x'
+    """
+
+    flag = numpy.asarray(flag)
+    is_call = flag == CALL
+    is_put = flag == PUT
+    unknown = ~(is_call | is_put)
+    if unknown.any():
+        raise KeyError(flag[unknown].ravel()[0])
+    return numpy.where(is_put, -1.0, 1.0)
+
+
+def is_vectorized(*args):
+
+    """Return True if any of the arguments is an array rather than a scalar.
+
+    >>> is_vectorized('c', 100, 90, .5, .01, .2)
+    False
+    >>> is_vectorized('c', numpy.array([100, 101]), 90, .5, .01, .2)
+    True
+    """
+
+    return any(numpy.ndim(a) > 0 for a in args)
+
 # -----------------------------------------------------------------------------
 # FUNCTIONS
 
@@ -104,7 +154,7 @@ def forward_price(S,t,r):
     >>> abs(F-pre_calculated)<.000000001
     True
     """
-    return S/numpy.exp(-r*t)
+    return S/discount_factor(r, t)
 
 
 
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.adjoint
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Portfolio sensitivities by adjoint, or reverse mode, differentiation.
+      The Black-Scholes-Merton prices of all positions are evaluated in one
+      vectorized forward pass, which keeps its intermediates, and the
+      derivatives of the total portfolio value with respect to every input
+      are accumulated in one backward pass through the same operations in
+      reverse order.  The cost of the full gradient is a small multiple of
+      the cost of the prices, however many inputs there are.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import pdf
+from vollib.helper import vectorized_binary_flag
+from vollib.helper.normaldistribution import norm_cdf
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _sum_to_shape(gradient, shape):
+
+    """Sum a gradient over the axes its argument was broadcast along, so
+    that it has the shape of the argument."""
+
+    leading = gradient.ndim - len(shape)
+    gradient = gradient.sum(axis=tuple(range(leading))) if leading else gradient
+    axes = tuple(i for i, n in enumerate(shape) if n == 1 and gradient.shape[i] != 1)
+    return gradient.sum(axis=axes, keepdims=True) if axes else gradient
+
+
+def _gradient_of_argument(gradient, argument, underlier):
+
+    """Return the gradient of an argument, which is indexed by underlier
+    if underlier is not None and the argument is an array."""
+
+    if underlier is None or argument.ndim == 0:
+        return _sum_to_shape(gradient, argument.shape)[()]
+    return numpy.bincount(underlier.ravel(), gradient.ravel(), minlength=len(argument))
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, q, underlier=None):
+
+    """Return the Black-Scholes-Merton value of a portfolio of options and
+    its gradient with respect to the spot prices, volatilities, interest
+    rates and dividend yields, from one forward and one backward pass.
+
+    The arguments are broadcast against each other, and the derivative
+    with respect to an argument has the shape of that argument: a scalar
+    interest rate gets the total derivative of the portfolio by the rate.
+    If underlier is given, S and q, unless scalars, are instead arrays with
+    one entry per underlier, and position i is on the underlier
+    underlier[i]; the derivatives by S and q are then summed per underlier.
+
+    The derivatives are plain partial derivatives of the value, per unit
+    of each input: multiply those by sigma, r and q by .01 for the
+    per-point vega and rho of vollib.black_scholes_merton.greeks.analytical.
+    The times to expiration must be positive.
+
+    :param quantity: number of options in every position, negative when short
+    :type quantity: float or numpy.ndarray
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str or numpy.ndarray
+    :param S: underlying asset price
+    :type S: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: annual risk-free interest rate
+    :type r: float or numpy.ndarray
+    :param sigma: volatility
+    :type sigma: float or numpy.ndarray
+    :param q: annualized continuous dividend yield
+    :type q: float or numpy.ndarray
+    :param underlier: indices into S and q of the underlier of every position
+    :type underlier: numpy.ndarray of int
+
+    :returns: dict with keys 'value', 'S', 'sigma', 'r' and 'q'
+
+    >>> from vollib.black_scholes_merton.greeks.analytical import delta, vega
+    >>> book = portfolio_sensitivities(numpy.array([10., -5., 20.]), ['c', 'p', 'c'],
+    ...                                numpy.array([100., 50.]), numpy.array([95., 105., 50.]), .5, .05,
+    ...                                numpy.array([.25, .3, .2]), numpy.array([.02, 0.]),
+    ...                                underlier=numpy.array([0, 0, 1]))
+    >>> expected = 10. * delta('c', 100., 95., .5, .05, .25, .02) - 5. * delta('p', 100., 105., .5, .05, .3, .02)
+    >>> abs(book['S'][0] - expected) < 1e-12
+    True
+    >>> abs(book['sigma'][2] * .01 - 20. * vega('c', 50., 50., .5, .05, .2, 0.)) < 1e-12
+    True
+    >>> book['r'].shape, book['q'].shape
+    ((), (2,))
+    """
+
+    arguments = [numpy.asarray(a, dtype=float) for a in (quantity, S, K, t, r, sigma, q)]
+    quantity_, S_, K_, t_, r_, sigma_, q_ = arguments
+    theta = vectorized_binary_flag(flag)
+    if underlier is not None:
+        underlier = numpy.asarray(underlier)
+        S_ = S_[underlier] if S_.ndim else S_
+        q_ = q_[underlier] if q_.ndim else q_
+    quantity_, theta, S_, K_, t_, r_, sigma_, q_ = numpy.broadcast_arrays(
+        quantity_, theta, S_, K_, t_, r_, sigma_, q_)
+
+    # Forward pass
+    sqrt_t = numpy.sqrt(t_)
+    sigma_sqrt_t = sigma_ * sqrt_t
+    d1 = (numpy.log(S_ / K_) + (r_ - q_ + .5 * sigma_ * sigma_) * t_) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    dividend_discounted_S = S_ * numpy.exp(-q_ * t_)
+    discounted_K = K_ * numpy.exp(-r_ * t_)
+    N1 = norm_cdf(theta * d1)
+    N2 = norm_cdf(theta * d2)
+    value = numpy.sum(quantity_ * theta * (dividend_discounted_S * N1 - discounted_K * N2))
+
+    # Backward pass, from the adjoint of every price, which is its quantity.
+    # N(theta * d) has the derivative theta * pdf(d) and theta * theta = 1,
+    # so the adjoints of d1 and d2 need no flag.
+    weight = quantity_ * theta
+    d2_bar = -quantity_ * discounted_K * pdf(d2)
+    d1_bar = quantity_ * dividend_discounted_S * pdf(d1) + d2_bar
+    sigma_sqrt_t_bar = -d2_bar - d1_bar * d1 / sigma_sqrt_t
+    carry_bar = d1_bar * t_ / sigma_sqrt_t
+    dividend_discounted_S_bar = weight * N1
+    discounted_K_bar = -weight * N2
+
+    S_bar = d1_bar / (sigma_sqrt_t * S_) + dividend_discounted_S_bar * numpy.exp(-q_ * t_)
+    sigma_bar = carry_bar * sigma_ + sigma_sqrt_t_bar * sqrt_t
+    r_bar = carry_bar - discounted_K_bar * t_ * discounted_K
+    q_bar = -carry_bar - dividend_discounted_S_bar * t_ * dividend_discounted_S
+
+    return {
+        'value': value,
+        'S': _gradient_of_argument(S_bar, arguments[1], underlier),
+        'sigma': _gradient_of_argument(sigma_bar, arguments[5], None),
+        'r': _gradient_of_argument(r_bar, arguments[4], None),
+        'q': _gradient_of_argument(q_bar, arguments[6], underlier),
+    }
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
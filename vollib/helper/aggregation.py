@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.aggregation
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Position-weighted sums of greeks by group, e.g. by underlier, expiry
+      bucket and account.  The positions are read in chunks, and the
+      weighted greeks of every chunk are added straight into dense
+      per-group output arrays with numpy.bincount, so that no temporary
+      larger than a chunk is allocated, whatever the size of the portfolio.
+      As every bincount spans all groups, a chunk holds at least as many
+      positions as there are groups; with many groups the temporaries are
+      then as large as the outputs, and the bincounts cost no more than
+      reading the positions.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.parallel import DEFAULT_CHUNK_SIZE
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def aggregate_greeks(greeks, quantity, keys, shape=None, out=None, chunk_size=DEFAULT_CHUNK_SIZE):
+
+    """Return the sums of quantity * greek over the positions of every
+    group, for every greek.
+
+    A group is given by one integer key per position for each grouping
+    level, e.g. an underlier index, an expiry bucket and an account
+    index, and the sums of each greek are returned in an array with one
+    axis per level.  Pass the result as out to add further batches of
+    positions to it.
+
+    :param greeks: greeks by name, e.g. the result of all_greeks, with one
+        value per position
+    :type greeks: dict of numpy.ndarray
+    :param quantity: number of options in every position, negative when short
+    :type quantity: float or numpy.ndarray
+    :param keys: the keys of every position, an array per level; a single
+        one-dimensional array or list is one level
+    :type keys: numpy.ndarray of int, or sequence of them
+    :param shape: number of groups per level, by default the shape of out,
+        or else the largest key plus one
+    :type shape: int or tuple of int
+    :param out: arrays of the given shape to add the sums to
+    :type out: dict of numpy.ndarray
+    :param chunk_size: number of positions read at once, at least the
+        number of groups
+    :type chunk_size: int
+
+    :returns: dict mapping each greek to an array of shape shape
+
+    >>> greeks = {'delta': numpy.array([.5, -.3, .8, .1]), 'vega': numpy.array([.2, .2, .1, .05])}
+    >>> quantity = numpy.array([10., 5., -2., 4.])
+    >>> underlier, account = numpy.array([0, 0, 1, 1]), numpy.array([1, 0, 1, 1])
+    >>> totals = aggregate_greeks(greeks, quantity, (underlier, account))
+    >>> totals['delta'].round(12).tolist()
+    [[-1.5, 5.0], [0.0, -1.2]]
+    >>> aggregate_greeks(greeks, quantity, [0, 0, 1, 1])['vega'].tolist()
+    [3.0, 0.0]
+    """
+
+    # A sequence of integers is a single level.  Only its first element is
+    # looked at, as numpy.ndim(keys) would copy all levels into one array.
+    if not len(keys) or numpy.ndim(keys[0]) == 0:
+        keys = (keys,)
+    keys = [numpy.asarray(key).ravel() for key in keys]
+    if shape is None and out:
+        shape = next(iter(out.values())).shape
+    if shape is None:
+        shape = tuple(int(key.max()) + 1 if key.size else 0 for key in keys)
+    elif numpy.ndim(shape) == 0:
+        shape = (int(shape),)
+    shape = tuple(shape)
+    groups = int(numpy.prod(shape))
+    chunk_size = max(chunk_size, groups, 1)
+
+    sums = dict((name, numpy.zeros(groups)) for name in greeks)
+
+    quantity = numpy.asarray(quantity, dtype=float)
+    n = len(keys[0])
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        group = numpy.ravel_multi_index([key[start:stop] for key in keys], shape)
+        weight = quantity[start:stop] if quantity.ndim else quantity
+        for name, values in greeks.items():
+            sums[name] += numpy.bincount(group, numpy.asarray(values[start:stop]) * weight, minlength=groups)
+
+    if out is None:
+        return dict((name, total.reshape(shape)) for name, total in sums.items())
+    for name, total in sums.items():
+        out[name] += total.reshape(shape)
+    return out
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
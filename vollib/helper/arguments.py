@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.arguments
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Helpers for the wrappers that evaluate the vectorized functions of
+      vollib on rearranged inputs, such as vollib.helper.parallel and
+      vollib.helper.deduplication: they flatten the arguments of a call, and
+      take apart and rebuild its results, which are arrays, or tuples or
+      dicts of arrays.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def flat_arguments(args):
+
+    """Return the arguments with the arrays broadcast and flattened and the
+    scalars unchanged, whether each argument is an array, and the broadcast
+    shape.
+
+    :param args: the arguments of a vectorized function, scalars or arrays
+    :type args: sequence
+
+    :returns: tuple of (list, list of bool, tuple)
+
+    >>> args, is_array, shape = flat_arguments(['c', 100., numpy.array([[90.], [110.]]), numpy.array([.5, 1.])])
+    >>> [numpy.ndim(a) for a in args], is_array, shape
+    ([0, 0, 1, 1], [False, False, True, True], (2, 2))
+    """
+
+    args = [numpy.asarray(a) for a in args]
+    shape = numpy.broadcast(*args).shape
+    is_array = [a.ndim > 0 for a in args]
+    args = [numpy.broadcast_to(a, shape).ravel() if chunked else a[()]
+            for a, chunked in zip(args, is_array)]
+    return args, is_array, shape
+
+
+def leaves(result):
+
+    """Return the arrays of a result that is an array, or a tuple or dict
+    of arrays, in a fixed order.
+
+    :param result: the result of a vectorized function
+    :type result: numpy.ndarray, or tuple or dict of numpy.ndarray
+
+    :returns: list
+
+    >>> leaves({'vega': 2., 'delta': 1.})
+    [1.0, 2.0]
+    """
+
+    if isinstance(result, tuple):
+        return list(result)
+    if isinstance(result, dict):
+        return [result[k] for k in sorted(result)]
+    return [result]
+
+
+def like(template, leaves):
+
+    """Arrange leaves in the structure of the result template, undoing
+    leaves(template).
+
+    :param template: a result of the same structure
+    :type template: numpy.ndarray, or tuple or dict of numpy.ndarray
+    :param leaves: the arrays, in the order of leaves(template)
+    :type leaves: list
+
+    :returns: numpy.ndarray, or tuple or dict of numpy.ndarray
+
+    >>> sorted(like({'vega': 0., 'delta': 0.}, [1., 2.]).items())
+    [('delta', 1.0), ('vega', 2.0)]
+    """
+
+    if isinstance(template, tuple):
+        return tuple(leaves)
+    if isinstance(template, dict):
+        return dict(zip(sorted(template), leaves))
+    return leaves[0]
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
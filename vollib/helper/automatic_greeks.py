@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.automatic_greeks
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Greeks by forward mode automatic differentiation.  The price of the
+      generalized Black-Scholes model is evaluated once on dual numbers
+      (see vollib.helper.dual) seeded with the underlying price, the time to
+      expiration, the interest rate and the volatility, which yields the
+      exact first and second order greeks of every option without any
+      repricing and without the step size error of vollib.helper.numerical_greeks.
+      ======================================================================================
+
+    Note about the parameter "b":
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+       from Espen Gaarder Haug's
+      "The Complete Guide to Option Pricing Formulas," Second Edition,
+      page 90.
+
+      +-----------+------------------------------------------------------+
+      | b = r     |  gives the Black and Scholes (1973) stock option     |
+      |           |  model                                               |
+      +-----------+------------------------------------------------------+
+      | b = r -q  |  gives the Merton (1973) stock option model with     |
+      |           |  continuous dividend yield q                         |
+      +-----------+------------------------------------------------------+
+      | b = 0     |  gives the Black (1976) futures option model         |
+      +-----------+------------------------------------------------------+
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import vectorized_binary_flag
+from vollib.helper.dual import Dual
+from vollib.helper.dual import exp
+from vollib.helper.dual import log
+from vollib.helper.dual import sqrt
+from vollib.helper.dual import norm_cdf
+
+# -----------------------------------------------------------------------------
+# DATA
+
+FIRST_ORDER_GREEKS = ('delta', 'theta', 'vega', 'rho')
+SECOND_ORDER_GREEKS = ('gamma', 'vanna', 'volga', 'charm', 'veta')
+GREEKS = FIRST_ORDER_GREEKS + SECOND_ORDER_GREEKS
+
+# The variables every greek is differentiated by
+_VARIABLES = ('S', 't', 'r', 'sigma')
+_VARIABLES_OF_GREEK = {
+    'delta': ('S',),
+    'theta': ('t',),
+    'vega': ('sigma',),
+    'rho': ('r',),
+    'gamma': ('S', 'S'),
+    'vanna': ('S', 'sigma'),
+    'volga': ('sigma', 'sigma'),
+    'charm': ('S', 't'),
+    'veta': ('sigma', 't'),
+}
+
+# The greeks are scaled as the analytical greeks: per percentage point of
+# volatility and interest rate, and per calendar day as the option ages.
+_SCALE_OF_GREEK = {
+    'delta': 1.,
+    'theta': -1. / 365.,
+    'vega': .01,
+    'rho': .01,
+    'gamma': 1.,
+    'vanna': .01,
+    'volga': .0001,
+    'charm': -1. / 365.,
+    'veta': -.01 / 365.,
+}
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def generalized_black_scholes(binary_flag, S, K, t, r, sigma, b):
+
+    """Return the price of an option in the generalized Black-Scholes
+    model.  Every argument but binary_flag may be a Dual.
+
+        :param binary_flag: 1. or -1. for call or put, or an array of them
+        :type binary_flag: float or numpy.ndarray
+        :param S: underlying asset price
+        :type S: float, numpy.ndarray or Dual
+        :param K: strike price
+        :type K: float, numpy.ndarray or Dual
+        :param t: time to expiration in years
+        :type t: float, numpy.ndarray or Dual
+        :param r: risk-free interest rate
+        :type r: float, numpy.ndarray or Dual
+        :param sigma: annualized standard deviation, or volatility
+        :type sigma: float, numpy.ndarray or Dual
+        :param b: see above
+        :type b: float, numpy.ndarray or Dual
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> price = generalized_black_scholes(-1., 49., 50., .3846, .05, .2, .05)
+    >>> abs(price - black_scholes('p', 49., 50., .3846, .05, .2)) < 1e-12
+    True
+    """
+
+    sigma_sqrt_t = sigma * sqrt(t)
+    d1 = (log(S / K) + (b + sigma * sigma * .5) * t) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    return binary_flag * (S * exp((b - r) * t) * norm_cdf(binary_flag * d1) -
+                          K * exp(-r * t) * norm_cdf(binary_flag * d2))
+
+
+def all_greeks(flag, S, K, t, r, sigma, pricing_function, greeks=GREEKS):
+
+    """Calculate the price and several greeks of many options by automatic
+    differentiation of a single call to pricing_function.
+
+    Only the variables and orders of differentiation the requested greeks
+    need are propagated.  The greeks are exact derivatives, scaled as the
+    analytical greeks: vega, rho, vanna and veta per percentage point,
+    volga per percentage point squared, and theta, charm and veta per
+    calendar day.  The time to expiration must be positive.
+
+    ::
+
+      ==========================================================
+      vanna: change in delta per point of volatility
+      volga: change in vega per point of volatility
+      charm: change in delta per day
+      veta: change in vega per day
+      ==========================================================
+
+        :param flag: 'c' or 'p' for call or put.
+        :type flag: str or numpy.ndarray
+        :param S: underlying asset price
+        :type S: float or numpy.ndarray
+        :param K: strike price
+        :type K: float or numpy.ndarray
+        :param t: time to expiration in years
+        :type t: float or numpy.ndarray
+        :param r: risk-free interest rate
+        :type r: float or numpy.ndarray
+        :param sigma: annualized standard deviation, or volatility
+        :type sigma: float or numpy.ndarray
+        :param pricing_function: a function of (binary_flag, S, K, t, r, sigma)
+            written with the operators and functions of vollib.helper.dual,
+            e.g. generalized_black_scholes with the b of the model
+        :type pricing_function: python function object
+        :param greeks: names of the greeks to calculate, a subset of GREEKS
+        :type greeks: sequence of str
+
+        :returns: dict mapping 'price' and each requested greek to an array of the broadcast shape
+
+    >>> f = lambda q, S, K, t, r, sigma: generalized_black_scholes(q, S, K, t, r, sigma, r)
+    >>> greeks = all_greeks('c', 49., numpy.array([45., 50., 55.]), .3846, .05, .2, f)
+    >>> greeks['delta'].round(6).tolist()
+    [0.816905, 0.521602, 0.237534]
+    >>> sorted(all_greeks('c', 49., 50., .3846, .05, .2, f, greeks=['vega', 'rho']))
+    ['price', 'rho', 'vega']
+    """
+
+    unknown = set(greeks) - set(GREEKS)
+    if unknown:
+        raise KeyError(sorted(unknown)[0])
+
+    flag, S, K, t, r, sigma = numpy.broadcast_arrays(
+        numpy.asarray(flag), *[numpy.asarray(a, dtype=float) for a in (S, K, t, r, sigma)])
+    inputs = {'S': S, 't': t, 'r': r, 'sigma': sigma}
+
+    # Seed only the variables, and propagate only the second derivatives,
+    # that the greeks need
+    needed = set(v for greek in greeks for v in _VARIABLES_OF_GREEK[greek])
+    variables = [v for v in _VARIABLES if v in needed]
+    pairs = sorted(set(tuple(sorted(variables.index(v) for v in _VARIABLES_OF_GREEK[greek]))
+                       for greek in greeks if greek in SECOND_ORDER_GREEKS))
+    if variables:
+        inputs.update(zip(variables, Dual.variables([inputs[v] for v in variables], bool(pairs), pairs)))
+
+    price = pricing_function(vectorized_binary_flag(flag), inputs['S'], K,
+                             inputs['t'], inputs['r'], inputs['sigma'])
+
+    result = {'price': price.value if variables else price}
+    for greek in greeks:
+        index = tuple(sorted(variables.index(v) for v in _VARIABLES_OF_GREEK[greek]))
+        if len(index) == 1:
+            derivative = price.gradient[index[0]]
+        else:
+            derivative = price.hessian[pairs.index(index)]
+        result[greek] = derivative * _SCALE_OF_GREEK[greek]
+    return dict((name, numpy.asarray(value)[()]) for name, value in result.items())
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
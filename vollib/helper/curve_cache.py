@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.curve_cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      A bounded cache of the discount factors exp(-r*t) and growth factors
+      exp(b*t) used by the pricing, implied volatility and greek functions,
+      scalar, vectorized and fused alike.  A book has only a few hundred
+      distinct (r, t) pairs, so most scalar calls find their exponential in
+      the cache, and so does a batch of one expiry passed with a scalar rate
+      and time.  Array arguments are not cached: one numpy.exp over the
+      array is cheaper than looking up every element.  The reference
+      implementations (python_black_scholes and the like) and the automatic
+      differentiation helpers compute their own exponentials.
+
+      Entries are keyed by the rates and times themselves, so they never go
+      stale; clear() releases them, e.g. after a curve update has replaced
+      every rate.  Cached values are bit-identical to numpy.exp.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+import threading
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+
+# -----------------------------------------------------------------------------
+# DATA
+
+DEFAULT_MAXSIZE = 4096
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class CurveCache(object):
+
+    """A least recently used cache of discount and growth factors.
+
+    When the cache is full, the least recently used quarter of the entries
+    is evicted at once, which keeps the bookkeeping of a hit to a counter.
+    The hits and misses counters are not locked, and may undercount under
+    heavy concurrent use.
+
+    :param maxsize: maximum number of cached factors
+    :type maxsize: int
+
+    >>> cache = CurveCache(maxsize=2)
+    >>> cache.discount_factor(.02, .5) == numpy.exp(-.02*.5)
+    True
+    >>> df = cache.discount_factor(.02, .5)
+    >>> g = cache.growth_factor(.01, .5)
+    >>> df = cache.discount_factor(.03, .5)
+    >>> cache.hits, cache.misses, len(cache)
+    (1, 3, 2)
+    >>> cache.discount_factor(numpy.array([.02, .03]), .5).tolist() == numpy.exp(-numpy.array([.02, .03])*.5).tolist()
+    True
+    >>> cache.clear()
+    >>> len(cache)
+    0
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def discount_factor(self, r, t):
+
+        """Return exp(-r*t).
+
+        :param r: risk-free interest rate
+        :type r: float or numpy.ndarray
+        :param t: time to expiration in years
+        :type t: float or numpy.ndarray
+        """
+
+        try:
+            entry = self._entries.get(('discount', r, t))
+        except TypeError:
+            # Arrays are unhashable
+            return numpy.exp(-numpy.asarray(r, dtype=float)*t)
+        self._clock += 1
+        if entry is not None:
+            self.hits += 1
+            entry[1] = self._clock
+            return entry[0]
+        self.misses += 1
+        value = numpy.exp(-r*t)
+        self._store(('discount', r, t), value)
+        return value
+
+    def growth_factor(self, b, t):
+
+        """Return exp(b*t), e.g. the ratio exp((r-q)*t) of the forward to
+        the spot price for a cost of carry b = r-q.
+
+        :param b: cost of carry
+        :type b: float or numpy.ndarray
+        :param t: time to expiration in years
+        :type t: float or numpy.ndarray
+        """
+
+        try:
+            entry = self._entries.get(('growth', b, t))
+        except TypeError:
+            return numpy.exp(numpy.asarray(b, dtype=float)*t)
+        self._clock += 1
+        if entry is not None:
+            self.hits += 1
+            entry[1] = self._clock
+            return entry[0]
+        self.misses += 1
+        value = numpy.exp(b*t)
+        self._store(('growth', b, t), value)
+        return value
+
+    def _store(self, key, value):
+
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                by_last_use = sorted(self._entries.items(), key=lambda item: item[1][1])
+                for k, entry in by_last_use[:max(1, self.maxsize // 4)]:
+                    del self._entries[k]
+            self._entries[key] = [value, self._clock]
+
+    def clear(self):
+
+        """Drop all cached factors."""
+
+        with self._lock:
+            self._entries.clear()
+
+
+# -----------------------------------------------------------------------------
+# DATA - SHARED CACHE
+
+# The cache used throughout vollib
+curve_cache = CurveCache()
+
+discount_factor = curve_cache.discount_factor
+growth_factor = curve_cache.growth_factor
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
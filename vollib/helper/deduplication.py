@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.deduplication
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Evaluation of the vectorized functions on the distinct rows of their
+      inputs only, for books that hold the same contract many times, e.g.
+      in different accounts.  The rows are numbered with hash-based
+      factorization, one column at a time, which is linear in the number of
+      rows; sorting the rows with numpy.unique would cost more than pricing
+      them.  The results are scattered back to every original row.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+import pandas
+
+# Local application/library specific imports
+from vollib.helper.arguments import flat_arguments
+from vollib.helper.arguments import leaves
+from vollib.helper.arguments import like
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def unique_rows(*args):
+
+    """Find the distinct rows of the broadcast arguments.
+
+    Scalar arguments are the same in every row and are returned as they
+    are.  nan compares equal to nan.
+
+    :param args: scalars or arrays
+
+    :returns: tuple of (list, numpy.ndarray, tuple) of the arguments
+        restricted to the distinct rows, the index of the distinct row of
+        every row, and the broadcast shape
+
+    >>> args, inverse, shape = unique_rows('c', 100., [90., 95., 90., 90.], [.5, .5, .5, .25])
+    >>> args[2].tolist(), args[3].tolist(), inverse.tolist()
+    ([90.0, 95.0, 90.0], [0.5, 0.5, 0.25], [0, 1, 0, 2])
+    """
+
+    args, is_array, shape = flat_arguments(args)
+    size = int(numpy.prod(shape))
+
+    inverse = numpy.zeros(size, dtype=numpy.int64)
+    count = 1
+    for a, chunked in zip(args, is_array):
+        if chunked:
+            # Shift the codes so that nan, which pandas codes as -1, is a value too.
+            codes, uniques = pandas.factorize(a)
+            inverse, combined = pandas.factorize(inverse * (len(uniques) + 1) + (codes + 1))
+            count = len(combined)
+    if not any(is_array):
+        return args, inverse, shape
+
+    first = numpy.empty(count, dtype=numpy.int64)
+    first[inverse[::-1]] = numpy.arange(size - 1, -1, -1)
+    return [a[first] if chunked else a for a, chunked in zip(args, is_array)], inverse, shape
+
+
+def map_unique(function, *args):
+
+    """Return function(*args), evaluating function only on the distinct
+    rows of the broadcast arguments.
+
+    :param function: a vectorized vollib function
+    :type function: function
+    :param args: the arguments of function, scalars or arrays
+
+    :returns: numpy.ndarray, or tuple or dict of numpy.ndarray, with the broadcast shape of args
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> K = numpy.array([90., 100., 90., 100., 90.])
+    >>> prices = map_unique(black_scholes, 'c', 100., K, .5, .01, .2)
+    >>> bool(numpy.all(prices == black_scholes('c', 100., K, .5, .01, .2)))
+    True
+
+    Functions returning tuples or dicts of arrays, such as the vectorized
+    implied volatilities and all_greeks, are scattered element-wise.
+
+    >>> from vollib.black_scholes.greeks.analytical import all_greeks
+    >>> greeks = map_unique(all_greeks, ['c', 'p', 'c', 'p', 'c'], 100., K, .5, .01, .2)
+    >>> greeks['delta'][0] == greeks['delta'][4], greeks['delta'].shape
+    (True, (5,))
+    """
+
+    unique_args, inverse, shape = unique_rows(*args)
+    result = function(*unique_args)
+    return like(result, [numpy.asarray(leaf).ravel()[inverse].reshape(shape)[()]
+                         for leaf in leaves(result)])
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.dual
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Forward mode automatic differentiation with dual numbers.  A Dual
+      carries a value together with its gradient and, optionally, its
+      Hessian with respect to a few independent variables.  The arithmetic
+      operators and the functions below propagate them by the chain rule,
+      so a formula written with them returns its exact first and second
+      derivatives along with its value, in a single evaluation.  Only the
+      second derivatives that are asked for are propagated.  Values may be
+      numpy arrays, in which case every element is differentiated
+      independently.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.normaldistribution import norm_cdf as _norm_cdf
+from vollib.helper.normaldistribution import norm_pdf as _norm_pdf
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class Dual(object):
+
+    """A value with its derivatives with respect to n variables.
+
+    gradient has the shape (n,) + value.shape.  hessian holds the second
+    derivatives with respect to m pairs of variables, which are listed by
+    pairs, a tuple of two integer arrays of length m; it has the shape
+    (m,) + value.shape, or is None if only first derivatives are propagated.
+
+    :param value: the value
+    :type value: float or numpy.ndarray
+    :param gradient: the first derivatives
+    :type gradient: numpy.ndarray
+    :param hessian: the second derivatives, or None
+    :type hessian: numpy.ndarray
+    :param pairs: the variables of every second derivative
+    :type pairs: tuple of numpy.ndarray
+
+    >>> x, y = Dual.variables([2., 3.])
+    >>> z = x * x * y + 1.
+    >>> z.value, z.gradient.tolist(), z.hessian.tolist()
+    (13.0, [12.0, 4.0], [6.0, 4.0, 0.0])
+    >>> [pair.tolist() for pair in z.pairs]
+    [[0, 0, 1], [0, 1, 1]]
+    """
+
+    # Let numpy hand binary operations with arrays over to Dual
+    __array_priority__ = 1000
+
+    def __init__(self, value, gradient, hessian=None, pairs=None):
+
+        self.value = value
+        self.gradient = gradient
+        self.hessian = hessian
+        self.pairs = pairs
+
+    @classmethod
+    def variables(cls, values, second_order=True, pairs=None):
+
+        """Return independent variables with the given values, which are
+        broadcast against each other.
+
+        :param values: the values of the variables
+        :type values: sequence of float or numpy.ndarray
+        :param second_order: whether to propagate second derivatives
+        :type second_order: bool
+        :param pairs: the pairs of indices into values of the second
+            derivatives to propagate, by default all of them
+        :type pairs: sequence of (int, int)
+
+        :returns: list of Dual
+        """
+
+        values = numpy.broadcast_arrays(*[numpy.asarray(v, dtype=float) for v in values])
+        n = len(values)
+        if not second_order:
+            pairs = None
+        else:
+            if pairs is None:
+                pairs = [(i, j) for i in range(n) for j in range(i, n)]
+            first, second = zip(*pairs) if pairs else ((), ())
+            pairs = (numpy.array(first, dtype=int), numpy.array(second, dtype=int))
+        variables = []
+        for i, value in enumerate(values):
+            gradient = numpy.zeros((n,) + value.shape)
+            gradient[i] = 1.
+            hessian = None if pairs is None else numpy.zeros((len(pairs[0]),) + value.shape)
+            variables.append(cls(value[()], gradient, hessian, pairs))
+        return variables
+
+    def _outer(self, a, b):
+
+        """Return the products of the derivatives a and b of every pair."""
+
+        first, second = self.pairs
+        return a[first] * b[second]
+
+    def chain(self, f0, f1, f2=None):
+
+        """Return f(self) from the value f0, the first derivative f1 and
+        the second derivative f2 of a function f at self.value."""
+
+        gradient = f1 * self.gradient
+        hessian = None
+        if self.hessian is not None:
+            hessian = f1 * self.hessian + f2 * self._outer(self.gradient, self.gradient)
+        return Dual(f0, gradient, hessian, self.pairs)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.gradient, None if self.hessian is None else -self.hessian, self.pairs)
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            hessian = None if self.hessian is None else self.hessian + other.hessian
+            return Dual(self.value + other.value, self.gradient + other.gradient, hessian, self.pairs)
+        return Dual(self.value + other, self.gradient, self.hessian, self.pairs)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            gradient = self.gradient * other.value + other.gradient * self.value
+            hessian = None
+            if self.hessian is not None:
+                hessian = self.hessian * other.value + other.hessian * self.value + \
+                          self._outer(self.gradient, other.gradient) + \
+                          self._outer(other.gradient, self.gradient)
+            return Dual(self.value * other.value, gradient, hessian, self.pairs)
+        return Dual(self.value * other, self.gradient * other,
+                    None if self.hessian is None else self.hessian * other, self.pairs)
+
+    __rmul__ = __mul__
+
+    def reciprocal(self):
+
+        """Return 1 / self."""
+
+        r = 1. / self.value
+        return self.chain(r, -r * r, 2. * r * r * r)
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return self * other.reciprocal()
+        return self * (1. / other)
+
+    def __rtruediv__(self, other):
+        return self.reciprocal() * other
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, p):
+        return self.chain(self.value ** p, p * self.value ** (p - 1.), p * (p - 1.) * self.value ** (p - 2.))
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def exp(x):
+
+    """Return the exponential of a Dual or of a number or array.
+
+    >>> x, = Dual.variables([0.])
+    >>> y = exp(2. * x)
+    >>> y.value, y.gradient.tolist(), y.hessian.tolist()
+    (1.0, [2.0], [4.0])
+    """
+
+    if isinstance(x, Dual):
+        e = numpy.exp(x.value)
+        return x.chain(e, e, e)
+    return numpy.exp(x)
+
+
+def log(x):
+
+    """Return the natural logarithm of a Dual or of a number or array."""
+
+    if isinstance(x, Dual):
+        r = 1. / x.value
+        return x.chain(numpy.log(x.value), r, -r * r)
+    return numpy.log(x)
+
+
+def sqrt(x):
+
+    """Return the square root of a Dual or of a number or array."""
+
+    if isinstance(x, Dual):
+        s = numpy.sqrt(x.value)
+        return x.chain(s, .5 / s, -.25 / (s * x.value))
+    return numpy.sqrt(x)
+
+
+def norm_cdf(x):
+
+    """Return the standard normal cumulative distribution of a Dual or of
+    a number or array.
+
+    >>> x, = Dual.variables([0.])
+    >>> y = norm_cdf(x)
+    >>> y.value, round(y.gradient[0], 12), y.hessian[0] == 0.
+    (0.5, 0.398942280401, True)
+    """
+
+    if isinstance(x, Dual):
+        pdf = _norm_pdf(x.value)
+        return x.chain(_norm_cdf(x.value), pdf, -x.value * pdf)
+    return _norm_cdf(x)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.erf_cody
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      A numpy port of erf_cody.cpp from LetsBeRational, itself a translation of
+      W. J. Cody's CALERF (http://www.netlib.org/specfun/erf).  The three
+      intervals of the original are evaluated on masked sub-arrays, so every
+      function below accepts scalars or arrays of any shape.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+
+# -----------------------------------------------------------------------------
+# DATA
+
+A = (3.1611237438705656, 113.864154151050156, 377.485237685302021,
+     3209.37758913846947, .185777706184603153)
+B = (23.6012909523441209, 244.024637934444173, 1282.61652607737228,
+     2844.23683343917062)
+C = (.564188496988670089, 8.88314979438837594, 66.1191906371416295,
+     298.635138197400131, 881.95222124176909, 1712.04761263407058,
+     2051.07837782607147, 1230.33935479799725, 2.15311535474403846e-8)
+D = (15.7449261107098347, 117.693950891312499, 537.181101862009858,
+     1621.38957456669019, 3290.79923573345963, 4362.61909014324716,
+     3439.36767414372164, 1230.33935480374942)
+P = (.305326634961232344, .360344899949804439, .125781726111229246,
+     .0160837851487422766, 6.58749161529837803e-4, .0163153871373020978)
+Q = (2.56852019228982242, 1.87295284992346047, .527905102951428412,
+     .0605183413124413191, .00233520497626869185)
+
+SQRPI = 0.56418958354775628695
+THRESH = .46875
+
+# The numbers below were preselected for IEEE double precision.
+XINF = 1.79e308
+XNEG = -26.628
+XSMALL = 1.11e-16
+XBIG = 26.543
+XHUGE = 6.71e7
+XMAX = 2.53e307
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def _exp_of_minus_square(y):
+
+    """exp(-y*y), evaluated in two pieces to avoid losing accuracy."""
+
+    ysq = numpy.trunc(y * 16.) / 16.
+    delta = (y - ysq) * (y + ysq)
+    return numpy.exp(-ysq * ysq) * numpy.exp(-delta)
+
+
+def calerf(x, jint):
+
+    """Evaluate erf(x), erfc(x) or exp(x*x)*erfc(x) for a real argument.
+
+    :param x: the argument
+    :type x: float or numpy.ndarray
+    :param jint: 0 for erf, 1 for erfc, 2 for erfcx
+    :type jint: int
+
+    :returns: float or numpy.ndarray of the same shape as x
+
+    >>> abs(calerf(0.5, 0) - 0.5204998778130465) < 1e-16
+    True
+    >>> calerf(numpy.array([-1.0, 0.0, 1.0]), 1).round(8).tolist()
+    [1.84270079, 1.0, 0.15729921]
+    """
+
+    x = numpy.asarray(x, dtype=float)
+    shape = x.shape
+    x = x.ravel()
+    y = numpy.abs(x)
+    result = numpy.zeros_like(y)
+    # The intervals are selected with index arrays rather than boolean
+    # masks, which numpy gathers and scatters considerably faster.
+    is_first = y <= THRESH
+
+    # Evaluate erf for |x| <= 0.46875
+    first = numpy.flatnonzero(is_first)
+    if first.size:
+        yf = y[first]
+        ysq = numpy.where(yf > XSMALL, yf * yf, 0.0)
+        xnum = A[4] * ysq
+        xden = ysq
+        for i in range(3):
+            xnum = (xnum + A[i]) * ysq
+            xden = (xden + B[i]) * ysq
+        r = x[first] * (xnum + A[3]) / (xden + B[3])
+        if jint != 0:
+            r = 1. - r
+        if jint == 2:
+            r = numpy.exp(ysq) * r
+        result[first] = r
+
+    # Evaluate erfc for 0.46875 <= |x| <= 4.0
+    second = numpy.flatnonzero(~is_first & (y <= 4.))
+    if second.size:
+        ys = y[second]
+        xnum = C[8] * ys
+        xden = ys
+        for i in range(7):
+            xnum = (xnum + C[i]) * ys
+            xden = (xden + D[i]) * ys
+        r = (xnum + C[7]) / (xden + D[7])
+        if jint != 2:
+            r = _exp_of_minus_square(ys) * r
+        result[second] = r
+
+    # Evaluate erfc for |x| > 4.0
+    is_third = y > 4.
+    if jint == 2:
+        huge = numpy.flatnonzero(is_third & (y >= XHUGE) & (y < XMAX))
+        result[huge] = SQRPI / y[huge]
+        is_third &= y < XHUGE
+    else:
+        is_third &= y < XBIG
+    third = numpy.flatnonzero(is_third)
+    if third.size:
+        yt = y[third]
+        ysq = 1. / (yt * yt)
+        xnum = P[5] * ysq
+        xden = ysq
+        for i in range(4):
+            xnum = (xnum + P[i]) * ysq
+            xden = (xden + Q[i]) * ysq
+        r = ysq * (xnum + P[4]) / (xden + Q[4])
+        r = (SQRPI - r) / yt
+        if jint != 2:
+            r = _exp_of_minus_square(yt) * r
+        result[third] = r
+
+    # Fix up the arguments beyond the first interval, which was final already
+    is_negative = ~is_first & (x < 0.)
+    if jint == 0:
+        outer = numpy.flatnonzero(~is_first)
+        result[outer] = (.5 - result[outer]) + .5
+        negative = numpy.flatnonzero(is_negative)
+        result[negative] = -result[negative]
+    elif jint == 1:
+        negative = numpy.flatnonzero(is_negative)
+        result[negative] = 2. - result[negative]
+    else:
+        is_overflow = x < XNEG
+        result[is_overflow] = XINF
+        negative = numpy.flatnonzero(is_negative & ~is_overflow)
+        if negative.size:
+            xn = x[negative]
+            ysq = numpy.trunc(xn * 16.) / 16.
+            delta = (xn - ysq) * (xn + ysq)
+            e = numpy.exp(ysq * ysq) * numpy.exp(delta)
+            result[negative] = (e + e) - result[negative]
+
+    return result.reshape(shape)[()]
+
+
+def erf_cody(x):
+
+    """Return the error function erf(x).
+
+    :param x: the argument
+    :type x: float or numpy.ndarray
+
+    >>> from math import erf
+    >>> abs(erf_cody(0.3) - erf(0.3)) < 1e-16
+    True
+    """
+
+    return calerf(x, 0)
+
+
+def erfc_cody(x):
+
+    """Return the complementary error function erfc(x).
+
+    :param x: the argument
+    :type x: float or numpy.ndarray
+
+    >>> from math import erfc
+    >>> abs(erfc_cody(5.0) - erfc(5.0)) / erfc(5.0) < 1e-15
+    True
+    """
+
+    return calerf(x, 1)
+
+
+def erfcx_cody(x):
+
+    """Return the scaled complementary error function exp(x*x)*erfc(x).
+
+    :param x: the argument
+    :type x: float or numpy.ndarray
+
+    >>> from math import erfc, exp
+    >>> abs(erfcx_cody(2.0) - exp(4.0)*erfc(2.0)) < 1e-15
+    True
+    """
+
+    return calerf(x, 2)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.normaldistribution
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      A numpy port of normaldistribution.cpp from LetsBeRational.  All functions
+      accept scalars or arrays.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import ONE_OVER_SQRT_TWO_PI
+from vollib.helper.erf_cody import erfc_cody
+
+# -----------------------------------------------------------------------------
+# DATA
+
+ONE_OVER_SQRT_TWO = 0.7071067811865475244008443621048490392848359376887
+SQRT_TWO_PI = 2.506628274631000502415765284811045253006986740610
+
+DBL_EPSILON = numpy.finfo(float).eps
+DBL_MAX = numpy.finfo(float).max
+
+# The asymptotic expansion  Φ(z) = φ(z)/|z|·[1-1/z^2+...],  Abramowitz & Stegun (26.2.12),
+# suffices for Φ(z) to have relative accuracy of 1.64E-16 for z<=-10.
+NORM_CDF_ASYMPTOTIC_EXPANSION_FIRST_THRESHOLD = -10.0
+NORM_CDF_ASYMPTOTIC_EXPANSION_SECOND_THRESHOLD = -1 / numpy.sqrt(DBL_EPSILON)
+
+# Constants of algorithm AS241 for inverse_norm_cdf
+SPLIT1 = 0.425
+SPLIT2 = 5.0
+CONST1 = 0.180625
+CONST2 = 1.6
+
+A0 = 3.3871328727963666080E0
+A1 = 1.3314166789178437745E+2
+A2 = 1.9715909503065514427E+3
+A3 = 1.3731693765509461125E+4
+A4 = 4.5921953931549871457E+4
+A5 = 6.7265770927008700853E+4
+A6 = 3.3430575583588128105E+4
+A7 = 2.5090809287301226727E+3
+B1 = 4.2313330701600911252E+1
+B2 = 6.8718700749205790830E+2
+B3 = 5.3941960214247511077E+3
+B4 = 2.1213794301586595867E+4
+B5 = 3.9307895800092710610E+4
+B6 = 2.8729085735721942674E+4
+B7 = 5.2264952788528545610E+3
+C0 = 1.42343711074968357734E0
+C1 = 4.63033784615654529590E0
+C2 = 5.76949722146069140550E0
+C3 = 3.64784832476320460504E0
+C4 = 1.27045825245236838258E0
+C5 = 2.41780725177450611770E-1
+C6 = 2.27238449892691845833E-2
+C7 = 7.74545014278341407640E-4
+D1 = 2.05319162663775882187E0
+D2 = 1.67638483018380384940E0
+D3 = 6.89767334985100004550E-1
+D4 = 1.48103976427480074590E-1
+D5 = 1.51986665636164571966E-2
+D6 = 5.47593808499534494600E-4
+D7 = 1.05075007164441684324E-9
+E0 = 6.65790464350110377720E0
+E1 = 5.46378491116411436990E0
+E2 = 1.78482653991729133580E0
+E3 = 2.96560571828504891230E-1
+E4 = 2.65321895265761230930E-2
+E5 = 1.24266094738807843860E-3
+E6 = 2.71155556874348757815E-5
+E7 = 2.01033439929228813265E-7
+F1 = 5.99832206555887937690E-1
+F2 = 1.36929880922735805310E-1
+F3 = 1.48753612908506148525E-2
+F4 = 7.86869131145613259100E-4
+F5 = 1.84631831751005468180E-5
+F6 = 1.42151175831644588870E-7
+F7 = 2.04426310338993978564E-15
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def norm_pdf(x):
+
+    """Return the standard normal probability density.
+
+    :param x: a continuous random variable
+    :type x: float or numpy.ndarray
+
+    >>> abs(norm_pdf(0.0) - ONE_OVER_SQRT_TWO_PI) < 1e-16
+    True
+    """
+
+    return ONE_OVER_SQRT_TWO_PI * numpy.exp(-.5 * x * x)
+
+
+def norm_cdf(z):
+
+    """Return the standard normal cumulative distribution.
+
+    :param z: a continuous random variable
+    :type z: float or numpy.ndarray
+
+    >>> import lets_be_rational
+    >>> z = numpy.array([-38.0, -12.5, -3.0, 0.0, 0.7, 9.0])
+    >>> expected = numpy.array([lets_be_rational.norm_cdf(v) for v in z])
+    >>> bool(numpy.all(abs(norm_cdf(z) - expected) <= 1e-15 * expected))
+    True
+    """
+
+    z = numpy.asarray(z, dtype=float)
+    shape = z.shape
+    z = z.ravel()
+    result = numpy.empty_like(z)
+
+    is_central = z > NORM_CDF_ASYMPTOTIC_EXPANSION_FIRST_THRESHOLD
+    central = numpy.flatnonzero(is_central)
+    result[central] = 0.5 * erfc_cody(-z[central] * ONE_OVER_SQRT_TWO)
+
+    tail = numpy.flatnonzero(~is_central)
+    if tail.size:
+        # Asymptotic expansion for very negative z following (26.2.12) on page 408
+        # in M. Abramowitz and A. Stegun, Pocketbook of Mathematical Functions.
+        zt = z[tail]
+        zsqr = zt * zt
+        total = numpy.ones_like(zt)
+        g = numpy.ones_like(zt)
+        a = numpy.empty_like(zt)
+        a.fill(DBL_MAX)
+        active = zt >= NORM_CDF_ASYMPTOTIC_EXPANSION_SECOND_THRESHOLD
+        i = 1.
+        while active.any():
+            last_a = a[active]
+            x = (4 * i - 3) / zsqr[active]
+            y = x * ((4 * i - 1) / zsqr[active])
+            term = g[active] * (x - y)
+            total[active] -= term
+            g[active] *= y
+            a[active] = numpy.abs(term)
+            still_converging = (last_a > a[active]) & \
+                               (a[active] >= numpy.abs(total[active] * DBL_EPSILON))
+            active[active] = still_converging
+            i += 1
+        result[tail] = -norm_pdf(zt) * total / zt
+
+    return result.reshape(shape)[()]
+
+
+def inverse_norm_cdf(u):
+
+    """Return the normal deviate z with lower tail probability u, using
+    algorithm AS241, Appl. Statist. (1988) Vol. 37, No. 3, which is
+    accurate to about 1 part in 10**16.
+
+    :param u: lower tail probability
+    :type u: float or numpy.ndarray
+
+    >>> z = numpy.array([-37.0, -9.25, -2.3, -0.5, 0.0, 1.9])
+    >>> bool(numpy.all(abs(inverse_norm_cdf(norm_cdf(z)) - z) <= 1e-15 * (1 + abs(z))))
+    True
+    >>> inverse_norm_cdf(0.0)
+    -inf
+    """
+
+    u = numpy.asarray(u, dtype=float)
+    shape = u.shape
+    u = u.ravel()
+    result = numpy.empty_like(u)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        result[u <= 0] = numpy.log(u[u <= 0])
+        result[u >= 1] = numpy.log(1 - u[u >= 1])
+
+    q = u - 0.5
+    inside = (u > 0) & (u < 1)
+
+    # Coefficients for u close to 0.5
+    central = inside & (numpy.abs(q) <= SPLIT1)
+    qc = q[central]
+    r = CONST1 - qc * qc
+    result[central] = qc * (((((((A7 * r + A6) * r + A5) * r + A4) * r + A3) * r + A2) * r + A1) * r + A0) / \
+        (((((((B7 * r + B6) * r + B5) * r + B4) * r + B3) * r + B2) * r + B1) * r + 1.0)
+
+    tails = inside & ~central
+    qt = q[tails]
+    r = numpy.sqrt(-numpy.log(numpy.where(qt < 0.0, u[tails], 1.0 - u[tails])))
+    ret = numpy.empty_like(r)
+    # Coefficients for u not close to 0, 0.5 or 1.
+    near = r < SPLIT2
+    rn = r[near] - CONST2
+    ret[near] = (((((((C7 * rn + C6) * rn + C5) * rn + C4) * rn + C3) * rn + C2) * rn + C1) * rn + C0) / \
+        (((((((D7 * rn + D6) * rn + D5) * rn + D4) * rn + D3) * rn + D2) * rn + D1) * rn + 1.0)
+    # Coefficients for u very close to 0 or 1
+    rf = r[~near] - SPLIT2
+    ret[~near] = (((((((E7 * rf + E6) * rf + E5) * rf + E4) * rf + E3) * rf + E2) * rf + E1) * rf + E0) / \
+        (((((((F7 * rf + F6) * rf + F5) * rf + F4) * rf + F3) * rf + F2) * rf + F1) * rf + 1.0)
+    result[tails] = numpy.where(qt < 0.0, -ret, ret)
+
+    return result.reshape(shape)[()]
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -63,8 +63,10 @@
 # Standard library imports
 
 # Related third party imports
+import numpy
 
 # Local application/library specific imports
+from vollib.helper import vectorized_binary_flag
 
 
 # -----------------------------------------------------------------------------
@@ -221,3 +223,110 @@ def gamma(flag, S, K, t, r, sigma, b, pricing_function):
     return (pricing_function(flag, S + dS, K, t, r, sigma, b) - 2. * \
             pricing_function(flag, S, K, t, r, sigma, b) + \
             pricing_function(flag, S - dS, K, t, r, sigma, b)) / dS ** 2.
+
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - BATCHED NUMERICAL GREEK CALCULATION
+
+GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+# The repricing scenarios each finite difference above depends on
+_SCENARIOS_OF_GREEK = {
+    'delta': ('S+dS', 'S-dS'),
+    'gamma': ('S+dS', 'center', 'S-dS'),
+    'theta': ('t-1d', 'center'),
+    'vega': ('sigma+1%', 'sigma-1%'),
+    'rho': ('r+1%', 'r-1%'),
+}
+
+
+def all_greeks(flag, S, K, t, r, sigma, b, pricing_function, greeks=GREEKS):
+
+    """Calculate several numerical greeks of many options from a single
+    call to pricing_function.
+
+    The same finite differences as delta, gamma, theta, vega and rho above
+    are used, but every bumped input a requested greek needs is priced
+    only once and all options are priced together: a full set needs 8
+    prices per option rather than 11.  pricing_function must therefore
+    accept numpy arrays for all of its arguments, flag included.
+
+        :param S: underlying asset price
+        :type S: float or numpy.ndarray
+        :param K: strike price
+        :type K: float or numpy.ndarray
+        :param sigma: annualized standard deviation, or volatility
+        :type sigma: float or numpy.ndarray
+        :param t: time to expiration in years
+        :type t: float or numpy.ndarray
+        :param r: risk-free interest rate
+        :type r: float or numpy.ndarray
+        :param b: see above
+        :type b: float or numpy.ndarray
+        :param flag: 'c' or 'p' for call or put.
+        :type flag: str or numpy.ndarray
+        :param pricing_function: any function returning the prices of an array of options
+        :type pricing_function: python function object
+        :param greeks: names of the greeks to calculate, a subset of GREEKS
+        :type greeks: sequence of str
+
+        :returns: dict mapping each requested greek to an array of the broadcast shape
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> f = lambda flag, S, K, t, r, sigma, b: black_scholes(flag, S, K, t, r, sigma)
+    >>> K = numpy.array([45., 50., 55.])
+    >>> batched = all_greeks('c', 49., K, .3846, .05, .2, .05, f)
+    >>> abs(batched['gamma'][1] - gamma('c', 49., 50., .3846, .05, .2, .05, f)) < 1e-9
+    True
+    >>> sorted(all_greeks('c', 49., K, .3846, .05, .2, .05, f, greeks=['vega', 'rho']))
+    ['rho', 'vega']
+    """
+
+    unknown = set(greeks) - set(GREEKS)
+    if unknown:
+        raise KeyError(sorted(unknown)[0])
+
+    flag, S, K, t, r, sigma, b = numpy.broadcast_arrays(
+        numpy.asarray(flag), *[numpy.asarray(a, dtype=float) for a in (S, K, t, r, sigma, b)])
+    shape = S.shape
+
+    t_minus_one_day = numpy.where(t <= 1. / 365., 0.00001, t - 1. / 365.)
+    bumps = {
+        'center': (S, t, r, sigma),
+        'S+dS': (S + dS, t, r, sigma),
+        'S-dS': (S - dS, t, r, sigma),
+        't-1d': (S, t_minus_one_day, r, sigma),
+        'sigma+1%': (S, t, r, sigma + 0.01),
+        'sigma-1%': (S, t, r, sigma - 0.01),
+        'r+1%': (S, t, r + 0.01, sigma),
+        'r-1%': (S, t, r - 0.01, sigma),
+    }
+    scenarios = sorted(set(s for g in greeks for s in _SCENARIOS_OF_GREEK[g]))
+    m = len(scenarios)
+
+    # Stack the scenarios and price them all at once.
+    stacked = [numpy.concatenate([bumps[s][i].ravel() for s in scenarios]) for i in range(4)]
+    S_, t_, r_, sigma_ = stacked
+    prices = pricing_function(
+        numpy.tile(flag.ravel(), m), S_, numpy.tile(K.ravel(), m), t_, r_, sigma_, numpy.tile(b.ravel(), m))
+    prices = numpy.asarray(prices, dtype=float).reshape((m,) + shape)
+    price = dict(zip(scenarios, prices))
+
+    result = {}
+    expired = t == 0.0
+    if 'delta' in greeks:
+        value = (price['S+dS'] - price['S-dS']) / (2 * dS)
+        call_delta = numpy.where(S == K, 0.5, numpy.where(S > K, 1.0, 0.0))
+        expired_delta = numpy.where(vectorized_binary_flag(flag) > 0, call_delta, call_delta - 1.0)
+        result['delta'] = numpy.where(expired, expired_delta, value)
+    if 'gamma' in greeks:
+        value = (price['S+dS'] - 2. * price['center'] + price['S-dS']) / dS ** 2.
+        result['gamma'] = numpy.where(expired, numpy.where(S == K, numpy.inf, 0.0), value)
+    if 'theta' in greeks:
+        result['theta'] = price['t-1d'] - price['center']
+    if 'vega' in greeks:
+        result['vega'] = (price['sigma+1%'] - price['sigma-1%']) / 2.
+    if 'rho' in greeks:
+        result['rho'] = (price['r+1%'] - price['r-1%']) / (2)
+    return dict((greek, value[()]) for greek, value in result.items())
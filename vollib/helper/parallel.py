@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.parallel
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Chunked, parallel evaluation of the vectorized pricing, implied
+      volatility and greek functions.  The inputs are split into chunks that
+      fit the processor caches, and the chunks are evaluated on a pool of
+      threads (ChunkedExecutor) or of processes (ProcessExecutor).  Every
+      function of vollib works element by element, so the results are
+      bit-identical to evaluating the whole batch at once.
+
+      numpy releases the GIL inside its ufunc loops, so threads run
+      concurrently for most of the work of the pricing and greek functions.
+      The vectorized implied volatilities are not among them: their default
+      solver is a Python loop over the compiled LetsBeRational, which holds
+      the GIL, so they do not get faster with more threads.  Implied
+      volatilities are spread over processes instead.  For very large
+      batches, such as historical backfills, processes also avoid the
+      remaining contention of the pricing functions; the
+      inputs and outputs then live in a shared memory buffer that the
+      workers inherit when the pool starts, and only the function and the
+      offsets of the chunks in the buffer are sent to the workers.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+import ctypes
+import multiprocessing
+import threading
+from multiprocessing.pool import ThreadPool
+from multiprocessing.sharedctypes import RawArray
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.arguments import flat_arguments
+from vollib.helper.arguments import leaves
+from vollib.helper.arguments import like
+
+# -----------------------------------------------------------------------------
+# DATA
+
+# 32768 doubles are 256kB per array, which keeps the temporaries of a chunk
+# in the L2/L3 caches.
+DEFAULT_CHUNK_SIZE = 32768
+
+# Alignment in bytes of the arrays in the shared buffer of a ProcessExecutor
+ALIGNMENT = 64
+
+# The state of a ProcessExecutor worker, set up when the worker starts.
+_worker = {}
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _chunk(args, is_array, start, chunk_size):
+    return [a[start:start + chunk_size] if chunked else a for a, chunked in zip(args, is_array)]
+
+
+def _shared_view(buffer, offset, dtype, size):
+
+    """Return the numpy array of the given dtype and size at a byte offset
+    of a shared buffer."""
+
+    return numpy.frombuffer(buffer, dtype=dtype, count=size, offset=offset)
+
+
+def _initialize_worker(buffer):
+
+    """Attach a ProcessExecutor worker to the shared buffer of its pool."""
+
+    _worker['buffer'] = buffer
+
+
+def _evaluate_chunk(task):
+
+    """Evaluate one chunk in a ProcessExecutor worker, writing the results
+    straight into the shared outputs.
+
+    The arrays of the inputs and outputs are given by their offset, dtype
+    and size in the shared buffer, the scalar inputs by their value."""
+
+    function, inputs, outputs, start, chunk_size = task
+    buffer = _worker['buffer']
+    is_array = [chunked for chunked, value in inputs]
+    args = [_shared_view(buffer, *value) if chunked else value for chunked, value in inputs]
+    results = leaves(function(*_chunk(args, is_array, start, chunk_size)))
+    for spec, leaf in zip(outputs, results):
+        _shared_view(buffer, *spec)[start:start + len(leaf)] = leaf
+    return start
+
+
+def _concatenate(results, shape):
+
+    """Join the results of the chunks, which are arrays, or tuples or
+    dicts of arrays, and give them the broadcast shape of the inputs."""
+
+    first = results[0]
+    if isinstance(first, tuple):
+        return tuple(_concatenate([r[i] for r in results], shape) for i in range(len(first)))
+    if isinstance(first, dict):
+        return dict((k, _concatenate([r[k] for r in results], shape)) for k in first)
+    return numpy.concatenate([numpy.atleast_1d(r) for r in results]).reshape(shape)
+
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class ChunkedExecutor(object):
+
+    """Evaluate vectorized functions on chunks of their inputs in a pool
+    of threads.
+
+    Only the numpy work of a function runs concurrently.  The vectorized
+    implied volatilities hold the GIL in the compiled LetsBeRational and
+    do not scale with threads; use ProcessExecutor for them.
+
+    :param workers: number of threads, by default the number of processors
+    :type workers: int
+    :param chunk_size: number of elements per chunk
+    :type chunk_size: int
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> K = numpy.linspace(50., 150., 1001)
+    >>> with ChunkedExecutor(workers=2, chunk_size=100) as executor:
+    ...     prices = executor.map(black_scholes, 'c', 100., K, .5, .01, .2)
+    >>> bool(numpy.all(prices == black_scholes('c', 100., K, .5, .01, .2)))
+    True
+
+    Functions returning tuples or dicts of arrays, such as the vectorized
+    implied volatilities and all_greeks, are joined element-wise.
+
+    >>> from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+    >>> with ChunkedExecutor(workers=2, chunk_size=100) as executor:
+    ...     sigma, status = executor.map(vectorized_implied_volatility, prices, 100., K, .5, .01, 'c')
+    >>> sigma.shape, int(status.max())
+    ((1001,), 0)
+    """
+
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self._pool = None
+        # Guards the pool, which threads calling map concurrently share
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+
+        """Stop the threads of the pool."""
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def map(self, function, *args):
+
+        """Return function(*args), evaluated on chunks of the broadcast
+        arguments in parallel.
+
+        :param function: a vectorized vollib function
+        :type function: function
+        :param args: the arguments of function, scalars or arrays
+
+        :returns: numpy.ndarray, or tuple or dict of numpy.ndarray, with the broadcast shape of args
+        """
+
+        # Scalars are passed on as they are, arrays are split into chunks
+        args, is_array, shape = flat_arguments(args)
+        size = int(numpy.prod(shape))
+
+        if size <= self.chunk_size:
+            return _concatenate([function(*args)], shape)
+
+        def evaluate(start):
+            return function(*_chunk(args, is_array, start, self.chunk_size))
+
+        starts = range(0, size, self.chunk_size)
+        if self.workers == 1:
+            results = [evaluate(start) for start in starts]
+        else:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPool(self.workers)
+                pool = self._pool
+            results = pool.map(evaluate, starts)
+        return _concatenate(results, shape)
+
+
+class ProcessExecutor(object):
+
+    """Evaluate vectorized functions on chunks of their inputs in a pool
+    of processes, with the inputs and outputs in shared memory.
+
+    The chunks are handed out one at a time as workers become free, so
+    chunks that are slow to solve, e.g. of deep out-of-the-money quotes,
+    do not hold up the others.  function must be defined at module level.
+
+    The pool is started by the first call of map and reused by the later
+    ones, together with its shared buffer; it is only restarted when a
+    call needs a larger buffer.  Close the executor, or use it as a context
+    manager, to stop the processes.  The calls of map are serialized.
+
+    :param processes: number of processes, by default the number of processors
+    :type processes: int
+    :param chunk_size: number of elements per chunk
+    :type chunk_size: int
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+    >>> K = numpy.linspace(50., 150., 1001)
+    >>> with ProcessExecutor(processes=2, chunk_size=100) as executor:
+    ...     prices = executor.map(black_scholes, 'c', 100., K, .5, .01, .2)
+    ...     sigma, status = executor.map(vectorized_implied_volatility, prices, 100., K, .5, .01, 'c')
+    >>> expected, expected_status = vectorized_implied_volatility(prices, 100., K, .5, .01, 'c')
+    >>> bool(numpy.array_equal(sigma, expected)), bool(numpy.array_equal(status, expected_status))
+    (True, True)
+    """
+
+    def __init__(self, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._buffer = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+
+        """Stop the processes of the pool."""
+
+        with self._lock:
+            self._close()
+
+    def _close(self):
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._buffer = None
+
+    def _reserve(self, nbytes):
+
+        """Start the pool with a shared buffer of at least nbytes, unless
+        the running pool has one."""
+
+        if self._buffer is not None:
+            if len(self._buffer) >= nbytes:
+                return
+            # Grow geometrically, so that growing batches restart the pool rarely
+            nbytes = max(nbytes, 2 * len(self._buffer))
+        self._close()
+        self._buffer = RawArray(ctypes.c_byte, max(nbytes, 1))
+        self._pool = multiprocessing.Pool(self.processes, _initialize_worker, (self._buffer,))
+
+    def map(self, function, *args):
+
+        """Return function(*args), evaluated on chunks of the broadcast
+        arguments in parallel.
+
+        :param function: a vectorized vollib function
+        :type function: function
+        :param args: the arguments of function, scalars or arrays
+
+        :returns: numpy.ndarray, or tuple or dict of numpy.ndarray, with the broadcast shape of args
+        """
+
+        args, is_array, shape = flat_arguments(args)
+        size = int(numpy.prod(shape))
+
+        # The first chunk is evaluated here, and tells the structure and
+        # dtypes of the outputs to allocate.
+        template = function(*_chunk(args, is_array, 0, self.chunk_size))
+        if size <= self.chunk_size:
+            return _concatenate([template], shape)
+
+        # Lay out the array inputs and the outputs in the shared buffer
+        template_leaves = leaves(template)
+        specs, nbytes = [], 0
+        for dtype in [a.dtype for a, chunked in zip(args, is_array) if chunked] + \
+                     [leaf.dtype for leaf in template_leaves]:
+            specs.append((nbytes, dtype, size))
+            nbytes += -(-dtype.itemsize * size // ALIGNMENT) * ALIGNMENT
+
+        with self._lock:
+            self._reserve(nbytes)
+            specs = iter(specs)
+            inputs = []
+            for a, chunked in zip(args, is_array):
+                if chunked:
+                    spec = next(specs)
+                    _shared_view(self._buffer, *spec)[:] = a
+                    inputs.append((True, spec))
+                else:
+                    inputs.append((False, a))
+            outputs = list(specs)
+            for spec, leaf in zip(outputs, template_leaves):
+                _shared_view(self._buffer, *spec)[:len(leaf)] = leaf
+
+            tasks = [(function, inputs, outputs, start, self.chunk_size)
+                     for start in range(self.chunk_size, size, self.chunk_size)]
+            for start in self._pool.imap_unordered(_evaluate_chunk, tasks):
+                pass
+            # Copy the results out of the buffer, which the next call reuses.
+            results = [_shared_view(self._buffer, *spec).reshape(shape).copy() for spec in outputs]
+
+        return like(template, results)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
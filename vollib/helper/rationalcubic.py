@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.rationalcubic
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      A numpy port of rationalcubic.cpp from LetsBeRational, based on
+      R. Delbourgo and J. A. Gregory, "Shape preserving piecewise rational
+      interpolation", SIAM J. Sci. Stat. Comput. 6 (1985), 967-976.
+      The branches of the original are replaced by numpy.where, so every
+      function below accepts scalars or arrays which are broadcast against
+      each other.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper.normaldistribution import DBL_EPSILON
+from vollib.helper.normaldistribution import DBL_MAX
+
+# -----------------------------------------------------------------------------
+# DATA
+
+DBL_MIN = numpy.finfo(float).tiny
+
+MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE = -(1 - numpy.sqrt(DBL_EPSILON))
+MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE = 2 / (DBL_EPSILON * DBL_EPSILON)
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _is_zero(x):
+    return numpy.abs(x) < DBL_MIN
+
+
+def _max(a, b):
+
+    """Elementwise std::max, which unlike numpy.maximum does not
+    propagate a nan in its second argument."""
+
+    return numpy.where(a < b, b, a)
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def rational_cubic_interpolation(x, x_l, x_r, y_l, y_r, d_l, d_r, r):
+
+    """Evaluate the rational cubic interpolant through (x_l, y_l) and
+    (x_r, y_r) with slopes d_l and d_r and control parameter r.
+
+    >>> float(rational_cubic_interpolation(0.5, 0., 1., 0., 1., 1., 1., 3.))
+    0.5
+    """
+
+    with numpy.errstate(all='ignore'):
+        h = x_r - x_l
+        t = (x - x_l) / h
+        omt = 1 - t
+        t2 = t * t
+        omt2 = omt * omt
+        # Formula (2.4) divided by formula (2.5)
+        cubic = (y_r * t2 * t + (r * y_r - h * d_r) * t2 * omt + (r * y_l + h * d_l) * t * omt2 +
+                 y_l * omt2 * omt) / (1 + (r - 3) * t * omt)
+        # Linear interpolation without over-or underflow.
+        linear = y_r * t + y_l * (1 - t)
+        return numpy.where(numpy.abs(h) <= 0, 0.5 * (y_l + y_r),
+                           numpy.where(r >= MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE,
+                                       linear, cubic))
+
+
+def rational_cubic_control_parameter_to_fit_second_derivative_at_left_side(
+    x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_l):
+
+    """Return the control parameter that matches second_derivative_l at x_l."""
+
+    with numpy.errstate(all='ignore'):
+        h = x_r - x_l
+        numerator = 0.5 * h * second_derivative_l + (d_r - d_l)
+        denominator = (y_r - y_l) / h - d_l
+        return numpy.where(_is_zero(numerator), 0.,
+               numpy.where(_is_zero(denominator),
+                           numpy.where(numerator > 0,
+                                       MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE,
+                                       MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE),
+                           numerator / denominator))
+
+
+def rational_cubic_control_parameter_to_fit_second_derivative_at_right_side(
+    x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_r):
+
+    """Return the control parameter that matches second_derivative_r at x_r."""
+
+    with numpy.errstate(all='ignore'):
+        h = x_r - x_l
+        numerator = 0.5 * h * second_derivative_r + (d_r - d_l)
+        denominator = d_r - (y_r - y_l) / h
+        return numpy.where(_is_zero(numerator), 0.,
+               numpy.where(_is_zero(denominator),
+                           numpy.where(numerator > 0,
+                                       MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE,
+                                       MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE),
+                           numerator / denominator))
+
+
+def minimum_rational_cubic_control_parameter(d_l, d_r, s, prefer_shape_preservation_over_smoothness):
+
+    """Return the smallest control parameter that preserves monotonicity
+    and convexity of the data with slopes d_l, d_r and secant slope s."""
+
+    with numpy.errstate(all='ignore'):
+        monotonic = (d_l * s >= 0) & (d_r * s >= 0)
+        convex = (d_l <= s) & (s <= d_r)
+        concave = (d_l >= s) & (s >= d_r)
+        d_r_m_d_l = d_r - d_l
+        d_r_m_s = d_r - s
+        s_m_d_l = s - d_l
+        fallback = MAXIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE \
+            if prefer_shape_preservation_over_smoothness else -DBL_MAX
+        # If monotonicity on this interval is possible, set r1 to satisfy the monotonicity condition (3.8).
+        r1 = numpy.where(monotonic, numpy.where(_is_zero(s), fallback, (d_r + d_l) / s), -DBL_MAX)
+        # (3.18), avoiding division by zero.
+        r2 = numpy.where(_is_zero(s_m_d_l) | _is_zero(d_r_m_s), fallback,
+                         _max(numpy.abs(d_r_m_d_l / d_r_m_s), numpy.abs(d_r_m_d_l / s_m_d_l)))
+        r2 = numpy.where(convex | concave, r2, numpy.where(monotonic, fallback, -DBL_MAX))
+        return numpy.where(monotonic | convex | concave,
+                           _max(MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE, _max(r1, r2)),
+                           MINIMUM_RATIONAL_CUBIC_CONTROL_PARAMETER_VALUE)
+
+
+def convex_rational_cubic_control_parameter_to_fit_second_derivative_at_left_side(
+    x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_l, prefer_shape_preservation_over_smoothness):
+
+    """Return the control parameter that matches second_derivative_l at x_l
+    as closely as the shape of the data allows."""
+
+    r = rational_cubic_control_parameter_to_fit_second_derivative_at_left_side(
+        x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_l)
+    with numpy.errstate(all='ignore'):
+        r_min = minimum_rational_cubic_control_parameter(
+            d_l, d_r, (y_r - y_l) / (x_r - x_l), prefer_shape_preservation_over_smoothness)
+    return _max(r, r_min)
+
+
+def convex_rational_cubic_control_parameter_to_fit_second_derivative_at_right_side(
+    x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_r, prefer_shape_preservation_over_smoothness):
+
+    """Return the control parameter that matches second_derivative_r at x_r
+    as closely as the shape of the data allows."""
+
+    r = rational_cubic_control_parameter_to_fit_second_derivative_at_right_side(
+        x_l, x_r, y_l, y_r, d_l, d_r, second_derivative_r)
+    with numpy.errstate(all='ignore'):
+        r_min = minimum_rational_cubic_control_parameter(
+            d_l, d_r, (y_r - y_l) / (x_r - x_l), prefer_shape_preservation_over_smoothness)
+    return _max(r, r_min)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,941 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.helper.vectorized_lets_be_rational
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      A numpy port of LetsBeRational.cpp.  The functions mirror their scalar
+      counterparts in the lets_be_rational package, but take arrays
+      (broadcast against each other) and evaluate each of the four regions
+      of the normalised Black function on a masked sub-array, so that whole
+      option chains are priced without a Python loop.
+
+      The implied volatility solver follows the same pattern: the initial
+      guess is built per branch of the rational guess on masked sub-arrays,
+      and the Householder iteration is run on all quotes at once, with each
+      quote dropping out of the active set as soon as it has converged.
+
+      On large batches the pricing functions run about twice as fast as a
+      Python loop over the compiled lets_be_rational, but the implied
+      volatility solver does not: its many masked passes make it slower
+      than the loop, which is therefore the default solver of
+      vollib.black.implied_volatility.  The solver is only needed where the
+      compiled one cannot serve: tolerances, iteration counts, and initial
+      guesses from a table or from a previous quote.
+
+      The flag q is the numeric +1/-1 used by LetsBeRational; see
+      vollib.helper.vectorized_binary_flag.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import ONE_OVER_SQRT_TWO_PI
+from vollib.helper.erf_cody import erfcx_cody
+from vollib.helper.normaldistribution import norm_cdf
+from vollib.helper.normaldistribution import norm_pdf
+from vollib.helper.normaldistribution import inverse_norm_cdf
+from vollib.helper.normaldistribution import ONE_OVER_SQRT_TWO
+from vollib.helper.normaldistribution import SQRT_TWO_PI
+from vollib.helper.normaldistribution import DBL_EPSILON
+from vollib.helper.normaldistribution import DBL_MAX
+from vollib.helper.rationalcubic import DBL_MIN
+from vollib.helper.rationalcubic import rational_cubic_interpolation
+from vollib.helper.rationalcubic import convex_rational_cubic_control_parameter_to_fit_second_derivative_at_left_side
+from vollib.helper.rationalcubic import convex_rational_cubic_control_parameter_to_fit_second_derivative_at_right_side
+
+# -----------------------------------------------------------------------------
+# DATA
+
+SQRT_DBL_EPSILON = numpy.sqrt(DBL_EPSILON)
+FOURTH_ROOT_DBL_EPSILON = numpy.sqrt(SQRT_DBL_EPSILON)
+EIGHTH_ROOT_DBL_EPSILON = numpy.sqrt(FOURTH_ROOT_DBL_EPSILON)
+SIXTEENTH_ROOT_DBL_EPSILON = numpy.sqrt(EIGHTH_ROOT_DBL_EPSILON)
+SQRT_DBL_MIN = numpy.sqrt(DBL_MIN)
+SQRT_DBL_MAX = numpy.sqrt(DBL_MAX)
+
+TWO_PI = 6.283185307179586476925286766559005768394338798750
+SQRT_PI_OVER_TWO = 1.253314137315500251207882642405522626503493370305
+SQRT_THREE = 1.732050807568877293527446341505872366942805253810
+SQRT_ONE_OVER_THREE = 0.577350269189625764509148780501957455647601751270
+TWO_PI_OVER_SQRT_TWENTY_SEVEN = 1.209199576156145233729385505094770488189377498728
+PI_OVER_SIX = 0.523598775598298873077107230546583814032861566563
+
+VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC = -DBL_MAX
+VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM = DBL_MAX
+
+# The default of LetsBeRational; two Householder(3) steps reach machine accuracy.
+IMPLIED_VOLATILITY_MAXIMUM_ITERATIONS = 2
+
+# Objective functions of the Householder iteration, one per segment of the rational guess
+LOWER_SEGMENT = 0
+MIDDLE_SEGMENTS = 1
+UPPER_SEGMENT = 2
+
+# η, the threshold below which the asymptotic expansion is used
+ASYMPTOTIC_EXPANSION_ACCURACY_THRESHOLD = -10.
+# τ, the threshold below which the small-t expansion is used
+SMALL_T_EXPANSION_OF_NORMALISED_BLACK_THRESHOLD = 2 * SIXTEENTH_ROOT_DBL_EPSILON
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _as_float_arrays(*args):
+
+    """Broadcast the arguments against each other and return them as
+    flat float arrays, together with the broadcast shape."""
+
+    arrays = numpy.broadcast_arrays(*[numpy.asarray(a, dtype=float) for a in args])
+    shape = arrays[0].shape
+    return [a.ravel() for a in arrays] + [shape]
+
+
+def asymptotic_expansion_of_normalised_black_call(h, t):
+
+    """Asymptotic expansion of the normalised Black call for large
+    negative h = x/s, with t = s/2.  See LetsBeRational.cpp.
+    """
+
+    e = (t / h) * (t / h)
+    r = (h + t) * (h - t)
+    q = (h / r) * (h / r)
+    # 17th order asymptotic expansion of A(h,t) in q, sufficient for Φ(h) [and thus y(h)]
+    # to have relative accuracy of 1.64E-16 for h <= η  with  η:=-10.
+    asymptotic_expansion_sum = (
+        (2.0+q*(-6.0E0-2.0*e+3.0*q*(1.0E1+e*(2.0E1+2.0*e)+5.0*q*(-1.4E1+e*(-7.0E1+e*(-4.2E1-2.0*
+        e))+7.0*q*(1.8E1+e*(1.68E2+e*(2.52E2+e*(7.2E1+2.0*e)))+9.0*q*(-2.2E1+e*(-3.3E2+e*
+        (-9.24E2+e*(-6.6E2+e*(-1.1E2-2.0*e))))+1.1E1*q*(2.6E1+e*(5.72E2+e*(2.574E3+e*(3.432E3+e*
+        (1.43E3+e*(1.56E2+2.0*e)))))+1.3E1*q*(-3.0E1+e*(-9.1E2+e*(-6.006E3+e*(-1.287E4+e*
+        (-1.001E4+e*(-2.73E3+e*(-2.1E2-2.0*e))))))+1.5E1*q*(3.4E1+e*(1.36E3+e*(1.2376E4+e*
+        (3.8896E4+e*(4.862E4+e*(2.4752E4+e*(4.76E3+e*(2.72E2+2.0*e)))))))+1.7E1*q*(-3.8E1+e*
+        (-1.938E3+e*(-2.3256E4+e*(-1.00776E5+e*(-1.84756E5+e*(-1.51164E5+e*(-5.4264E4+e*
+        (-7.752E3+e*(-3.42E2-2.0*e))))))))+1.9E1*q*(4.2E1+e*(2.66E3+e*(4.0698E4+e*(2.3256E5+e*
+        (5.8786E5+e*(7.05432E5+e*(4.0698E5+e*(1.08528E5+e*(1.197E4+e*(4.2E2+2.0*e)))))))))+
+        2.1E1*q*(-4.6E1+e*(-3.542E3+e*(-6.7298E4+e*(-4.90314E5+e*(-1.63438E6+e*(-2.704156E6+e*
+        (-2.288132E6+e*(-9.80628E5+e*(-2.01894E5+e*(-1.771E4+e*(-5.06E2-2.0*e))))))))))+2.3E1*q*
+        (5.0E1+e*(4.6E3+e*(1.0626E5+e*(9.614E5+e*(4.08595E6+e*(8.9148E6+e*(1.04006E7+e*
+        (6.53752E6+e*(2.16315E6+e*(3.542E5+e*(2.53E4+e*(6.0E2+2.0*e)))))))))))+2.5E1*q*(-5.4E1+
+        e*(-5.85E3+e*(-1.6146E5+e*(-1.77606E6+e*(-9.37365E6+e*(-2.607579E7+e*(-4.01166E7+e*
+        (-3.476772E7+e*(-1.687257E7+e*(-4.44015E6+e*(-5.9202E5+e*(-3.51E4+e*(-7.02E2-2.0*
+        e))))))))))))+2.7E1*q*(5.8E1+e*(7.308E3+e*(2.3751E5+e*(3.12156E6+e*(2.003001E7+e*
+        (6.919458E7+e*(1.3572783E8+e*(1.5511752E8+e*(1.0379187E8+e*(4.006002E7+e*(8.58429E6+e*
+        (9.5004E5+e*(4.7502E4+e*(8.12E2+2.0*e)))))))))))))+2.9E1*q*(-6.2E1+e*(-8.99E3+e*
+        (-3.39822E5+e*(-5.25915E6+e*(-4.032015E7+e*(-1.6934463E8+e*(-4.1250615E8+e*
+        (-6.0108039E8+e*(-5.3036505E8+e*(-2.8224105E8+e*(-8.870433E7+e*(-1.577745E7+e*
+        (-1.472562E6+e*(-6.293E4+e*(-9.3E2-2.0*e))))))))))))))+3.1E1*q*(6.6E1+e*(1.0912E4+e*
+        (4.74672E5+e*(8.544096E6+e*(7.71342E7+e*(3.8707344E8+e*(1.14633288E9+e*(2.07431664E9+e*
+        (2.33360622E9+e*(1.6376184E9+e*(7.0963464E8+e*(1.8512208E8+e*(2.7768312E7+e*(2.215136E6+
+        e*(8.184E4+e*(1.056E3+2.0*e)))))))))))))))+3.3E1*(-7.0E1+e*(-1.309E4+e*(-6.49264E5+e*
+        (-1.344904E7+e*(-1.4121492E8+e*(-8.344518E8+e*(-2.9526756E9+e*(-6.49588632E9+e*
+        (-9.0751353E9+e*(-8.1198579E9+e*(-4.6399188E9+e*(-1.6689036E9+e*(-3.67158792E8+e*
+        (-4.707164E7+e*(-3.24632E6+e*(-1.0472E5+e*(-1.19E3-2.0*e)))))))))))))))))*
+        q)))))))))))))))))
+    )
+    b = ONE_OVER_SQRT_TWO_PI * numpy.exp(-0.5 * (h * h + t * t)) * (t / r) * asymptotic_expansion_sum
+    return numpy.abs(numpy.maximum(b, 0.))
+
+
+def small_t_expansion_of_normalised_black_call(h, t):
+
+    """Expansion of the normalised Black call for small t = s/2, with
+    h = x/s <= 0.  See LetsBeRational.cpp.
+    """
+
+    # Y(h) := Φ(h)/φ(h) = √(π/2)·erfcx(-h/√2)
+    # a := 1+h·Y(h)
+    a = 1 + h * (0.5 * SQRT_TWO_PI) * erfcx_cody(-ONE_OVER_SQRT_TWO * h)
+    w = t * t
+    h2 = h * h
+    expansion = (
+        2*t*(a+w*((-1+3*a+a*h2)/6+w*((-7+15*a+h2*(-1+10*a+a*h2))/120+w*((-57+105*a+h2*(-18+105*
+        a+h2*(-1+21*a+a*h2)))/5040+w*((-561+945*a+h2*(-285+1260*a+h2*(-33+378*a+h2*(-1+36*a+a*
+        h2))))/362880+w*((-6555+10395*a+h2*(-4680+17325*a+h2*(-840+6930*a+h2*(-52+990*a+h2*(-1+
+        55*a+a*h2)))))/39916800+((-89055+135135*a+h2*(-82845+270270*a+h2*(-20370+135135*a+h2*
+        (-1926+25740*a+h2*(-75+2145*a+h2*(-1+78*a+a*h2))))))*w)/6227020800.0))))))
+    )
+    b = ONE_OVER_SQRT_TWO_PI * numpy.exp(-0.5 * (h * h + t * t)) * expansion
+    return numpy.abs(numpy.maximum(b, 0.))
+
+
+def normalised_black_call_using_norm_cdf(x, s):
+
+    """b(x,s) = Φ(x/s+s/2)·exp(x/2) - Φ(x/s-s/2)·exp(-x/2)"""
+
+    h = x / s
+    t = 0.5 * s
+    b_max = numpy.exp(0.5 * x)
+    b = norm_cdf(h + t) * b_max - norm_cdf(h - t) / b_max
+    return numpy.abs(numpy.maximum(b, 0.))
+
+
+def normalised_black_call_using_erfcx(h, t):
+
+    """b = ½ · exp(-½(h²+t²)) · [ erfcx(-(h+t)/√2) - erfcx(-(h-t)/√2) ]"""
+
+    # Both terms go through erfcx_cody in a single call.
+    erfcx_plus, erfcx_minus = numpy.split(
+        erfcx_cody(numpy.concatenate((-ONE_OVER_SQRT_TWO * (h + t), -ONE_OVER_SQRT_TWO * (h - t)))), 2)
+    b = 0.5 * numpy.exp(-0.5 * (h * h + t * t)) * (erfcx_plus - erfcx_minus)
+    return numpy.abs(numpy.maximum(b, 0.))
+
+
+def compute_f_lower_map_and_first_two_derivatives(x, s):
+
+    """The lower map f(beta) of the rational guess and its first two
+    derivatives with respect to beta, evaluated at b(x,s)."""
+
+    ax = numpy.abs(x)
+    z = SQRT_ONE_OVER_THREE * ax / s
+    y = z * z
+    s2 = s * s
+    Phi = norm_cdf(-z)
+    phi = norm_pdf(z)
+    fpp = PI_OVER_SIX * y / (s2 * s) * Phi * (
+        8 * SQRT_THREE * s * ax + (3 * s2 * (s2 - 8) - 8 * x * x) * Phi / phi) * numpy.exp(2 * y + 0.25 * s2)
+    Phi2 = Phi * Phi
+    fp = TWO_PI * y * Phi2 * numpy.exp(y + 0.125 * s * s)
+    f = TWO_PI_OVER_SQRT_TWENTY_SEVEN * ax * (Phi2 * Phi)
+    return f, fp, fpp
+
+
+def inverse_f_lower_map(x, f):
+    return numpy.abs(x / (SQRT_THREE * inverse_norm_cdf(
+        numpy.power(f / (TWO_PI_OVER_SQRT_TWENTY_SEVEN * numpy.abs(x)), 1. / 3.))))
+
+
+def compute_f_upper_map_and_first_two_derivatives(x, s):
+
+    """The upper map f(beta) of the rational guess and its first two
+    derivatives with respect to beta, evaluated at b(x,s)."""
+
+    f = norm_cdf(-0.5 * s)
+    w = (x / s) * (x / s)
+    fp = -0.5 * numpy.exp(0.5 * w)
+    fpp = SQRT_PI_OVER_TWO * numpy.exp(w + 0.125 * s * s) * w / s
+    return f, fp, fpp
+
+
+def inverse_f_upper_map(f):
+    return -2. * inverse_norm_cdf(f)
+
+
+def householder_factor(newton, halley, hh3):
+    return (1 + 0.5 * halley * newton) / (1 + newton * (halley + hh3 * newton / 6))
+
+
+def householder_iteration(beta, x, s, s_left, s_right, objective, N, tolerance=None):
+
+    """Refine the initial guesses s of the normalised implied volatility of
+    the out-of-the-money calls beta(x) with up to N Householder(3) steps.
+
+    All quotes are stepped together; a quote leaves the active set once its
+    last step is below DBL_EPSILON relative to s, or below tolerance (an
+    absolute tolerance on s, per quote) if given, or once its bracket
+    [s_left, s_right] has collapsed.  objective selects, per quote, the
+    objective function of the segment the initial guess came from:
+
+        LOWER_SEGMENT     g(s) = 1/ln(b(s)) - 1/ln(beta)
+        MIDDLE_SEGMENTS   g(s) = b(s) - beta
+        UPPER_SEGMENT     g(s) = ln(b_max-beta) - ln(b_max-b(s))
+
+    Returns the refined s, the number of iterations used per quote and the
+    last step taken by each quote.
+    """
+
+    b_max = numpy.exp(0.5 * x)
+    ds = numpy.empty_like(s)
+    ds.fill(-DBL_MAX)
+    ds_previous = numpy.zeros_like(s)
+    direction_reversal_count = numpy.zeros(s.shape, dtype=int)
+    iterations = numpy.zeros(s.shape, dtype=int)
+    active = numpy.ones(s.shape, dtype=bool)
+
+    for iteration in range(N):
+        if tolerance is None:
+            active &= numpy.abs(ds) > DBL_EPSILON * s
+        else:
+            active &= numpy.abs(ds) > numpy.maximum(tolerance, DBL_EPSILON * s)
+        i = numpy.flatnonzero(active)
+        if not i.size:
+            break
+        si, dsi, sl, sr = s[i], ds[i], s_left[i], s_right[i]
+        xi, betai, b_maxi, obj = x[i], beta[i], b_max[i], objective[i]
+
+        count = direction_reversal_count[i] + (dsi * ds_previous[i] < 0)
+        stop = None
+        # If looping inefficently, or the forecast step takes us outside the bracket,
+        # or onto its edges, switch to binary nesting.
+        bisect = (count == 3) | ~((si > sl) & (si < sr))
+        if iteration > 0 and bisect.any():
+            si = numpy.where(bisect, 0.5 * (sl + sr), si)
+            stop = bisect & (sr - sl <= DBL_EPSILON * si)
+            count[bisect] = 0
+            dsi = numpy.where(bisect, 0., dsi)
+        ds_previous[i] = dsi
+
+        b = normalised_black_call(xi, si)
+        bp = normalised_vega(xi, si)
+        # Tighten the bracket if applicable.
+        sr = numpy.where((b > betai) & (si < sr), si, sr)
+        sl = numpy.where((b < betai) & (si > sl), si, sl)
+
+        h = xi / si
+        halley = h * h / si - si / 4
+        x_over_s2 = xi / (si * si)
+        hh3 = halley * halley - 3 * x_over_s2 * x_over_s2 - 0.25
+        bisection_step = 0.5 * (sl + sr) - si
+
+        newton = (betai - b) / bp
+        step = newton * householder_factor(newton, halley, hh3)
+
+        is_lower = obj == LOWER_SEGMENT
+        if is_lower.any():
+            k = numpy.flatnonzero(is_lower)
+            bk, bpk, hk, sk, halleyk = b[k], bp[k], h[k], si[k], halley[k]
+            ln_b = numpy.log(bk)
+            ln_beta = numpy.log(betai[k])
+            bpob = bpk / bk
+            newton = (ln_beta - ln_b) * ln_b / ln_beta / bpob
+            lower_halley = halleyk - bpob * (1 + 2 / ln_b)
+            lower_hh3 = halleyk * halleyk - 3 * (hk / sk) * (hk / sk) - 0.25 + \
+                2 * bpob * bpob * (1 + 3 / ln_b * (1 + 1 / ln_b)) - 3 * halleyk * bpob * (1 + 2 / ln_b)
+            lower_step = newton * householder_factor(newton, lower_halley, lower_hh3)
+            # Numerical underflow. Switch to binary nesting for this iteration.
+            step[k] = numpy.where((bk <= 0) | (bpk <= 0), bisection_step[k], lower_step)
+
+        is_upper = obj == UPPER_SEGMENT
+        if is_upper.any():
+            k = numpy.flatnonzero(is_upper)
+            bk, bpk, b_maxk, halleyk = b[k], bp[k], b_maxi[k], halley[k]
+            b_max_minus_b = b_maxk - bk
+            g = numpy.log((b_maxk - betai[k]) / b_max_minus_b)
+            gp = bpk / b_max_minus_b
+            newton = -g / gp
+            upper_step = newton * householder_factor(newton, halleyk + gp, hh3[k] + gp * (2 * gp + 3 * halleyk))
+            # Numerical underflow. Switch to binary nesting for this iteration.
+            step[k] = numpy.where((bk >= b_maxk) | (bpk <= DBL_MIN), bisection_step[k], upper_step)
+
+        dsi = numpy.where(-0.5 * si < step, step, -0.5 * si)
+        ds[i] = dsi
+        s_left[i] = sl
+        s_right[i] = sr
+        direction_reversal_count[i] = count
+        if stop is None:
+            s[i] = si + dsi
+            iterations[i] += 1
+        else:
+            # A collapsed bracket ends the iteration at its midpoint.
+            s[i] = numpy.where(stop, si, si + dsi)
+            iterations[i] += ~stop
+            active[i] = ~stop
+
+    return s, iterations, ds
+
+
+def unchecked_normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+        beta, x, q, N, tolerance=None):
+
+    """Return the normalised implied volatilities s of the flat arrays
+    beta, x and q, together with the number of iterations used per quote.
+
+    As in LetsBeRational, prices at or below zero give 0 and prices at or
+    above the maximum give VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM,
+    without any checks against the intrinsic value.  The iteration of a
+    quote stops early once its last step is below tolerance, an absolute
+    tolerance on s (see householder_iteration).
+    """
+
+    result = numpy.zeros_like(beta)
+    iterations = numpy.zeros(beta.shape, dtype=int)
+
+    # Subtract intrinsic.
+    itm = q * x > 0
+    beta = numpy.where(itm, numpy.abs(numpy.maximum(beta - normalised_intrinsic(x, q), 0.)), beta)
+    q = numpy.where(itm, -q, q)
+    # Map puts to calls
+    x = numpy.where(q < 0, -x, x)
+
+    b_max = numpy.exp(0.5 * x)
+    # For negative or zero prices we return 0.
+    solvable = ~(beta <= 0)
+    above = solvable & (beta >= b_max)
+    result[above] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+    solvable &= ~above
+    index = numpy.flatnonzero(solvable)
+    beta, x, b_max = beta[index], x[index], b_max[index]
+    if tolerance is not None:
+        tolerance = numpy.broadcast_to(tolerance, solvable.shape)[index]
+
+    s = numpy.empty_like(beta)
+    s_left = numpy.empty_like(beta)
+    s_left.fill(DBL_MIN)
+    s_right = numpy.empty_like(beta)
+    s_right.fill(DBL_MAX)
+    objective = numpy.empty(beta.shape, dtype=int)
+    objective.fill(MIDDLE_SEGMENTS)
+
+    s_c = numpy.sqrt(numpy.abs(2 * x))
+    b_c = normalised_black_call(x, s_c)
+    v_c = normalised_vega(x, s_c)
+
+    # Four branches.
+    i = numpy.flatnonzero(beta < b_c)
+    s_l = s_c[i] - b_c[i] / v_c[i]
+    b_l = normalised_black_call(x[i], s_l)
+    lowest = beta[i] < b_l
+
+    j, sj, bj = i[lowest], s_l[lowest], b_l[lowest]
+    f_l, fp_l, fpp_l = compute_f_lower_map_and_first_two_derivatives(x[j], sj)
+    r_ll = convex_rational_cubic_control_parameter_to_fit_second_derivative_at_right_side(
+        0., bj, 0., f_l, 1., fp_l, fpp_l, True)
+    f = rational_cubic_interpolation(beta[j], 0., bj, 0., f_l, 1., fp_l, r_ll)
+    # This can happen due to roundoff truncation for extreme values such as |x|>500.
+    # We switch to quadratic interpolation using f(0)≡0, f(b_l), and f'(0)≡1 to specify the quadratic.
+    t = beta[j] / bj
+    f = numpy.where(f > 0, f, (f_l * t + bj * (1 - t)) * t)
+    s[j] = inverse_f_lower_map(x[j], f)
+    s_right[j] = sj
+    objective[j] = LOWER_SEGMENT
+
+    j, sj, bj = i[~lowest], s_l[~lowest], b_l[~lowest]
+    v_l = normalised_vega(x[j], sj)
+    r_lm = convex_rational_cubic_control_parameter_to_fit_second_derivative_at_right_side(
+        bj, b_c[j], sj, s_c[j], 1 / v_l, 1 / v_c[j], 0.0, False)
+    s[j] = rational_cubic_interpolation(beta[j], bj, b_c[j], sj, s_c[j], 1 / v_l, 1 / v_c[j], r_lm)
+    s_left[j] = sj
+    s_right[j] = s_c[j]
+
+    i = numpy.flatnonzero(~(beta < b_c))
+    s_h = numpy.where(v_c[i] > DBL_MIN, s_c[i] + (b_max[i] - b_c[i]) / v_c[i], s_c[i])
+    b_h = normalised_black_call(x[i], s_h)
+    middle = beta[i] <= b_h
+
+    j, sj, bj = i[middle], s_h[middle], b_h[middle]
+    v_h = normalised_vega(x[j], sj)
+    r_hm = convex_rational_cubic_control_parameter_to_fit_second_derivative_at_left_side(
+        b_c[j], bj, s_c[j], sj, 1 / v_c[j], 1 / v_h, 0.0, False)
+    s[j] = rational_cubic_interpolation(beta[j], b_c[j], bj, s_c[j], sj, 1 / v_c[j], 1 / v_h, r_hm)
+    s_left[j] = s_c[j]
+    s_right[j] = sj
+
+    j, sj, bj = i[~middle], s_h[~middle], b_h[~middle]
+    f_h, fp_h, fpp_h = compute_f_upper_map_and_first_two_derivatives(x[j], sj)
+    r_hh = convex_rational_cubic_control_parameter_to_fit_second_derivative_at_left_side(
+        bj, b_max[j], f_h, 0., fp_h, -0.5, fpp_h, True)
+    f = numpy.where((fpp_h > -SQRT_DBL_MAX) & (fpp_h < SQRT_DBL_MAX),
+                    rational_cubic_interpolation(beta[j], bj, b_max[j], f_h, 0., fp_h, -0.5, r_hh),
+                    -DBL_MAX)
+    # We switch to quadratic interpolation using f(b_h), f(b_max)≡0, and f'(b_max)≡-1/2 to specify the quadratic.
+    h = b_max[j] - bj
+    t = (beta[j] - bj) / h
+    f = numpy.where(f <= 0, (f_h * (1 - t) + 0.5 * h * t) * (1 - t), f)
+    s[j] = inverse_f_upper_map(f)
+    s_left[j] = sj
+    # Else we better drop through and let the objective function be g(s) = b(x,s)-beta.
+    objective[j[beta[j] > 0.5 * b_max[j]]] = UPPER_SEGMENT
+
+    result[index], iterations[index], ds = householder_iteration(
+        beta, x, s, s_left, s_right, objective, N, tolerance)
+    return result, iterations
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def normalised_intrinsic(x, q):
+
+    """Return the normalised intrinsic value (F-K)/sqrt(F*K), floored at zero.
+
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+
+    >>> abs(normalised_intrinsic(0.5, 1.) - 2*numpy.sinh(0.25)) < 1e-15
+    True
+    >>> float(normalised_intrinsic(0.5, -1.))
+    0.0
+    """
+
+    x, q, shape = _as_float_arrays(x, q)
+    result = numpy.zeros_like(x)
+    itm = q * x > 0
+    if not itm.any():
+        return result.reshape(shape)[()]
+    x2 = x * x
+    is_small = x2 < 98 * FOURTH_ROOT_DBL_EPSILON
+    small = numpy.flatnonzero(itm & is_small)
+    xs, x2s = x[small], x2[small]
+    result[small] = numpy.abs(numpy.maximum(numpy.sign(q[small]) * xs * (1 + x2s * (
+        (1.0 / 24.0) + x2s * ((1.0 / 1920.0) + x2s * ((1.0 / 322560.0) + (1.0 / 92897280.0) * x2s)))), 0.0))
+    large = numpy.flatnonzero(itm & ~is_small)
+    b_max = numpy.exp(0.5 * x[large])
+    result[large] = numpy.abs(numpy.maximum(numpy.sign(q[large]) * (b_max - 1 / b_max), 0.))
+    return result.reshape(shape)[()]
+
+
+def normalised_black_call(x, s):
+
+    """Return the normalised Black call value.
+
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param s: volatility times the square root of time to expiration
+    :type s: float or numpy.ndarray
+
+    >>> import lets_be_rational
+    >>> x = numpy.array([-50., -3., -0.2, 0., 0.4, 2.])
+    >>> s = numpy.array([0.01, 0.05, 1.5, 0.3, 0.02, 4.])
+    >>> expected = numpy.array([lets_be_rational.normalised_black_call(*a) for a in zip(x, s)])
+    >>> bool(numpy.all(abs(normalised_black_call(x, s) - expected) <= 1e-14 * expected))
+    True
+    """
+
+    x, s, shape = _as_float_arrays(x, s)
+
+    # In-out parity: price the out-of-the-money option and add back the intrinsic value.
+    intrinsic = normalised_intrinsic(x, 1.)
+    x = -numpy.abs(x)
+    result = numpy.zeros_like(x)
+
+    eta = ASYMPTOTIC_EXPANSION_ACCURACY_THRESHOLD
+    tau = SMALL_T_EXPANSION_OF_NORMALISED_BLACK_THRESHOLD
+    # Each region is gathered with an index array, which numpy handles
+    # much faster than a boolean mask.
+    remaining = s > 0
+
+    # Region 1.
+    is_region = remaining & (x < s * eta) & (0.5 * s * s + x < s * (tau + eta))
+    if is_region.any():
+        region = numpy.flatnonzero(is_region)
+        xr, sr = x[region], s[region]
+        result[region] = asymptotic_expansion_of_normalised_black_call(xr / sr, 0.5 * sr)
+        remaining &= ~is_region
+
+    # Region 2.
+    is_region = remaining & (0.5 * s < tau)
+    region = numpy.flatnonzero(is_region)
+    xr, sr = x[region], s[region]
+    result[region] = small_t_expansion_of_normalised_black_call(xr / sr, 0.5 * sr)
+    remaining &= ~is_region
+
+    # Region 3.
+    is_region = remaining & (x + 0.5 * s * s > s * 0.85)
+    region = numpy.flatnonzero(is_region)
+    result[region] = normalised_black_call_using_norm_cdf(x[region], s[region])
+    remaining &= ~is_region
+
+    # Region 4.
+    region = numpy.flatnonzero(remaining)
+    xr, sr = x[region], s[region]
+    result[region] = normalised_black_call_using_erfcx(xr / sr, 0.5 * sr)
+
+    return (intrinsic + result).reshape(shape)[()]
+
+
+def normalised_vega(x, s):
+
+    """Return the derivative of the normalised Black value with respect to s.
+
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param s: volatility times the square root of time to expiration
+    :type s: float or numpy.ndarray
+
+    >>> import lets_be_rational
+    >>> abs(normalised_vega(-0.3, 0.25) - lets_be_rational.normalised_vega(-0.3, 0.25)) < 1e-16
+    True
+    """
+
+    x, s, shape = _as_float_arrays(x, s)
+    ax = numpy.abs(x)
+    result = numpy.zeros_like(x)
+    is_atm = ax <= 0
+    atm = numpy.flatnonzero(is_atm)
+    result[atm] = ONE_OVER_SQRT_TWO_PI * numpy.exp(-0.125 * s[atm] * s[atm])
+    regular = numpy.flatnonzero(~is_atm & (s > 0) & (s > ax * SQRT_DBL_MIN))
+    xr, sr = x[regular], s[regular]
+    result[regular] = ONE_OVER_SQRT_TWO_PI * numpy.exp(-0.5 * ((xr / sr) ** 2 + (0.5 * sr) ** 2))
+    return result.reshape(shape)[()]
+
+
+def normalised_black(x, s, q):
+
+    """Return the normalised Black value of a call (q=+1) or put (q=-1).
+
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param s: volatility times the square root of time to expiration
+    :type s: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+
+    >>> import lets_be_rational
+    >>> abs(normalised_black(0.1, 0.2, -1.) - lets_be_rational.normalised_black(0.1, 0.2, -1.)) < 1e-16
+    True
+    """
+
+    # Reciprocal-strike call-put equivalence
+    return normalised_black_call(numpy.where(numpy.asarray(q) < 0, -numpy.asarray(x), x), s)
+
+
+def black(F, K, sigma, T, q):
+
+    """Return the undiscounted Black price of a call (q=+1) or put (q=-1).
+
+    :param F: underlying futures price
+    :type F: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float or numpy.ndarray
+    :param T: time to expiration in years
+    :type T: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+
+    >>> import lets_be_rational
+    >>> K = numpy.array([80., 100., 120.])
+    >>> q = numpy.array([1., -1., 1.])
+    >>> prices = black(100., K, .2, .5, q)
+    >>> expected = [lets_be_rational.black(100., k, .2, .5, p) for k, p in zip(K, q)]
+    >>> bool(numpy.allclose(prices, expected, rtol=1e-14, atol=0))
+    True
+    """
+
+    F, K, sigma, T, q, shape = _as_float_arrays(F, K, sigma, T, q)
+    intrinsic = numpy.abs(numpy.maximum(numpy.where(q < 0, K - F, F - K), 0.0))
+    # Map in-the-money to out-of-the-money, whose intrinsic value is zero
+    itm = q * (F - K) > 0
+    q_otm = numpy.where(itm, -q, q)
+    otm_value = numpy.maximum(0.0, (numpy.sqrt(F) * numpy.sqrt(K)) *
+                              normalised_black(numpy.log(F / K), sigma * numpy.sqrt(T), q_otm))
+    result = numpy.where(itm, intrinsic + otm_value, otm_value)
+    return result.reshape(shape)[()]
+
+
+def implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(price, F, K, T, q, N):
+
+    """Return the implied volatility of undiscounted Black prices, with at
+    most N Householder(3) iterations per quote.
+
+    Prices below the intrinsic value give
+    VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC and prices at or
+    above the maximum (F for calls, K for puts) give
+    VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM, as in LetsBeRational.
+
+    :param price: undiscounted Black option price
+    :type price: float or numpy.ndarray
+    :param F: underlying futures price
+    :type F: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param T: time to expiration in years
+    :type T: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+    :param N: maximum number of iterations
+    :type N: int
+
+    >>> import lets_be_rational
+    >>> K = numpy.array([60., 95., 100., 105., 300.])
+    >>> q = numpy.array([1., -1., 1., 1., -1.])
+    >>> prices = black(100., K, .3, .75, q)
+    >>> expected = [lets_be_rational.implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+    ...     p, 100., k, .75, c, 1) for p, k, c in zip(prices, K, q)]
+    >>> sigma = implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(prices, 100., K, .75, q, 1)
+    >>> bool(numpy.allclose(sigma, expected, rtol=1e-14, atol=0))
+    True
+    """
+
+    sigma, iterations = implied_volatility_and_iterations(price, F, K, T, q, N)
+    return sigma
+
+
+def implied_volatility_from_a_transformed_rational_guess(price, F, K, T, q):
+
+    """Return the implied volatility of undiscounted Black prices.
+
+    :param price: undiscounted Black option price
+    :type price: float or numpy.ndarray
+    :param F: underlying futures price
+    :type F: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param T: time to expiration in years
+    :type T: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+
+    >>> import lets_be_rational
+    >>> price = lets_be_rational.black(100., 110., .25, .5, 1.)
+    >>> abs(implied_volatility_from_a_transformed_rational_guess(price, 100., 110., .5, 1.) - .25) < 1e-15
+    True
+    >>> sigma = implied_volatility_from_a_transformed_rational_guess(
+    ...     numpy.array([5., 120.]), 100., numpy.array([90., 110.]), .5, 1.)
+    >>> sigma[0] == VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+    True
+    >>> sigma[1] == VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+    True
+    """
+
+    return implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+        price, F, K, T, q, IMPLIED_VOLATILITY_MAXIMUM_ITERATIONS)
+
+
+def implied_volatility_and_iterations(price, F, K, T, q, N, tolerance=None):
+
+    """Return the implied volatility of undiscounted Black prices together
+    with the number of Householder(3) iterations spent on each quote.
+
+    See implied_volatility_from_a_transformed_rational_guess_with_limited_iterations.
+    If tolerance is given, the iteration of a quote stops as soon as its
+    last step is below tolerance, an absolute tolerance on the volatility;
+    the iteration converges with fourth order, so the error is then far
+    below tolerance.  Otherwise it stops at machine precision.
+
+    >>> sigma, iterations = implied_volatility_and_iterations(
+    ...     black(100., 100., .2, 1., 1.), 100., 100., 1., 1., 10)
+    >>> abs(sigma - .2) < 1e-15, int(iterations) <= 2
+    (True, True)
+    >>> K = numpy.array([90., 100., 120.])
+    >>> sigma, iterations = implied_volatility_and_iterations(
+    ...     black(100., K, .2, 1., 1.), 100., K, 1., 1., 10, 1e-3)
+    >>> bool(numpy.all(abs(sigma - .2) < 1e-3)), iterations.tolist()
+    (True, [1, 1, 1])
+    """
+
+    if tolerance is None:
+        price, F, K, T, q, shape = _as_float_arrays(price, F, K, T, q)
+    else:
+        price, F, K, T, q, tolerance, shape = _as_float_arrays(price, F, K, T, q, tolerance)
+    sigma = numpy.empty_like(price)
+    iterations = numpy.zeros(price.shape, dtype=int)
+
+    with numpy.errstate(all='ignore'):
+        intrinsic = numpy.abs(numpy.maximum(numpy.where(q < 0, K - F, F - K), 0.0))
+        below = price < intrinsic
+        above = ~below & (price >= numpy.where(q < 0, K, F))
+        sigma[below] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+        sigma[above] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+
+        i = numpy.flatnonzero(~(below | above))
+        price, F, K, T, q, intrinsic = price[i], F[i], K[i], T[i], q[i], intrinsic[i]
+        if tolerance is not None:
+            # A tolerance on sigma is one of sqrt(T) times it on s.
+            tolerance = tolerance[i] * numpy.sqrt(T)
+        x = numpy.log(F / K)
+        # Map in-the-money to out-of-the-money
+        itm = q * x > 0
+        price = numpy.where(itm, numpy.abs(numpy.maximum(price - intrinsic, 0.0)), price)
+        q = numpy.where(itm, -q, q)
+        s, iterations[i] = \
+            unchecked_normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+                price / (numpy.sqrt(F) * numpy.sqrt(K)), x, q, N, tolerance)
+        # As in LetsBeRational, a sentinel of the normalised solver is scaled
+        # by 1/sqrt(T) like any other result.
+        sigma[i] = s / numpy.sqrt(T)
+
+    return sigma.reshape(shape)[()], iterations.reshape(shape)[()]
+
+
+def implied_volatility_from_an_initial_guess_with_limited_iterations(price, F, K, T, q, sigma, N):
+
+    """Return the implied volatility of undiscounted Black prices, refined
+    from the initial guesses sigma with at most N Householder(3) iterations
+    on the objective b(s) - beta, e.g. starting from the implied volatility
+    of the previous quote of the same contract.
+
+    Unlike the transformed rational guess, an arbitrary initial guess does
+    not guarantee convergence, so the last step relative to the result is
+    returned as well: the iteration converges with fourth order, and a
+    small last step means that the result is accurate to well below it.
+    Sentinel values are as in
+    implied_volatility_from_a_transformed_rational_guess_with_limited_iterations,
+    with a last step of zero.
+
+    :param price: undiscounted Black option price
+    :type price: float or numpy.ndarray
+    :param F: underlying futures price
+    :type F: float or numpy.ndarray
+    :param K: strike price
+    :type K: float or numpy.ndarray
+    :param T: time to expiration in years
+    :type T: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+    :param sigma: positive initial guesses of the implied volatility
+    :type sigma: float or numpy.ndarray
+    :param N: maximum number of iterations
+    :type N: int
+
+    :returns: tuple of the implied volatilities, the number of iterations and the relative last steps
+
+    >>> K = numpy.array([80., 100., 130.])
+    >>> prices = black(100., K, .25, .5, 1.)
+    >>> sigma, iterations, step = implied_volatility_from_an_initial_guess_with_limited_iterations(
+    ...     prices, 100., K, .5, 1., .245, 2)
+    >>> bool(numpy.allclose(sigma, .25, rtol=1e-14, atol=0)), iterations.tolist()
+    (True, [2, 2, 2])
+    >>> bool(numpy.all(step < 1e-6))
+    True
+    """
+
+    price, F, K, T, q, sigma, shape = _as_float_arrays(price, F, K, T, q, sigma)
+    result = numpy.zeros_like(price)
+    iterations = numpy.zeros(price.shape, dtype=int)
+    relative_step = numpy.zeros_like(price)
+
+    with numpy.errstate(all='ignore'):
+        intrinsic = numpy.abs(numpy.maximum(numpy.where(q < 0, K - F, F - K), 0.0))
+        below = price < intrinsic
+        above = ~below & (price >= numpy.where(q < 0, K, F))
+        result[below] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+        result[above] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+
+        i = numpy.flatnonzero(~(below | above))
+        price, F, K, T, q, intrinsic = price[i], F[i], K[i], T[i], q[i], intrinsic[i]
+        x = numpy.log(F / K)
+        # Map in-the-money to out-of-the-money, and puts to calls
+        itm = q * x > 0
+        price = numpy.where(itm, numpy.abs(numpy.maximum(price - intrinsic, 0.0)), price)
+        x = numpy.where(numpy.where(itm, -q, q) < 0, -x, x)
+        beta = price / (numpy.sqrt(F) * numpy.sqrt(K))
+        # For zero prices we return 0.
+        j = numpy.flatnonzero(beta > 0)
+        i, beta, x, sqrt_T = i[j], beta[j], x[j], numpy.sqrt(T[j])
+
+        s_left = numpy.empty_like(beta)
+        s_left.fill(DBL_MIN)
+        s_right = numpy.empty_like(beta)
+        s_right.fill(DBL_MAX)
+        objective = numpy.empty(beta.shape, dtype=int)
+        objective.fill(MIDDLE_SEGMENTS)
+        s, iterations[i], ds = householder_iteration(
+            beta, x, sigma[i] * sqrt_T, s_left, s_right, objective, N)
+        result[i] = s / sqrt_T
+        relative_step[i] = numpy.abs(ds) / s
+
+    return result.reshape(shape)[()], iterations.reshape(shape)[()], relative_step.reshape(shape)[()]
+
+
+def normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(beta, x, q, N):
+
+    """Return the normalised implied volatility s = sigma*sqrt(T) of
+    normalised Black prices beta, with at most N iterations per quote.
+
+    :param beta: normalised Black price, price/sqrt(F*K)
+    :type beta: float or numpy.ndarray
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+    :param N: maximum number of iterations
+    :type N: int
+
+    >>> beta = normalised_black(numpy.array([-0.5, 0.0, 0.5]), 0.3, 1.)
+    >>> s = normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+    ...     beta, numpy.array([-0.5, 0.0, 0.5]), 1., 2)
+    >>> bool(numpy.allclose(s, 0.3, rtol=1e-14, atol=0))
+    True
+    """
+
+    s, iterations = normalised_implied_volatility_and_iterations(beta, x, q, N)
+    return s
+
+
+def normalised_implied_volatility_and_iterations(beta, x, q, N, tolerance=None):
+
+    """Return the normalised implied volatility s = sigma*sqrt(T) of
+    normalised Black prices beta together with the number of iterations
+    spent on each quote, stopping early once the last step is below
+    tolerance, an absolute tolerance on s, if given.
+
+    See normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations.
+
+    >>> x = numpy.array([-0.5, 0.0, 0.5])
+    >>> s, iterations = normalised_implied_volatility_and_iterations(
+    ...     normalised_black(x, 0.3, 1.), x, 1., 2, 1e-2)
+    >>> bool(numpy.all(abs(s - 0.3) < 1e-2)), iterations.tolist()
+    (True, [1, 1, 1])
+    """
+
+    if tolerance is None:
+        beta, x, q, shape = _as_float_arrays(beta, x, q)
+    else:
+        beta, x, q, tolerance, shape = _as_float_arrays(beta, x, q, tolerance)
+    with numpy.errstate(all='ignore'):
+        # Map in-the-money to out-of-the-money
+        itm = q * x > 0
+        beta = numpy.where(itm, beta - normalised_intrinsic(x, q), beta)
+        q = numpy.where(itm, -q, q)
+        s, iterations = \
+            unchecked_normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+                beta, x, q, N, tolerance)
+    s[beta < 0] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+    return s.reshape(shape)[()], iterations.reshape(shape)[()]
+
+
+def normalised_implied_volatility_from_a_transformed_rational_guess(beta, x, q):
+
+    """Return the normalised implied volatility s = sigma*sqrt(T) of
+    normalised Black prices beta.
+
+    :param beta: normalised Black price, price/sqrt(F*K)
+    :type beta: float or numpy.ndarray
+    :param x: ln(F/K) where K is the strike price, and F is the futures price
+    :type x: float or numpy.ndarray
+    :param q: +1 for calls, -1 for puts
+    :type q: float or numpy.ndarray
+    """
+
+    return normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+        beta, x, q, IMPLIED_VOLATILITY_MAXIMUM_ITERATIONS)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.implied_volatility_cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      An opt-in cache of Black-Scholes implied volatilities for snapshots in
+      which most quotes have not changed since the previous snapshot.  The
+      implied volatilities are keyed by the quote (price, S, K, t, r, flag),
+      either exactly or with each number rounded to a grid of a given
+      quantum, and the least recently used entries are evicted when the
+      cache is full.  The vectorized function looks up a whole snapshot at
+      once and solves only the quotes it does not find.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+import math
+import struct
+import threading
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import binary_flag
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import curve_cache
+from vollib.helper import IV_CONVERGED
+from vollib.helper import IV_BELOW_INTRINSIC
+from vollib.helper import IV_ABOVE_MAXIMUM
+from vollib.black.implied_volatility import implied_volatility_status
+from vollib.black.implied_volatility import arbitrage_bounds_status
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price
+from vollib.black.implied_volatility import VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+from vollib.black.implied_volatility import VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+from vollib.black_scholes.implied_volatility import implied_volatility
+
+# -----------------------------------------------------------------------------
+# DATA
+
+DEFAULT_MAXSIZE = 1000000
+
+FIELDS = ('price', 'S', 'K', 't', 'r')
+
+# The grid index of all numbers that are not finite, or too large for a
+# 64-bit grid index
+NON_FINITE_INDEX = -2**63
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS - INTERNAL
+
+def _grid_index(x, quantum):
+
+    """The index of the grid point nearest to a number, with
+    NON_FINITE_INDEX for nan and infinite numbers as in _grid_indices."""
+
+    index = math.floor(x/quantum + .5)
+    return int(index) if abs(index) < 2**63 else NON_FINITE_INDEX
+
+
+def _grid_indices(x, quantum):
+
+    """_grid_index of an array of numbers, as int64."""
+
+    with numpy.errstate(invalid='ignore', over='ignore'):
+        index = numpy.floor(x/quantum + .5)
+        return numpy.where(numpy.abs(index) < 2.**63, index, NON_FINITE_INDEX).astype(numpy.int64)
+
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class ImpliedVolatilityCache(object):
+
+    """A least recently used cache of Black-Scholes implied volatilities.
+
+    With quantum None, a quote is only found if it is exactly equal to a
+    cached quote.  Otherwise each number of the quote is rounded to a
+    multiple of quantum, which may also be a dict from 'price', 'S', 'K',
+    't' and 'r' to the quantum of that number (fields left out are
+    compared exactly); a quote is then found if it rounds to the same grid
+    point as a cached quote, and gets the implied volatility of the cached
+    quote.
+
+    When the cache is full, the least recently used quarter of the entries
+    is evicted at once.  The hits and misses counters are not locked.
+
+    :param maxsize: maximum number of cached implied volatilities
+    :type maxsize: int
+    :param quantum: grid step of the cache keys, or None for exact keys
+    :type quantum: float or dict
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> cache = ImpliedVolatilityCache()
+    >>> K = numpy.array([90., 100., 110.])
+    >>> prices = black_scholes('c', 100., K, .5, .01, .2)
+    >>> sigma, status = cache.vectorized_implied_volatility(prices, 100., K, .5, .01, 'c')
+    >>> prices[2] = black_scholes('c', 100., 110., .5, .01, .21)
+    >>> sigma, status = cache.vectorized_implied_volatility(prices, 100., K, .5, .01, 'c')
+    >>> sigma.round(12).tolist(), cache.hits, cache.misses
+    ([0.2, 0.2, 0.21], 2, 4)
+    >>> round(cache.implied_volatility(prices[0], 100., 90., .5, .01, 'c'), 12), cache.hits, cache.misses
+    (0.2, 3, 4)
+    >>> round(cache.hit_rate, 4)
+    0.4286
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, quantum=None):
+
+        self.maxsize = maxsize
+        if not isinstance(quantum, dict):
+            quantum = dict.fromkeys(FIELDS, quantum)
+        self.quantum = [quantum.get(field) for field in FIELDS]
+        self.hits = 0
+        self.misses = 0
+        self._sigma = {}
+        self._last_use = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+        # A key holds the numbers of a quote, or their grid indices, and
+        # the binary flag, as a string of 8-byte fields.
+        self._key = struct.Struct('=' + ''.join('d' if q is None else 'q' for q in self.quantum) + 'd')
+
+    def __len__(self):
+        return len(self._sigma)
+
+    @property
+    def hit_rate(self):
+
+        """The fraction of the quotes looked up that were found."""
+
+        looked_up = self.hits + self.misses
+        return float(self.hits) / looked_up if looked_up else 0.
+
+    def clear(self):
+
+        """Drop all cached implied volatilities."""
+
+        with self._lock:
+            self._sigma.clear()
+            self._last_use.clear()
+
+    def _store(self, keys, sigmas):
+
+        with self._lock:
+            excess = len(self._sigma) + len(keys) - self.maxsize
+            if excess > 0:
+                by_last_use = sorted(self._last_use, key=self._last_use.get)
+                for key in by_last_use[:max(excess, self.maxsize // 4)]:
+                    del self._sigma[key]
+                    del self._last_use[key]
+            keys, sigmas = keys[-self.maxsize:], sigmas[-self.maxsize:]
+            self._sigma.update(zip(keys, sigmas))
+            self._last_use.update(dict.fromkeys(keys, self._clock))
+
+    def implied_volatility(self, price, S, K, t, r, flag):
+
+        """Return vollib.black_scholes.implied_volatility.implied_volatility(
+        price, S, K, t, r, flag), from the cache if the quote is found.
+
+        :param price: the Black-Scholes option price
+        :type price: float
+        :param S: underlying asset price
+        :type S: float
+        :param K: strike price
+        :type K: float
+        :param t: time to expiration in years
+        :type t: float
+        :param r: risk-free interest rate
+        :type r: float
+        :param flag: 'c' or 'p' for call or put.
+        :type flag: str
+        """
+
+        fields = [x if q is None else _grid_index(x, q)
+                  for x, q in zip((price, S, K, t, r), self.quantum)]
+        # Strip the trailing zero bytes as numpy does for the vectorized keys
+        key = self._key.pack(*(fields + [binary_flag[flag]])).rstrip('\0')
+        self._clock += 1
+        sigma = self._sigma.get(key)
+        if sigma is not None:
+            self.hits += 1
+            self._last_use[key] = self._clock
+            return sigma
+        self.misses += 1
+        sigma = implied_volatility(price, S, K, t, r, flag)
+        self._store([key], [sigma])
+        return sigma
+
+    def vectorized_implied_volatility(self, price, S, K, t, r, flag):
+
+        """Calculate the Black-Scholes implied volatilities of an array of
+        option prices, solving only the quotes that are not found in the
+        cache.
+
+        The arguments and results are as for
+        vollib.black_scholes.implied_volatility.vectorized_implied_volatility.
+        Quotes with invalid inputs or outside the no-arbitrage bounds are
+        flagged without being looked up, and count as neither hits nor
+        misses.
+
+        :param price: the Black-Scholes option prices
+        :type price: numpy.ndarray
+        :param S: underlying asset prices
+        :type S: float or numpy.ndarray
+        :param K: strike prices
+        :type K: float or numpy.ndarray
+        :param t: times to expiration in years
+        :type t: float or numpy.ndarray
+        :param r: risk-free interest rates
+        :type r: float or numpy.ndarray
+        :param flag: 'c' or 'p' for call or put, or an array of flags
+        :type flag: str or numpy.ndarray
+
+        :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+        """
+
+        numbers = [numpy.asarray(a, dtype=float) for a in (price, S, K, t, r)]
+        flag = numpy.asarray(flag)
+        q = vectorized_binary_flag(flag)
+        shape = numpy.broadcast(q, *numbers).shape
+        numbers = [numpy.broadcast_to(a, shape).ravel() for a in numbers]
+        flag, q = [numpy.broadcast_to(a, shape).ravel() for a in (flag, q)]
+
+        # Quotes with invalid inputs or outside the no-arbitrage bounds are
+        # flagged without being looked up.
+        price, S, K, t, r = numbers
+        discount_factor = curve_cache.discount_factor(r, t)
+        F = S / discount_factor
+        status = arbitrage_bounds_status(price, F, K, r, t, flag)
+        sigma = numpy.empty(status.shape)
+        sigma.fill(numpy.nan)
+        valid = numpy.flatnonzero(status == IV_CONVERGED)
+
+        rows = numpy.empty((len(valid), len(FIELDS) + 1))
+        for j, (x, quantum) in enumerate(zip(numbers, self.quantum)):
+            if quantum is None:
+                rows[:, j] = x[valid]
+            else:
+                rows.view(numpy.int64)[:, j] = _grid_indices(x[valid], quantum)
+        rows[:, -1] = q[valid]
+        keys = rows.view('S%d' % (rows.itemsize * rows.shape[1])).ravel().tolist()
+
+        # The lookups run at C speed; only the misses are visited in Python.
+        self._clock += 1
+        cached = map(self._sigma.get, keys)
+        missing = [i for i, s in enumerate(cached) if s is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        found = [key for key, s in zip(keys, cached) if s is not None] if missing else keys
+        self._last_use.update(dict.fromkeys(found, self._clock))
+
+        if missing:
+            i = valid[missing]
+            solved, solved_status = vectorized_implied_volatility_of_discounted_option_price(
+                price[i], F[i], K[i], r[i], t[i], flag[i])
+            # Cache the results as LetsBeRational returns them.
+            solved = numpy.select(
+                [solved_status == IV_BELOW_INTRINSIC, solved_status == IV_ABOVE_MAXIMUM],
+                [VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC,
+                 VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM], solved).tolist()
+            for j, s in zip(missing, solved):
+                cached[j] = s
+            self._store([keys[j] for j in missing], solved)
+
+        sigma[valid], status[valid] = implied_volatility_status(cached, t[valid])
+        return sigma.reshape(shape), status.reshape(shape)
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.implied_volatility_tracker
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Implied volatilities of streaming quotes, which usually move by a few
+      ticks between updates.  The tracker remembers the last implied
+      volatility of every contract and starts the Householder iteration from
+      it, instead of from the transformed rational guess.  Quotes whose last
+      step is not within tolerance, and quotes of contracts seen for the first
+      time, are solved by the full LetsBeRational algorithm.  Contracts that
+      are no longer quoted are dropped with remove.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+import pandas
+
+# Local application/library specific imports
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import curve_cache
+from vollib.helper import vectorized_lets_be_rational
+from vollib.black.implied_volatility import prefiltered_implied_volatility
+
+# -----------------------------------------------------------------------------
+# DATA
+
+# Householder(3) converges with fourth order, so a last step of 1e-6 relative
+# to the result leaves an error at the level of machine precision.
+DEFAULT_WARM_START_ITERATIONS = 2
+DEFAULT_WARM_START_TOLERANCE = 1.0e-6
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class ImpliedVolatilityTracker(object):
+
+    """Implied volatilities of discounted Black option prices, warm
+    started from the previous implied volatility of each contract.
+
+    :param iterations: Householder(3) iterations from the previous implied volatility
+    :type iterations: int
+    :param tolerance: largest last step, relative to the implied volatility,
+        for which a warm started result is accepted
+    :type tolerance: float
+
+    >>> from vollib.black import black
+    >>> tracker = ImpliedVolatilityTracker()
+    >>> contracts = ['ESZ5 C3900', 'ESZ5 P3800']
+    >>> prices = black(['c', 'p'], 3850., numpy.array([3900., 3800.]), .25, .02, .2)
+    >>> sigma, status = tracker.implied_volatility(contracts, prices, 3850., [3900., 3800.], .02, .25, ['c', 'p'])
+    >>> sigma.round(12).tolist(), tracker.warm_starts, tracker.fallbacks
+    ([0.2, 0.2], 0, 2)
+
+    The next tick is warm started from the implied volatilities above.
+
+    >>> prices = black(['c', 'p'], 3851., numpy.array([3900., 3800.]), .25, .02, .201)
+    >>> sigma, status = tracker.implied_volatility(contracts, prices, 3851., [3900., 3800.], .02, .25, ['c', 'p'])
+    >>> sigma.round(12).tolist(), tracker.warm_starts, tracker.fallbacks
+    ([0.201, 0.201], 2, 2)
+    """
+
+    def __init__(self, iterations=DEFAULT_WARM_START_ITERATIONS, tolerance=DEFAULT_WARM_START_TOLERANCE):
+
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.warm_starts = 0
+        self.fallbacks = 0
+        self._contracts = pandas.Index([])
+        self._sigma = numpy.empty(0)
+
+    def __len__(self):
+        return len(self._contracts)
+
+    def _positions(self, contract):
+
+        """Return the positions of the contracts in the state, adding the
+        contracts seen for the first time."""
+
+        position = self._contracts.get_indexer(contract)
+        new = position < 0
+        if new.any():
+            added = pandas.Index(numpy.unique(contract[new]))
+            # Appending to an empty index would lose the dtype of the identifiers
+            self._contracts = self._contracts.append(added) if len(self._contracts) else added
+            self._sigma = numpy.concatenate((self._sigma, numpy.repeat(numpy.nan, len(added))))
+            position[new] = self._contracts.get_indexer(contract[new])
+        return position
+
+    def implied_volatility(self, contract, discounted_option_price, F, K, r, t, flag):
+
+        """Calculate the implied volatilities of discounted Black option
+        prices and remember them for the next call.
+
+        The arguments are as for
+        vollib.black.implied_volatility.vectorized_implied_volatility_of_discounted_option_price,
+        preceded by the contract identifiers; the other arguments are
+        broadcast against them.  Quotes with invalid inputs or outside the
+        no-arbitrage bounds are flagged without being solved, and count as
+        neither warm starts nor fallbacks.  For Black-Scholes(-Merton) prices, pass
+        the carry-adjusted forward S*exp((r-q)*t) as F.
+
+        :param contract: hashable identifiers of the contracts
+        :type contract: numpy.ndarray
+        :param discounted_option_price: discounted Black prices of futures options
+        :type discounted_option_price: numpy.ndarray
+        :param F: underlying futures prices
+        :type F: float or numpy.ndarray
+        :param K: strike prices
+        :type K: float or numpy.ndarray
+        :param r: risk-free interest rates
+        :type r: float or numpy.ndarray
+        :param t: times to expiration in years
+        :type t: float or numpy.ndarray
+        :param flag: 'c' or 'p' for call or put, or an array of flags
+        :type flag: str or numpy.ndarray
+
+        :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+        """
+
+        contract = numpy.asarray(contract).ravel()
+        shape = contract.shape
+        price, F, K, r, t, q = [numpy.broadcast_to(a, shape) for a in (
+            numpy.asarray(discounted_option_price, dtype=float), numpy.asarray(F, dtype=float),
+            numpy.asarray(K, dtype=float), numpy.asarray(r, dtype=float),
+            numpy.asarray(t, dtype=float), vectorized_binary_flag(flag))]
+
+        position = self._positions(contract)
+        seed = self._sigma[position]
+
+        def solve(i, price):
+            sigma = numpy.empty(i.shape)
+            solved = numpy.zeros(i.shape, dtype=bool)
+            with numpy.errstate(invalid='ignore'):
+                warm = numpy.flatnonzero(seed[i] > 0)
+            if warm.size:
+                j = i[warm]
+                s, iterations, step = \
+                    vectorized_lets_be_rational.implied_volatility_from_an_initial_guess_with_limited_iterations(
+                        price[warm], F[j], K[j], t[j], q[j], seed[j], self.iterations)
+                accepted = step <= self.tolerance
+                sigma[warm[accepted]] = s[accepted]
+                solved[warm[accepted]] = True
+
+            cold = numpy.flatnonzero(~solved)
+            if cold.size:
+                j = i[cold]
+                sigma[cold] = vectorized_lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
+                    price[cold], F[j], K[j], t[j], q[j])
+
+            self.warm_starts += len(sigma) - len(cold)
+            self.fallbacks += len(cold)
+            return sigma
+
+        sigma, status = prefiltered_implied_volatility(price, F, K, t, q, curve_cache.discount_factor(r, t), solve)
+        self._sigma[position] = sigma
+        return sigma, status
+
+    def forget(self, contract=None):
+
+        """Drop the implied volatilities of the given contracts, or of all
+        contracts if contract is None, so that they are solved from
+        scratch next time."""
+
+        if contract is None:
+            self._sigma.fill(numpy.nan)
+        else:
+            position = self._contracts.get_indexer(numpy.asarray(contract).ravel())
+            self._sigma[position[position >= 0]] = numpy.nan
+
+    def remove(self, contract):
+
+        """Drop the given contracts from the tracker, e.g. when they
+        expire, so that its state does not grow with every contract ever
+        seen.  Contracts that are not tracked are ignored.
+
+        >>> from vollib.black import black
+        >>> tracker = ImpliedVolatilityTracker()
+        >>> prices = black('c', 100., numpy.array([90., 110.]), .5, .01, .2)
+        >>> sigma, status = tracker.implied_volatility(['A', 'B'], prices, 100., [90., 110.], .01, .5, 'c')
+        >>> tracker.remove(['A', 'C'])
+        >>> len(tracker)
+        1
+        """
+
+        keep = ~self._contracts.isin(numpy.asarray(contract).ravel())
+        self._contracts = self._contracts[keep]
+        self._sigma = self._sigma[keep]
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.option_chain
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      An OptionChain groups contracts by (underlying, expiry) and computes the
+      forward, discount factor and sqrt(t) once per group, and the
+      log-moneyness once per strike.  Repricing, implying volatilities or
+      computing greeks for the whole chain then only does per-strike work.
+
+      All three models are covered by the cost of carry: Black-Scholes-Merton
+      prices options on S with dividend yield q, Black-Scholes is the case
+      q = 0, and Black (see OptionChain.from_futures) prices options on the
+      futures price F, i.e. S = F and q = r.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import pdf
+from vollib.helper import vectorized_binary_flag
+from vollib.helper import vectorized_lets_be_rational
+from vollib.helper.normaldistribution import norm_cdf
+from vollib.black.implied_volatility import prefiltered_implied_volatility
+from vollib.black.implied_volatility import VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+from vollib.black.implied_volatility import VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+
+# -----------------------------------------------------------------------------
+# CLASSES
+
+class OptionChain(object):
+
+    """A set of option contracts sharing per-(underlying, expiry) state.
+
+    :param flag: 'c' or 'p' for call or put, or an array of flags
+    :type flag: str or numpy.ndarray
+    :param S: underlying asset prices
+    :type S: float or numpy.ndarray
+    :param K: strike prices
+    :type K: float or numpy.ndarray
+    :param t: times to expiration in years
+    :type t: float or numpy.ndarray
+    :param r: risk-free interest rates
+    :type r: float or numpy.ndarray
+    :param q: annualized continuous dividend rates
+    :type q: float or numpy.ndarray
+    :param underlying: labels of the underlyings; all contracts share one
+        underlying if omitted
+    :type underlying: numpy.ndarray
+
+    The arguments are broadcast against each other into a flat list of
+    contracts.  S, r and q must be the same for all contracts of an
+    (underlying, expiry) group.  The forward, discount_factor and sqrt_t
+    attributes hold one value per group, group holds the group of each
+    contract, and K and log_moneyness one value per contract.
+
+    >>> K = numpy.arange(80., 121., 10.)
+    >>> chain = OptionChain('c', 100., K, .5, .01, .02)
+    >>> len(chain), chain.forward.shape
+    (5, (1,))
+    >>> from vollib.black_scholes_merton import black_scholes_merton
+    >>> prices = chain.price(.2)
+    >>> bool(numpy.all(prices == black_scholes_merton('c', 100., K, .5, .01, .2, .02)))
+    True
+    >>> sigma, status = chain.implied_volatility(prices)
+    >>> sigma.round(12).tolist(), status.tolist()
+    ([0.2, 0.2, 0.2, 0.2, 0.2], [0, 0, 0, 0, 0])
+    """
+
+    def __init__(self, flag, S, K, t, r, q=0., underlying=None):
+
+        if underlying is None:
+            underlying = 0
+        arrays = numpy.broadcast_arrays(numpy.asarray(flag), numpy.asarray(underlying),
+                                        *[numpy.asarray(a, dtype=float) for a in (S, K, t, r, q)])
+        flag, underlying, S, K, t, r, q = [a.ravel() for a in arrays]
+
+        # Group the contracts by (underlying, expiry)
+        underlyings, underlying_index = numpy.unique(underlying, return_inverse=True)
+        expiries, expiry_index = numpy.unique(t, return_inverse=True)
+        keys, first, self.group = numpy.unique(
+            underlying_index * len(expiries) + expiry_index, return_index=True, return_inverse=True)
+        for name, a in (('S', S), ('r', r), ('q', q)):
+            if numpy.any(a != a[first][self.group]):
+                raise ValueError('%s differs within an (underlying, expiry) group' % name)
+
+        # Per-group state
+        self.underlying = underlyings[underlying_index[first]]
+        self.t = t[first]
+        self.sqrt_t = numpy.sqrt(self.t)
+        self.discount_factor = numpy.exp(-r[first]*self.t)
+        self.forward = numpy.empty(len(keys))
+        self._S = S[first]
+        self._r = r[first]
+        self._q = q[first]
+        self._futures = False
+
+        # Per-strike state that does not depend on the underlying price
+        self.K = K
+        self._theta = vectorized_binary_flag(flag)
+        self._t_of_strike = t
+        self._r_of_strike = r
+        self._q_of_strike = q
+        self._sqrt_t_of_strike = self.sqrt_t[self.group]
+        self._discount_factor_of_strike = self.discount_factor[self.group]
+
+        n = len(K)
+        self._S_of_strike = numpy.empty(n)
+        self._F_of_strike = numpy.empty(n)
+        self.log_moneyness = numpy.empty(n)
+        self._sqrt_FK = numpy.empty(n)
+        self._intrinsic = numpy.empty(n)
+        self._maximum = numpy.empty(n)
+        self._theta_otm = numpy.empty(n)
+        self._update_forward(numpy.arange(len(keys)), slice(None))
+
+    @classmethod
+    def from_futures(cls, flag, F, K, t, r, underlying=None):
+
+        """Return a chain of Black options on futures prices F, whose rho
+        is that of vollib.black.greeks rather than of a dividend-paying
+        underlying.
+
+        >>> from vollib.black import black
+        >>> K = numpy.array([90., 100.])
+        >>> chain = OptionChain.from_futures('p', 100., K, .5, .02)
+        >>> bool(numpy.allclose(chain.price(.2), black('p', 100., K, .5, .02, .2), rtol=1e-14, atol=0))
+        True
+        """
+
+        chain = cls(flag, F, K, t, r, r, underlying)
+        chain._futures = True
+        return chain
+
+    def __len__(self):
+        return len(self.K)
+
+    def _update_forward(self, groups, index):
+
+        """Recompute the forwards of the given groups, and the per-strike
+        state of their contracts, which are those selected by index."""
+
+        self.forward[groups] = self._S[groups] * numpy.exp((self._r[groups]-self._q[groups])*self.t[groups])
+
+        group = self.group[index]
+        F = self.forward[group]
+        K = self.K[index]
+        theta = self._theta[index]
+        self._S_of_strike[index] = self._S[group]
+        self._F_of_strike[index] = F
+        self.log_moneyness[index] = numpy.log(F / K)
+        self._sqrt_FK[index] = numpy.sqrt(F) * numpy.sqrt(K)
+        self._intrinsic[index] = numpy.abs(numpy.maximum(numpy.where(theta < 0, K - F, F - K), 0.0))
+        self._maximum[index] = numpy.where(theta < 0, K, F)
+        # Map in-the-money to out-of-the-money, whose intrinsic value is zero
+        self._theta_otm[index] = numpy.where(theta * (F - K) > 0, -theta, theta)
+
+    def update_spot(self, S, underlying=None):
+
+        """Move the price of one underlying, or of all if underlying is
+        None, and recompute the state that depends on it.  Raises KeyError
+        if the chain has no contracts on underlying.
+
+        >>> chain = OptionChain('c', [100., 50.], [100., 50.], .5, .01, underlying=['A', 'B'])
+        >>> chain.update_spot(55., 'B')
+        >>> chain.forward.round(6).tolist()
+        [100.501252, 55.275689]
+        """
+
+        if underlying is None:
+            groups, index = numpy.arange(len(self.t)), slice(None)
+        else:
+            groups = numpy.flatnonzero(self.underlying == underlying)
+            if not groups.size:
+                raise KeyError(underlying)
+            index = numpy.flatnonzero(numpy.in1d(self.group, groups))
+        self._S[groups] = S
+        self._update_forward(groups, index)
+
+    def price(self, sigma):
+
+        """Return the option prices of all contracts.
+
+        :param sigma: annualized standard deviations, or volatilities
+        :type sigma: float or numpy.ndarray
+
+        :returns: numpy.ndarray
+        """
+
+        s = sigma * self._sqrt_t_of_strike
+        otm_value = numpy.maximum(0.0, self._sqrt_FK * vectorized_lets_be_rational.normalised_black(
+            self.log_moneyness, s, self._theta_otm))
+        return (self._intrinsic + otm_value) * self._discount_factor_of_strike
+
+    def implied_volatility(self, price):
+
+        """Return the implied volatilities and status codes of the option
+        prices of all contracts.  Quotes without an implied volatility are
+        returned as nan with a status code of IV_BELOW_INTRINSIC,
+        IV_ABOVE_MAXIMUM or IV_INVALID_INPUT (see vollib.helper), as by
+        vollib.black.implied_volatility.prefiltered_implied_volatility.
+
+        :param price: option prices
+        :type price: numpy.ndarray
+
+        :returns: tuple of (numpy.ndarray, numpy.ndarray) of volatilities and status codes
+
+        >>> chain = OptionChain(['c', 'c', 'p'], 100., [90., 90., 110.], .5, .01)
+        >>> sigma, status = chain.implied_volatility([numpy.nan, 5., chain.price(.2)[2]])
+        >>> sigma.round(12).tolist(), status.tolist()
+        ([nan, nan, 0.2], [3, 1, 0])
+        """
+
+        price = numpy.broadcast_to(numpy.asarray(price, dtype=float), self.K.shape)
+
+        def solve(i, price):
+            intrinsic = self._intrinsic[i]
+            with numpy.errstate(all='ignore'):
+                # Only the time value of in-the-money options is solved for
+                time_value = numpy.where(intrinsic > 0, numpy.abs(numpy.maximum(price - intrinsic, 0.0)), price)
+                s, iterations = vectorized_lets_be_rational.\
+                    unchecked_normalised_implied_volatility_from_a_transformed_rational_guess_with_limited_iterations(
+                        time_value / self._sqrt_FK[i], self.log_moneyness[i], self._theta_otm[i],
+                        vectorized_lets_be_rational.IMPLIED_VOLATILITY_MAXIMUM_ITERATIONS)
+                sigma = s / self._sqrt_t_of_strike[i]
+            # The bounds on the undiscounted prices, as checked by LetsBeRational
+            below = price < intrinsic
+            sigma[below] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+            sigma[~below & (price >= self._maximum[i])] = VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+            return sigma
+
+        return prefiltered_implied_volatility(
+            price, self._F_of_strike, self.K, self._t_of_strike, self._theta,
+            self._discount_factor_of_strike, solve)
+
+    def greeks(self, sigma):
+
+        """Return the prices and first order greeks of all contracts, with
+        the conventions of vollib.black_scholes.greeks.analytical.all_greeks:
+        theta is per calendar day, vega and rho per percentage point.
+
+        :param sigma: annualized standard deviations, or volatilities
+        :type sigma: float or numpy.ndarray
+
+        :returns: dict with keys 'price', 'delta', 'gamma', 'theta', 'vega' and 'rho'
+
+        >>> from vollib.black_scholes_merton.greeks import analytical
+        >>> chain = OptionChain('p', 100., [90., 110.], .5, .01, .02)
+        >>> greeks = chain.greeks(.2)
+        >>> abs(greeks['theta'][1] - analytical.theta('p', 100., 110., .5, .01, .2, .02)) < 1e-12
+        True
+        """
+
+        theta = self._theta
+        sqrt_t = self._sqrt_t_of_strike
+        discount_factor = self._discount_factor_of_strike
+        S = self._S_of_strike
+        sigma_sqrt_t = sigma * sqrt_t
+        D1 = self.log_moneyness / sigma_sqrt_t + sigma_sqrt_t / 2.
+        D2 = D1 - sigma_sqrt_t
+
+        N_d1 = norm_cdf(theta * D1)
+        N_d2 = norm_cdf(theta * D2)
+        pdf_d1 = pdf(D1)
+        # S*exp(-q*t) and K*exp(-r*t)
+        discounted_F = self._F_of_strike * discount_factor
+        discounted_K = self.K * discount_factor
+
+        price = self.price(sigma)
+        if self._futures:
+            rho = -self._t_of_strike * price * .01
+        else:
+            rho = theta * self._t_of_strike * discounted_K * N_d2 * .01
+
+        return {
+            'price': price,
+            'delta': theta * discounted_F / S * N_d1,
+            'gamma': discounted_F * pdf_d1 / (S * S * sigma_sqrt_t),
+            'theta': (-discounted_F * pdf_d1 * sigma / (2 * sqrt_t) + theta * self._q_of_strike * discounted_F * N_d1
+                      - theta * self._r_of_strike * discounted_K * N_d2) / 365.0,
+            'vega': discounted_F * pdf_d1 * sqrt_t * 0.01,
+            'rho': rho,
+        }
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+    vollib.streaming
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A library for option pricing, implied volatility, and
+    greek calculation.  vollib is based on lets_be_rational,
+    a Python wrapper for LetsBeRational by Peter Jaeckel as
+    described below.
+
+    :copyright: © 2015 Iota Technologies Pte Ltd
+    :license: MIT, see LICENSE for more details.
+
+    About LetsBeRational:
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    The source code of LetsBeRational resides at www.jaeckel.org/LetsBeRational.7z .
+
+    ::
+
+      ======================================================================================
+      Copyright © 2013-2014 Peter Jäckel.
+
+      Permission to use, copy, modify, and distribute this software is freely granted,
+      provided that this notice is preserved.
+
+      WARRANTY DISCLAIMER
+      The Software is provided "as is" without warranty of any kind, either express or implied,
+      including without limitation any implied warranties of condition, uninterrupted use,
+      merchantability, fitness for a particular purpose, or non-infringement.
+      ======================================================================================
+
+    Note about this module:
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    ::
+
+      ======================================================================================
+      Generators that turn an unbounded stream of quote records into a stream
+      of records enriched with implied volatilities and greeks.  The quotes
+      are grouped into micro-batches, which are closed when they are full or
+      when their oldest quote reaches the batch deadline, and each batch is
+      evaluated with the vectorized functions.  About three batches of
+      quotes are held in memory at any time: the batch being evaluated, the
+      batch being gathered, and up to a batch of quotes read ahead.
+      ======================================================================================
+
+"""
+
+# -----------------------------------------------------------------------------
+# IMPORTS
+
+# Standard library imports
+import Queue
+import sys
+import threading
+import time
+
+# Related third party imports
+import numpy
+
+# Local application/library specific imports
+from vollib.helper import binary_flag
+from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+from vollib.black_scholes.greeks.analytical import all_greeks
+
+# -----------------------------------------------------------------------------
+# DATA
+
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_BATCH_DEADLINE = 0.05  # seconds
+
+GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+# Seconds between the checks of a blocked reader thread for a closed consumer
+READER_POLL_INTERVAL = 0.1
+
+# The numeric fields of a quote record
+FIELDS = ('price', 'S', 'K', 't', 'r')
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS
+
+def micro_batches(records, batch_size=DEFAULT_BATCH_SIZE, deadline=DEFAULT_BATCH_DEADLINE):
+
+    """Group an iterable of records into lists of at most batch_size
+    records.
+
+    A batch is yielded as soon as it is full, or deadline seconds after its
+    oldest record arrived, even if the iterable blocks in the meantime:
+    the iterable is read by a separate thread into a queue of at most
+    batch_size records.  When the generator is closed, or garbage
+    collected, the thread stops reading and closes the iterable, if it is
+    a generator, once it next receives or queues a record.
+
+    :param records: the records, e.g. an unbounded feed
+    :type records: iterable
+    :param batch_size: maximum number of records per batch
+    :type batch_size: int
+    :param deadline: maximum time in seconds a record waits for its batch
+    :type deadline: float
+
+    >>> [len(batch) for batch in micro_batches(range(10), batch_size=4)]
+    [4, 4, 2]
+    """
+
+    queue = Queue.Queue(maxsize=batch_size)
+    stopped = threading.Event()
+    end = object()
+    records = iter(records)
+
+    def put(item):
+        # Give up once the consumer has gone, rather than block for ever.
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=READER_POLL_INTERVAL)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def read():
+        try:
+            for record in records:
+                if not put((time.time(), record)):
+                    break
+            else:
+                put((None, end))
+        except Exception:
+            put((None, sys.exc_info()))
+        finally:
+            if stopped.is_set() and hasattr(records, 'close'):
+                records.close()
+
+    reader = threading.Thread(target=read)
+    reader.daemon = True
+    reader.start()
+
+    batch = []
+    opened = None
+    try:
+        while True:
+            try:
+                if batch:
+                    arrival, record = queue.get(timeout=max(0., opened + deadline - time.time()))
+                else:
+                    # Block in short waits, which unlike an untimed get can be interrupted.
+                    arrival, record = queue.get(timeout=1.)
+            except Queue.Empty:
+                if batch:
+                    yield batch
+                    batch = []
+                continue
+            if arrival is None:
+                if batch:
+                    yield batch
+                if record is not end:
+                    raise record[0], record[1], record[2]
+                return
+            if not batch:
+                opened = arrival
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    finally:
+        stopped.set()
+
+
+def implied_volatility_and_greeks(records, batch_size=DEFAULT_BATCH_SIZE, deadline=DEFAULT_BATCH_DEADLINE):
+
+    """Enrich a stream of Black-Scholes quote records with their implied
+    volatilities and greeks.
+
+    Every record is a dict with the keys 'flag', 'price', 'S', 'K', 't'
+    and 'r', as in vollib.black_scholes.implied_volatility.implied_volatility.
+    A copy is yielded with the additional keys 'iv' and 'iv_status' (see
+    vectorized_implied_volatility) and 'delta', 'gamma', 'theta', 'vega'
+    and 'rho' at the implied volatility (see
+    vollib.black_scholes.greeks.analytical.all_greeks).  Quotes without an
+    implied volatility have nan greeks.  A record with a missing key, a
+    flag other than 'c' or 'p' or a field that is not a number does not
+    end the stream; its quote is flagged IV_INVALID_INPUT instead.
+
+    :param records: the quote records
+    :type records: iterable of dict
+    :param batch_size: maximum number of quotes evaluated at once
+    :type batch_size: int
+    :param deadline: maximum time in seconds a quote waits for its batch
+    :type deadline: float
+
+    >>> from vollib.black_scholes import black_scholes
+    >>> quotes = [{'flag': 'c', 'price': black_scholes('c', 100., K, .5, .01, .2),
+    ...            'S': 100., 'K': K, 't': .5, 'r': .01} for K in [90., 100., 110.]]
+    >>> for record in implied_volatility_and_greeks(quotes, batch_size=2):
+    ...     print record['K'], round(record['iv'], 12), record['iv_status'], round(record['delta'], 6)
+    90.0 0.2 0 0.802637
+    100.0 0.2 0 0.542235
+    110.0 0.2 0 0.285059
+    """
+
+    for batch in micro_batches(records, batch_size, deadline):
+        rows = []
+        for record in batch:
+            try:
+                rows.append([float(record[name]) for name in FIELDS] + [binary_flag[record['flag']]])
+            except (KeyError, TypeError, ValueError):
+                # A nan price is flagged IV_INVALID_INPUT by the solver.
+                rows.append([numpy.nan] * len(FIELDS) + [1])
+        price, S, K, t, r, q = numpy.array(rows, dtype=float).reshape(-1, len(FIELDS) + 1).T
+        flag = numpy.where(q < 0, 'p', 'c')
+
+        sigma, status = vectorized_implied_volatility(price, S, K, t, r, flag)
+        with numpy.errstate(all='ignore'):
+            greeks = all_greeks(flag, S, K, t, r, sigma)
+
+        columns = [('iv', sigma.tolist()), ('iv_status', status.tolist())] + \
+                  [(name, greeks[name].tolist()) for name in GREEKS]
+        for i, record in enumerate(batch):
+            enriched = dict(record)
+            for name, values in columns:
+                enriched[name] = values[i]
+            yield enriched
+
+
+# -----------------------------------------------------------------------------
+# MAIN
+if __name__=='__main__':
+    import doctest
+    if not doctest.testmod().failed:
+        print "Doctest passed"
@@ -0,0 +1,78 @@
+import numpy
+import unittest
+
+from vollib.black_scholes_merton import black_scholes_merton
+from vollib.black_scholes_merton.greeks.analytical import delta, vega, rho
+from vollib.black_scholes_merton.greeks.adjoint import portfolio_sensitivities
+from vollib.black_scholes.greeks.adjoint import portfolio_sensitivities as black_scholes_portfolio_sensitivities
+
+
+def portfolio(n, underliers, seed=0):
+
+    random = numpy.random.RandomState(seed)
+    quantity = random.randint(-10, 11, n).astype(float)
+    flag = numpy.where(random.rand(n) < .5, 'c', 'p')
+    underlier = random.randint(0, underliers, n)
+    S = random.uniform(50., 150., underliers)
+    q = random.uniform(0., .05, underliers)
+    K = S[underlier] * random.uniform(.7, 1.3, n)
+    t = random.uniform(.02, 2., n)
+    r = random.uniform(0., .08, n)
+    sigma = random.uniform(.1, .6, n)
+    return quantity, flag, S, K, t, r, sigma, q, underlier
+
+
+class testPortfolioSensitivities(unittest.TestCase):
+
+    def test_against_analytical_greeks(self):
+
+        quantity, flag, S, K, t, r, sigma, q, underlier = portfolio(200, 7)
+        book = portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, q, underlier)
+
+        value, S_gradient = 0., numpy.zeros(len(S))
+        for i in range(len(quantity)):
+            u = underlier[i]
+            args = (flag[i], S[u], K[i], t[i], r[i], sigma[i], q[u])
+            value += quantity[i] * black_scholes_merton(*args)
+            S_gradient[u] += quantity[i] * delta(*args)
+            self.assertTrue(abs(book['sigma'][i] * .01 - quantity[i] * vega(*args)) < 1e-10)
+            self.assertTrue(abs(book['r'][i] * .01 - quantity[i] * rho(*args)) < 1e-10)
+        self.assertTrue(abs(book['value'] - value) < 1e-8)
+        numpy.testing.assert_allclose(book['S'], S_gradient, rtol=1e-12, atol=1e-10)
+
+    def test_dividend_yield_against_finite_differences(self):
+
+        quantity, flag, S, K, t, r, sigma, q, underlier = portfolio(50, 3)
+        book = portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, q, underlier)
+        h = 1e-6
+        for u in range(len(S)):
+            up, down = q.copy(), q.copy()
+            up[u] += h
+            down[u] -= h
+            expected = (portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, up, underlier)['value'] -
+                        portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, down, underlier)['value']) / (2 * h)
+            self.assertTrue(abs(book['q'][u] - expected) < 1e-5 * max(1., abs(expected)))
+
+    def test_broadcast_arguments(self):
+
+        quantity, flag, S, K, t, r, sigma, q, underlier = portfolio(30, 1)
+        per_position = portfolio_sensitivities(quantity, flag, S[0], K, t, .03 + 0. * t, .25 + 0. * t, q[0])
+        shared = portfolio_sensitivities(quantity, flag, S[0], K, t, .03, .25, q[0])
+        for name in ('value', 'S', 'q'):
+            self.assertTrue(abs(shared[name] - per_position[name]) < 1e-9)
+        self.assertEqual(shared['r'].shape, ())
+        self.assertTrue(abs(shared['r'] - per_position['r'].sum()) < 1e-9)
+        self.assertTrue(abs(shared['sigma'] - per_position['sigma'].sum()) < 1e-9)
+
+    def test_black_scholes(self):
+
+        quantity, flag, S, K, t, r, sigma, q, underlier = portfolio(20, 2)
+        book = black_scholes_portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, underlier)
+        expected = portfolio_sensitivities(quantity, flag, S, K, t, r, sigma, 0., underlier)
+        self.assertEqual(sorted(book), ['S', 'r', 'sigma', 'value'])
+        for name in book:
+            numpy.testing.assert_array_equal(book[name], expected[name])
+
+
+if __name__ == '__main__':
+    unittest.main()
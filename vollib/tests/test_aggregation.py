@@ -0,0 +1,106 @@
+import numpy
+import pandas
+import unittest
+
+from vollib.black_scholes_merton.greeks.analytical import higher_order_greeks
+from vollib.helper.aggregation import aggregate_greeks
+
+
+def book(n, seed=0):
+
+    random = numpy.random.RandomState(seed)
+    quantity = random.randint(-10, 11, n).astype(float)
+    underlier = random.randint(0, 5, n)
+    bucket = random.randint(0, 4, n)
+    account = random.randint(0, 3, n)
+    flag = numpy.where(random.rand(n) < .5, 'c', 'p')
+    K = random.uniform(70., 130., n)
+    t = random.uniform(.02, 2., n)
+    sigma = random.uniform(.1, .5, n)
+    greeks = higher_order_greeks(flag, 100., K, t, .03, sigma, .01)
+    return greeks, quantity, (underlier, bucket, account)
+
+
+class testAggregateGreeks(unittest.TestCase):
+
+    def test_against_groupby(self):
+
+        greeks, quantity, keys = book(5000)
+        totals = aggregate_greeks(greeks, quantity, keys, chunk_size=700)
+
+        frame = pandas.DataFrame(dict((name, values * quantity) for name, values in greeks.items()))
+        frame['underlier'], frame['bucket'], frame['account'] = keys
+        expected = frame.groupby(['underlier', 'bucket', 'account']).sum()
+        for (u, b, a), row in expected.iterrows():
+            for name in greeks:
+                self.assertTrue(abs(totals[name][u, b, a] - row[name]) < 1e-9)
+        for name in greeks:
+            self.assertEqual(totals[name].shape, (5, 4, 3))
+            self.assertTrue(abs(totals[name].sum() - expected[name].sum()) < 1e-9)
+
+    def test_chunk_size(self):
+
+        greeks, quantity, keys = book(1000)
+        whole = aggregate_greeks(greeks, quantity, keys, chunk_size=1000)
+        for chunk_size in (1, 7, 999, 5000):
+            chunked = aggregate_greeks(greeks, quantity, keys, chunk_size=chunk_size)
+            for name in greeks:
+                numpy.testing.assert_allclose(chunked[name], whole[name], rtol=1e-12, atol=1e-12)
+
+    def test_batches_and_shape(self):
+
+        greeks, quantity, keys = book(600)
+        first = dict((name, values[:250]) for name, values in greeks.items())
+        second = dict((name, values[250:]) for name, values in greeks.items())
+        out = aggregate_greeks(first, quantity[:250], [key[:250] for key in keys], shape=(6, 4, 3))
+        result = aggregate_greeks(second, quantity[250:], [key[250:] for key in keys], shape=(6, 4, 3), out=out)
+        self.assertTrue(result is out)
+        expected = aggregate_greeks(greeks, quantity, keys, shape=(6, 4, 3))
+        for name in greeks:
+            numpy.testing.assert_allclose(out[name], expected[name], rtol=1e-12, atol=1e-12)
+            self.assertTrue(numpy.all(out[name][5] == 0.))
+
+    def test_single_key_and_scalar_quantity(self):
+
+        greeks, quantity, (underlier, bucket, account) = book(300)
+        totals = aggregate_greeks({'vanna': greeks['vanna']}, 2., underlier, shape=5)
+        expected = numpy.array([2. * greeks['vanna'][underlier == u].sum() for u in range(5)])
+        numpy.testing.assert_allclose(totals['vanna'], expected, rtol=1e-12)
+
+    def test_list_of_keys_is_one_level(self):
+
+        greeks, quantity, (underlier, bucket, account) = book(10)
+        totals = aggregate_greeks(greeks, quantity, underlier.tolist())
+        expected = aggregate_greeks(greeks, quantity, underlier)
+        for name in greeks:
+            self.assertEqual(totals[name].shape, expected[name].shape)
+            numpy.testing.assert_allclose(totals[name], expected[name], rtol=1e-12)
+
+    def test_shape_of_out(self):
+
+        greeks, quantity, (underlier, bucket, account) = book(200)
+        out = aggregate_greeks(greeks, quantity, underlier)
+        low = underlier < 3
+        batch = dict((name, values[low]) for name, values in greeks.items())
+        result = aggregate_greeks(batch, quantity[low], underlier[low], out=out)
+        self.assertTrue(result is out)
+        for name in greeks:
+            self.assertEqual(out[name].shape, (5,))
+
+    def test_many_groups(self):
+
+        greeks, quantity, keys = book(1000)
+        keys = [keys[0] * 200, keys[1] * 10, keys[2]]
+        whole = aggregate_greeks(greeks, quantity, keys, shape=(1000, 40, 3))
+        chunked = aggregate_greeks(greeks, quantity, keys, shape=(1000, 40, 3), chunk_size=10)
+        for name in greeks:
+            numpy.testing.assert_allclose(chunked[name], whole[name], rtol=1e-12, atol=1e-12)
+
+    def test_key_out_of_range(self):
+
+        greeks, quantity, keys = book(10)
+        self.assertRaises(ValueError, aggregate_greeks, greeks, quantity, keys, shape=(1, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
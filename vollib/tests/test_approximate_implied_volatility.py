@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator
+from vollib.black import black, normalised_black
+from vollib.black.implied_volatility import approximate_implied_volatility_of_discounted_option_price
+from vollib.black.implied_volatility import approximate_normalised_implied_volatility
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price
+from vollib.black.implied_volatility import VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC
+from vollib.black.implied_volatility import VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM
+from vollib.black.lookup_table import NormalisedImpliedVolatilityTable
+from vollib.helper import IV_BELOW_INTRINSIC, IV_ABOVE_MAXIMUM, IV_INVALID_INPUT
+
+
+class TestApproximateImpliedVolatility(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = NormalisedImpliedVolatilityTable(x_points=129, w_points=129)
+        rs = numpy.random.RandomState(0)
+        cls.K = rs.uniform(50., 200., 20000)
+        cls.t = rs.uniform(.02, 2., 20000)
+        cls.sigma = rs.uniform(.05, 1., 20000)
+        cls.flag = numpy.where(rs.rand(20000) < .5, 'c', 'p')
+        cls.prices = black(cls.flag, 100., cls.K, cls.t, .02, cls.sigma)
+        cls.exact, cls.status = vectorized_implied_volatility_of_discounted_option_price(
+            cls.prices, 100., cls.K, .02, cls.t, cls.flag)
+
+    def test_tolerance(self):
+
+        for tolerance in [1e-3, 1e-4, 1e-6]:
+            for max_iterations in [0, 1, 2]:
+                sigma, status = approximate_implied_volatility_of_discounted_option_price(
+                    self.prices, 100., self.K, .02, self.t, self.flag, tolerance, max_iterations, self.table)
+                self.assertTrue(numpy.array_equal(status, self.status))
+                self.assertTrue(numpy.nanmax(numpy.abs(sigma - self.exact)) <= tolerance)
+
+    def test_against_test_data(self):
+
+        df = TestDataIterator().df
+        F, K, t, r, sigma = [df[c].values for c in ('S', 'K', 't', 'R', 'v')]
+        flag = numpy.where(numpy.arange(len(df)) % 2, 'p', 'c')
+        prices = black(flag, F, K, t, r, sigma)
+        expected, expected_status = vectorized_implied_volatility_of_discounted_option_price(
+            prices, F, K, r, t, flag)
+        approximate, status = approximate_implied_volatility_of_discounted_option_price(
+            prices, F, K, r, t, flag, table=self.table)
+        self.assertTrue(numpy.array_equal(status, expected_status))
+        self.assertTrue(numpy.nanmax(numpy.abs(approximate - expected)) <= 1e-4)
+
+    def test_status(self):
+
+        sigma, status = approximate_implied_volatility_of_discounted_option_price(
+            numpy.array([5., 0., 120.]), 100., numpy.array([90., 110., 110.]), 0., .5, 'c', table=self.table)
+        self.assertEqual(status.tolist(), [IV_BELOW_INTRINSIC, 0, IV_ABOVE_MAXIMUM])
+        self.assertEqual(sigma[1], 0.)
+        self.assertTrue(numpy.isnan(sigma[[0, 2]]).all())
+
+    def test_invalid_input(self):
+
+        nan = numpy.nan
+        prices = numpy.array([nan, 5., 5., 5., 5., 5., 5.])
+        F = numpy.array([100., 100., 100., -1., 100., 100., 100.])
+        K = numpy.array([100., 100., 100., 100., 0., 100., 100.])
+        t = numpy.array([.5, .5, 0., .5, .5, -.5, .5])
+        r = numpy.array([.02, .02, .02, .02, .02, .02, nan])
+        sigma, status = approximate_implied_volatility_of_discounted_option_price(
+            prices, F, K, r, t, 'c', table=self.table)
+        expected, expected_status = vectorized_implied_volatility_of_discounted_option_price(
+            prices, F, K, r, t, 'c')
+        self.assertEqual(status.tolist(), expected_status.tolist())
+        self.assertEqual(status.tolist(), [IV_INVALID_INPUT, 0] + [IV_INVALID_INPUT] * 5)
+        self.assertTrue(numpy.isnan(sigma[status != 0]).all())
+
+    def test_normalised(self):
+
+        x = numpy.array([-0.5, 0.5, 0.1, -8., 8., 0.3, 0.3])
+        flag = numpy.array(['c', 'c', 'p', 'c', 'p', 'c', 'c'])
+        beta = normalised_black(x, .6, flag)
+        beta[5] = 0.
+        beta[6] = 2.
+        s = approximate_normalised_implied_volatility(beta, x, flag, 1e-5, table=self.table)
+        # x = -8 and 8 are off the table, and solved exactly
+        self.assertTrue(numpy.abs(s[:5] - .6).max() <= 1e-5)
+        self.assertEqual(s[5], VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_BELOW_INTRINSIC)
+        self.assertEqual(s[6], VOLATILITY_VALUE_TO_SIGNAL_PRICE_IS_ABOVE_MAXIMUM)
+        self.assertTrue(abs(approximate_normalised_implied_volatility(
+            beta[0], x[0], 'c', 1e-5, table=self.table) - .6) <= 1e-5)
+
+    def test_save_and_load(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'table.npz')
+            self.table.save(path)
+            table = NormalisedImpliedVolatilityTable.load(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertTrue(numpy.array_equal(table.values, self.table.values))
+        self.assertTrue(numpy.array_equal(table.errors, self.table.errors))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy
+
+from vollib.black import black
+from vollib.black.implied_volatility import arbitrage_bounds_status
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price_with_tolerance
+from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+from vollib.helper import IV_CONVERGED, IV_BELOW_INTRINSIC, IV_ABOVE_MAXIMUM, IV_INVALID_INPUT
+
+
+class TestArbitrageBounds(unittest.TestCase):
+
+    def test_status(self):
+
+        F, r, t = 100., .05, 1.
+        discount_factor = numpy.exp(-r*t)
+        K = numpy.array([90., 90., 90., 110., 110., 110.])
+        flag = numpy.array(['c', 'c', 'c', 'p', 'p', 'p'])
+        prices = discount_factor * numpy.array([9.99, 10.5, 100., 9.99, 10.5, 110.])
+        self.assertEqual(arbitrage_bounds_status(prices, F, K, r, t, flag).tolist(),
+                         [IV_BELOW_INTRINSIC, IV_CONVERGED, IV_ABOVE_MAXIMUM] * 2)
+
+    def test_invalid_input(self):
+
+        nan, inf = numpy.nan, numpy.inf
+        prices = numpy.array([nan, inf, 5., 5., 5., 5., 5., 5.])
+        F = numpy.array([100., 100., nan, -100., 100., 100., 100., 100.])
+        K = numpy.array([100., 100., 100., 100., 0., 100., 100., 100.])
+        t = numpy.array([.5, .5, .5, .5, .5, 0., .5, .5])
+        r = numpy.array([.02, .02, .02, .02, .02, .02, nan, .02])
+        status = arbitrage_bounds_status(prices, F, K, r, t, 'c')
+        self.assertEqual(status.tolist(), [IV_INVALID_INPUT] * 7 + [IV_CONVERGED])
+
+        sigma, status = vectorized_implied_volatility_of_discounted_option_price(prices, F, K, r, t, 'c')
+        self.assertEqual(status.tolist(), [IV_INVALID_INPUT] * 7 + [IV_CONVERGED])
+        self.assertTrue(numpy.isnan(sigma[:7]).all())
+        self.assertTrue(sigma[7] > 0)
+
+    def test_skipped_rows(self):
+
+        rs = numpy.random.RandomState(0)
+        K = rs.uniform(50., 200., 2000)
+        t = rs.uniform(.02, 2., 2000)
+        flag = numpy.where(rs.rand(2000) < .5, 'c', 'p')
+        prices = black(flag, 100., K, t, .02, rs.uniform(.05, 1., 2000))
+        prices[::4] = -1.
+        prices[1::4] = 1000.
+
+        status = arbitrage_bounds_status(prices, 100., K, .02, t, flag)
+        sigma, iv_status, iterations = vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+            prices, 100., K, .02, t, flag)
+        self.assertTrue(numpy.array_equal(status[status != IV_CONVERGED], iv_status[status != IV_CONVERGED]))
+        self.assertTrue((status[::4] == IV_BELOW_INTRINSIC).all())
+        self.assertTrue((status[1::4] == IV_ABOVE_MAXIMUM).all())
+        self.assertTrue((iterations[status != IV_CONVERGED] == 0).all())
+        self.assertTrue(numpy.isnan(sigma[status != IV_CONVERGED]).all())
+
+    def test_black_scholes(self):
+
+        sigma, status = vectorized_implied_volatility(
+            numpy.array([1., 5., 200., 5.]), 100., numpy.array([80., 100., 100., 100.]),
+            numpy.array([.5, .5, .5, -.5]), .01, 'c')
+        self.assertEqual(status.tolist(), [IV_BELOW_INTRINSIC, IV_CONVERGED, IV_ABOVE_MAXIMUM, IV_INVALID_INPUT])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import numpy
+import unittest
+
+from vollib.black import black
+from vollib.black.greeks import analytical as black_analytical
+from vollib.black.greeks.automatic import all_greeks as black_all_greeks
+from vollib.black_scholes import black_scholes
+from vollib.black_scholes.greeks import analytical as black_scholes_analytical
+from vollib.black_scholes.greeks.automatic import all_greeks as black_scholes_all_greeks
+from vollib.black_scholes_merton import black_scholes_merton
+from vollib.black_scholes_merton.greeks import analytical as black_scholes_merton_analytical
+from vollib.black_scholes_merton.greeks.automatic import all_greeks as black_scholes_merton_all_greeks
+from vollib.helper.automatic_greeks import GREEKS
+from vollib.helper.dual import Dual, exp, log, sqrt, norm_cdf
+
+
+FIRST_ORDER = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+
+def grid():
+
+    K, r, sigma, t = numpy.meshgrid(numpy.linspace(20, 200, 7), numpy.linspace(0, 0.2, 5),
+                                    numpy.linspace(0.1, 0.5, 5), numpy.linspace(0.01, 2, 5))
+    return K.ravel(), r.ravel(), sigma.ravel(), t.ravel()
+
+
+class testDual(unittest.TestCase):
+
+    def test_against_finite_differences(self):
+
+        f = lambda x, y: norm_cdf(log(x / y) / sqrt(y)) * exp(-x * y) + 1. / (x - y) ** 2.
+        x0, y0 = numpy.array([1.3, .7]), numpy.array([.4, 1.9])
+        x, y = Dual.variables([x0, y0])
+        z = f(x, y)
+        h = 1e-4
+        numpy.testing.assert_allclose(z.value, f(x0, y0), rtol=1e-14)
+        numpy.testing.assert_allclose(z.gradient[0], (f(x0 + h, y0) - f(x0 - h, y0)) / (2 * h), rtol=1e-7)
+        numpy.testing.assert_allclose(z.gradient[1], (f(x0, y0 + h) - f(x0, y0 - h)) / (2 * h), rtol=1e-7)
+        # The second derivatives are by x and x, x and y, and y and y
+        self.assertEqual([pair.tolist() for pair in z.pairs], [[0, 0, 1], [0, 1, 1]])
+        numpy.testing.assert_allclose(
+            z.hessian[0], (f(x0 + h, y0) - 2 * f(x0, y0) + f(x0 - h, y0)) / (h * h), rtol=1e-5)
+        numpy.testing.assert_allclose(
+            z.hessian[1], (f(x0 + h, y0 + h) - f(x0 + h, y0 - h) - f(x0 - h, y0 + h) + f(x0 - h, y0 - h)) / (4 * h * h),
+            rtol=1e-5)
+        numpy.testing.assert_allclose(
+            z.hessian[2], (f(x0, y0 + h) - 2 * f(x0, y0) + f(x0, y0 - h)) / (h * h), rtol=1e-5)
+
+    def test_selected_pairs(self):
+
+        x, y = Dual.variables([1.5, .5], pairs=[(0, 1)])
+        z = x * exp(x * y)
+        self.assertEqual(z.hessian.shape, (1,))
+        expected = (2. * 1.5 + 1.5 ** 2. * .5) * numpy.exp(.75)
+        self.assertTrue(abs(z.hessian[0] - expected) < 1e-14 * expected)
+
+    def test_first_order_only(self):
+
+        x, = Dual.variables([numpy.array([1., 2.])], second_order=False)
+        y = numpy.array([3., 4.]) * exp(x) - x
+        self.assertTrue(y.hessian is None)
+        numpy.testing.assert_allclose(y.gradient[0], [3. * numpy.exp(1.) - 1., 4. * numpy.exp(2.) - 1.])
+
+
+class testAutomaticGreeks(unittest.TestCase):
+
+    def check(self, greeks, expected, tolerance=1e-10):
+
+        for name, value in expected.items():
+            self.assertTrue(numpy.all(abs(greeks[name] - value) < tolerance), name)
+
+    def test_black(self):
+
+        K, r, sigma, t = grid()
+        for flag in ['c', 'p']:
+            greeks = black_all_greeks(flag, 100., K, t, r, sigma)
+            for i in range(0, len(K), 11):
+                expected = dict((name, getattr(black_analytical, name)(flag, 100., K[i], t[i], r[i], sigma[i]))
+                                for name in FIRST_ORDER)
+                expected['price'] = black(flag, 100., K[i], t[i], r[i], sigma[i])
+                self.check(dict((name, value[i]) for name, value in greeks.items()), expected)
+
+    def test_black_scholes(self):
+
+        K, r, sigma, t = grid()
+        for flag in ['c', 'p']:
+            greeks = black_scholes_all_greeks(flag, 100., K, t, r, sigma)
+            for i in range(0, len(K), 11):
+                expected = dict((name, getattr(black_scholes_analytical, name)(flag, 100., K[i], t[i], r[i], sigma[i]))
+                                for name in FIRST_ORDER)
+                expected['price'] = black_scholes(flag, 100., K[i], t[i], r[i], sigma[i])
+                self.check(dict((name, value[i]) for name, value in greeks.items()), expected)
+
+    def test_black_scholes_merton(self):
+
+        K, r, sigma, t = grid()
+        q = .03
+        for flag in ['c', 'p']:
+            greeks = black_scholes_merton_all_greeks(flag, 100., K, t, r, sigma, q)
+            higher_order = black_scholes_merton_analytical.higher_order_greeks(flag, 100., K, t, r, sigma, q)
+            for i in range(0, len(K), 11):
+                expected = dict((name, getattr(black_scholes_merton_analytical, name)(
+                    flag, 100., K[i], t[i], r[i], sigma[i], q)) for name in FIRST_ORDER)
+                expected.update((name, higher_order[name][i]) for name in ('vanna', 'volga', 'charm'))
+                expected['price'] = black_scholes_merton(flag, 100., K[i], t[i], r[i], sigma[i], q)
+                self.check(dict((name, value[i]) for name, value in greeks.items()), expected)
+
+    def test_veta(self):
+
+        vega = black_scholes_merton_analytical.vega
+        h = 1e-5
+        for flag in ['c', 'p']:
+            greeks = black_scholes_merton_all_greeks(flag, 100., 95., .5, .05, .25, .02, greeks=['veta'])
+            expected = (vega(flag, 100., 95., .5 - h, .05, .25, .02) -
+                        vega(flag, 100., 95., .5 + h, .05, .25, .02)) / (2 * h) / 365.
+            self.assertTrue(abs(greeks['veta'] - expected) < 1e-9)
+
+    def test_subsets_and_mixed_flags(self):
+
+        flag = numpy.array(['c', 'p', 'p', 'c'])
+        K = numpy.array([90., 95., 105., 110.])
+        everything = black_scholes_all_greeks(flag, 100., K, .5, .03, .25)
+        self.assertEqual(sorted(everything), sorted(GREEKS + ('price',)))
+        for name in GREEKS:
+            subset = black_scholes_all_greeks(flag, 100., K, .5, .03, .25, greeks=[name])
+            self.assertEqual(sorted(subset), sorted([name, 'price']))
+            numpy.testing.assert_allclose(subset[name], everything[name], rtol=1e-13)
+        for i in range(4):
+            self.assertTrue(abs(everything['delta'][i] -
+                                black_scholes_analytical.delta(flag[i], 100., K[i], .5, .03, .25)) < 1e-12)
+        self.assertTrue(abs(black_scholes_all_greeks('c', 100., 90., .5, .03, .25, greeks=[])['price'] -
+                            black_scholes('c', 100., 90., .5, .03, .25)) < 1e-12)
+
+    def test_unknown_greek(self):
+
+        self.assertRaises(KeyError, black_all_greeks, 'c', 100., 90., .5, .03, .25, greeks=['speed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import numpy
+import unittest
+
+from vollib.black import black
+
+from vollib.black.greeks.analytical import delta
+from vollib.black.greeks.analytical import gamma
+from vollib.black.greeks.analytical import theta
+from vollib.black.greeks.analytical import vega
+from vollib.black.greeks.analytical import rho
+from vollib.black.greeks.analytical import all_greeks
+
+
+class testGreeks(unittest.TestCase):
+
+    def test_all_greeks(self):
+
+        F = 100.0
+        K, r, sigma, t = numpy.meshgrid(numpy.linspace(20,200,10), numpy.linspace(0,0.2,10),
+                                        numpy.linspace(0.1,0.5,10), numpy.linspace(0.01,2,10))
+        K, r, sigma, t = K.ravel(), r.ravel(), sigma.ravel(), t.ravel()
+        for flag in ['c','p']:
+            greeks = all_greeks(flag, F, K, t, r, sigma)
+            for i in range(0, len(K), 7):
+                scalar_greeks = all_greeks(flag, F, K[i], t[i], r[i], sigma[i])
+                for name, f in [('price', black), ('delta', delta), ('gamma', gamma),
+                                ('theta', theta), ('vega', vega), ('rho', rho)]:
+                    expected = f(flag, F, K[i], t[i], r[i], sigma[i])
+                    self.assertTrue(abs(greeks[name][i] - expected) < 1e-10)
+                    self.assertTrue(abs(scalar_greeks[name] - expected) < 1e-10)
+
+    def test_mixed_flags(self):
+
+        flag = numpy.array(['c', 'p', 'p', 'c'])
+        K = numpy.array([90., 95., 105., 110.])
+        greeks = all_greeks(flag, 100., K, .5, .03, .25)
+        for i in range(4):
+            self.assertTrue(abs(greeks['delta'][i] - delta(flag[i], 100., K[i], .5, .03, .25)) < 1e-12)
+            self.assertTrue(abs(greeks['theta'][i] - theta(flag[i], 100., K[i], .5, .03, .25)) < 1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
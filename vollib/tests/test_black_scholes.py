@@ -1,10 +1,18 @@
 import unittest
 
+import numpy
+import lets_be_rational
+
 from vollib.tests.test_utils import TestDataIterator, almost_equal
 from vollib.black_scholes import black_scholes
 from vollib.black_scholes.implied_volatility import implied_volatility
+from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_undiscounted_option_price
+from vollib.black.implied_volatility import NUMPY
+from vollib.helper import IV_CONVERGED, IV_BELOW_INTRINSIC, IV_ABOVE_MAXIMUM
 from vollib.black_scholes.greeks import analytical
 from vollib.black_scholes.greeks import numerical
+from vollib.helper import vectorized_lets_be_rational
 
 
 class TestBlackScholesAgainstBenchmarkValues(unittest.TestCase):
@@ -27,8 +35,22 @@ class TestBlackScholesAgainstBenchmarkValues(unittest.TestCase):
                     black_scholes('p', S, K, t, r, sigma), row['bs_put'], epsilon=.000001
                 )
             )
-            
-    
+
+    def test_vectorized_prices(self):
+
+        df = self.tdi.df
+        S,K,t,r,sigma = df.S.values,df.K.values,df.t.values,df.R.values,df.v.values
+        calls = black_scholes('c', S, K, t, r, sigma)
+        puts = black_scholes('p', S, K, t, r, sigma)
+        self.assertTrue(numpy.all(almost_equal(calls, df.bs_call.values, epsilon=.000001)))
+        self.assertTrue(numpy.all(almost_equal(puts, df.bs_put.values, epsilon=.000001)))
+
+        flags = numpy.where(numpy.arange(len(S)) % 2, 'p', 'c')
+        mixed = black_scholes(flags, S, K, t, r, sigma)
+        for i in range(len(S)):
+            self.assertEqual(mixed[i], black_scholes(flags[i], S[i], K[i], t[i], r[i], sigma[i]))
+
+
     def test_analytical_delta(self):
         
         while self.tdi.has_next():
@@ -128,6 +150,60 @@ class TestBlackScholesAgainstBenchmarkValues(unittest.TestCase):
             iv = implied_volatility(P, S, K, t, r, 'p')
             self.assertTrue(almost_equal(sigma, iv, epsilon = .001) or (iv ==0.0))
 
+    def test_vectorized_implied_volatility(self):
+
+        df = self.tdi.df
+        S,K,t,r,sigma = df.S.values,df.K.values,df.t.values,df.R.values,df.v.values
+        for flag in ['c', 'p']:
+            prices = black_scholes(flag, S, K, t, r, sigma)
+            ivs, status = vectorized_implied_volatility(prices, S, K, t, r, flag)
+            for i in range(len(S)):
+                iv = implied_volatility(prices[i], S[i], K[i], t[i], r[i], flag)
+                self.assertEqual(status[i], IV_CONVERGED)
+                self.assertTrue(almost_equal(ivs[i], iv, epsilon=1.0e-12))
+
+        ivs, status = vectorized_implied_volatility(
+            [0.5, 200.], 100., 90., .5, .01, ['c', 'p'])
+        self.assertTrue(numpy.all(numpy.isnan(ivs)))
+        self.assertEqual(status.tolist(), [IV_BELOW_INTRINSIC, IV_ABOVE_MAXIMUM])
+
+    def test_vectorized_backend_against_scalar_backend(self):
+
+        df = self.tdi.df
+        F = df.S.values * numpy.exp(df.R.values * df.t.values)
+        K,t,sigma = df.K.values,df.t.values,df.v.values
+        for q in [1., -1.]:
+            prices = vectorized_lets_be_rational.black(F, K, sigma, t, q)
+            ivs = vectorized_lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
+                prices, F, K, t, q)
+            for i in range(len(F)):
+                self.assertTrue(almost_equal(
+                    prices[i], lets_be_rational.black(F[i], K[i], sigma[i], t[i], q), epsilon=1.0e-12))
+                iv = lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
+                    prices[i], F[i], K[i], t[i], q)
+                self.assertTrue(almost_equal(ivs[i], iv, epsilon=1.0e-14))
+
+    def test_solvers_near_maximum(self):
+
+        rs = numpy.random.RandomState(0)
+        F, K, t = rs.uniform(50., 150., 2000), rs.uniform(50., 150., 2000), rs.uniform(.01, 3., 2000)
+        q = numpy.where(rs.rand(2000) < .5, 1., -1.)
+        prices = numpy.where(q < 0, K, F) * (1. - 10**rs.uniform(-17., -8., 2000))
+        sentinels = vectorized_lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
+            prices, F, K, t, q)
+        for i in range(len(F)):
+            iv = lets_be_rational.implied_volatility_from_a_transformed_rational_guess(
+                prices[i], F[i], K[i], t[i], q[i])
+            self.assertTrue(sentinels[i] == iv or almost_equal(sentinels[i], iv, epsilon=1.0e-10))
+
+        flag = numpy.where(q < 0, 'p', 'c')
+        ivs, status = vectorized_implied_volatility_of_undiscounted_option_price(prices, F, K, t, flag)
+        port_ivs, port_status = vectorized_implied_volatility_of_undiscounted_option_price(
+            prices, F, K, t, flag, solver=NUMPY)
+        self.assertEqual(status.tolist(), port_status.tolist())
+        self.assertTrue((status != IV_CONVERGED).any())
+        self.assertTrue(numpy.allclose(ivs, port_ivs, rtol=1.0e-10, atol=0, equal_nan=True))
+
 
     
 if __name__ == '__main__':
@@ -9,12 +9,14 @@ from vollib.black_scholes.greeks.analytical import gamma
 from vollib.black_scholes.greeks.analytical import theta
 from vollib.black_scholes.greeks.analytical import vega
 from vollib.black_scholes.greeks.analytical import rho
+from vollib.black_scholes.greeks.analytical import all_greeks
 
 from vollib.black_scholes.greeks.numerical import delta as ndelta
 from vollib.black_scholes.greeks.numerical import gamma as ngamma
 from vollib.black_scholes.greeks.numerical import theta as ntheta
 from vollib.black_scholes.greeks.numerical import vega as nvega
 from vollib.black_scholes.greeks.numerical import rho as nrho
+from vollib.black_scholes.greeks.numerical import all_greeks as nall_greeks
 
 
 epsilon = .01
@@ -125,6 +127,36 @@ class testGreeks(unittest.TestCase):
                                 if not results_match:
                                     print flag, val1, val2
                                 self.assertTrue(results_match)
-                            
+
+    def test_all_greeks(self):
+
+        S = 100.0
+        K, r, sigma, t = numpy.meshgrid(numpy.linspace(20,200,10), numpy.linspace(0,0.2,10),
+                                        numpy.linspace(0.1,0.5,10), numpy.linspace(0.01,2,10))
+        K, r, sigma, t = K.ravel(), r.ravel(), sigma.ravel(), t.ravel()
+        for flag in ['c','p']:
+            greeks = all_greeks(flag, S, K, t, r, sigma)
+            for i in range(0, len(K), 7):
+                scalar_greeks = all_greeks(flag, S, K[i], t[i], r[i], sigma[i])
+                for name, f in [('price', python_black_scholes), ('delta', delta), ('gamma', gamma),
+                                ('theta', theta), ('vega', vega), ('rho', rho)]:
+                    expected = f(flag, S, K[i], t[i], r[i], sigma[i])
+                    self.assertTrue(abs(greeks[name][i] - expected) < 1e-10)
+                    self.assertTrue(abs(scalar_greeks[name] - expected) < 1e-10)
+
+    def test_numerical_all_greeks(self):
+
+        S = 100.0
+        K, r, sigma, t = numpy.meshgrid(numpy.linspace(20,200,10), numpy.linspace(0,0.2,10),
+                                        numpy.linspace(0.1,0.5,10), numpy.linspace(0.01,2,10))
+        K, r, sigma, t = K.ravel(), r.ravel(), sigma.ravel(), t.ravel()
+        for flag in ['c','p']:
+            greeks = nall_greeks(flag, S, K, t, r, sigma)
+            for i in range(0, len(K), 7):
+                for name, f in [('delta', ndelta), ('gamma', ngamma), ('theta', ntheta),
+                                ('vega', nvega), ('rho', nrho)]:
+                    expected = f(flag, S, K[i], t[i], r[i], sigma[i])
+                    self.assertTrue(abs(greeks[name][i] - expected) < 1e-5)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator, almost_equal
+from vollib.black_scholes_merton import black_scholes_merton
+from vollib.black_scholes_merton.implied_volatility import implied_volatility
+from vollib.black_scholes_merton.implied_volatility import vectorized_implied_volatility
+from vollib.helper import IV_CONVERGED
+
+
+class TestBlackScholesMertonAgainstScalarValues(unittest.TestCase):
+
+    def setUp(self):
+        self.tdi = TestDataIterator()
+        df = self.tdi.df
+        self.S,self.K,self.t,self.r,self.sigma = df.S.values,df.K.values,df.t.values,df.R.values,df.v.values
+        # a dividend yield per row, cycling through a few underlyings
+        self.q = numpy.array([0., .01, .025, .04])[numpy.arange(len(df)) % 4]
+
+    def test_vectorized_prices(self):
+
+        S,K,t,r,sigma,q = self.S,self.K,self.t,self.r,self.sigma,self.q
+        flags = numpy.where(numpy.arange(len(S)) % 2, 'p', 'c')
+        prices = black_scholes_merton(flags, S, K, t, r, sigma, q)
+        for i in range(len(S)):
+            self.assertTrue(almost_equal(
+                prices[i], black_scholes_merton(flags[i], S[i], K[i], t[i], r[i], sigma[i], q[i]),
+                epsilon=1.0e-12))
+
+    def test_vectorized_implied_volatility(self):
+
+        S,K,t,r,sigma,q = self.S,self.K,self.t,self.r,self.sigma,self.q
+        for flag in ['c', 'p']:
+            prices = black_scholes_merton(flag, S, K, t, r, sigma, q)
+            ivs, status = vectorized_implied_volatility(prices, S, K, t, r, q, flag)
+            for i in range(len(S)):
+                iv = implied_volatility(prices[i], S[i], K[i], t[i], r[i], q[i], flag)
+                self.assertEqual(status[i], IV_CONVERGED)
+                self.assertTrue(almost_equal(ivs[i], iv, epsilon=1.0e-12))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import numpy
+import unittest
+
+from vollib.black_scholes_merton.greeks.analytical import delta
+from vollib.black_scholes_merton.greeks.analytical import gamma
+from vollib.black_scholes_merton.greeks.analytical import vega
+from vollib.black_scholes_merton.greeks.analytical import higher_order_greeks
+from vollib.black_scholes_merton.greeks import numerical
+
+
+h = 1e-4
+
+def finite_differences(flag, S, K, t, r, sigma, q):
+
+    """The higher order greeks by central differences of the analytical
+    first order greeks, in the same units."""
+
+    return {
+        'vanna': (delta(flag, S, K, t, r, sigma + h, q) - delta(flag, S, K, t, r, sigma - h, q)) / (2 * h) * .01,
+        'volga': (vega(flag, S, K, t, r, sigma + h, q) - vega(flag, S, K, t, r, sigma - h, q)) / (2 * h) * .01,
+        'charm': (delta(flag, S, K, t - h, r, sigma, q) - delta(flag, S, K, t + h, r, sigma, q)) / (2 * h) / 365.,
+        'speed': (gamma(flag, S + 1e-3, K, t, r, sigma, q) - gamma(flag, S - 1e-3, K, t, r, sigma, q)) / 2e-3,
+        'zomma': (gamma(flag, S, K, t, r, sigma + h, q) - gamma(flag, S, K, t, r, sigma - h, q)) / (2 * h) * .01,
+        'color': (gamma(flag, S, K, t - h, r, sigma, q) - gamma(flag, S, K, t + h, r, sigma, q)) / (2 * h) / 365.,
+    }
+
+
+class testHigherOrderGreeks(unittest.TestCase):
+
+    def test_against_finite_differences(self):
+
+        S = 100.0
+        for flag in ['c', 'p']:
+            for K in numpy.linspace(60, 160, 6):
+                for t in [.1, .5, 2.]:
+                    for sigma in [.15, .3, .6]:
+                        for r, q in [(0., 0.), (.05, .02), (.01, .06)]:
+                            greeks = higher_order_greeks(flag, S, K, t, r, sigma, q)
+                            expected = finite_differences(flag, S, K, t, r, sigma, q)
+                            for name in expected:
+                                self.assertTrue(abs(greeks[name] - expected[name]) <
+                                                1e-6 + 1e-4 * abs(expected[name]), (name, flag, K, t, sigma, r, q))
+
+    def test_arrays(self):
+
+        rs = numpy.random.RandomState(0)
+        flag = numpy.where(rs.rand(500) < .5, 'c', 'p')
+        K = rs.uniform(60., 160., 500)
+        t = rs.uniform(.05, 2., 500)
+        sigma = rs.uniform(.1, .6, 500)
+        q = rs.uniform(0., .05, 500)
+        greeks = higher_order_greeks(flag, 100., K, t, .03, sigma, q)
+        for i in range(0, 500, 37):
+            scalar_greeks = higher_order_greeks(flag[i], 100., K[i], t[i], .03, sigma[i], q[i])
+            for name in scalar_greeks:
+                self.assertTrue(abs(greeks[name][i] - scalar_greeks[name]) <= 1e-12 * max(1., abs(scalar_greeks[name])))
+
+    def test_numerical_all_greeks(self):
+
+        rs = numpy.random.RandomState(0)
+        flag = numpy.where(rs.rand(200) < .5, 'c', 'p')
+        K = rs.uniform(60., 160., 200)
+        t = rs.uniform(.05, 2., 200)
+        sigma = rs.uniform(.1, .6, 200)
+        q = rs.uniform(0., .05, 200)
+        greeks = numerical.all_greeks(flag, 100., K, t, .03, sigma, q)
+        for i in range(0, 200, 13):
+            for name in ['delta', 'gamma', 'theta', 'vega', 'rho']:
+                expected = getattr(numerical, name)(flag[i], 100., K[i], t[i], .03, sigma[i], q[i])
+                self.assertTrue(abs(greeks[name][i] - expected) < 1e-10, (name, i))
+
+
+if __name__ == '__main__':
+    unittest.main()
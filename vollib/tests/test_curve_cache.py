@@ -0,0 +1,58 @@
+import unittest
+
+import numpy
+
+from vollib.helper import curve_cache
+from vollib.helper.curve_cache import CurveCache
+from vollib.black import black
+
+
+class TestCurveCache(unittest.TestCase):
+
+    def test_bit_identical_to_numpy(self):
+
+        cache = CurveCache()
+        for r, t in [(.02, .5), (0, 1.), (-.005, .25), (.05, 1e-4)]:
+            for i in range(2):
+                self.assertEqual(cache.discount_factor(r, t), numpy.exp(-r*t))
+                self.assertEqual(cache.growth_factor(r - .01, t), numpy.exp((r - .01)*t))
+        self.assertEqual((cache.hits, cache.misses), (8, 8))
+
+    def test_arrays_are_not_cached(self):
+
+        cache = CurveCache()
+        r = numpy.array([.01, .02, .03])
+        t = numpy.array([[.25], [.5]])
+        self.assertTrue(numpy.array_equal(cache.discount_factor(r, t), numpy.exp(-r*t)))
+        self.assertTrue(numpy.array_equal(cache.growth_factor(r, .5), numpy.exp(r*.5)))
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_least_recently_used_are_evicted(self):
+
+        cache = CurveCache(maxsize=8)
+        for i in range(8):
+            cache.discount_factor(.01 * i, .5)
+        for i in range(4, 8):
+            cache.discount_factor(.01 * i, .5)
+        cache.discount_factor(.5, .5)
+        self.assertTrue(len(cache) <= 8)
+        misses = cache.misses
+        for i in range(4, 8):
+            cache.discount_factor(.01 * i, .5)
+        self.assertEqual(cache.misses, misses)
+        cache.discount_factor(0., .5)
+        self.assertEqual(cache.misses, misses + 1)
+
+    def test_shared_cache(self):
+
+        curve_cache.clear()
+        hits = curve_cache.hits
+        expected = black('c', 100., 95., .5, .02, .2)
+        self.assertEqual(black('c', 100., 95., .5, .02, .2), expected)
+        self.assertTrue(curve_cache.hits > hits)
+        curve_cache.clear()
+        self.assertEqual(len(curve_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy
+
+from vollib.black_scholes import black_scholes
+from vollib.black_scholes.greeks.analytical import all_greeks
+from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+from vollib.helper.deduplication import unique_rows, map_unique
+
+
+class TestDeduplication(unittest.TestCase):
+
+    def setUp(self):
+
+        rs = numpy.random.RandomState(0)
+        contracts = rs.randint(0, 50, 1000)
+        self.K = numpy.linspace(60., 140., 50)[contracts]
+        self.t = numpy.array([.1, .5])[contracts % 2]
+        self.flag = numpy.where(contracts % 3, 'c', 'p')
+        self.sigma = .2 + contracts / 500.
+
+    def test_unique_rows(self):
+
+        K = numpy.array([90., numpy.nan, 90., numpy.nan, 95.])
+        args, inverse, shape = unique_rows(['c', 'c', 'c', 'c', 'p'], 100., K)
+        self.assertEqual(args[0].tolist(), ['c', 'c', 'p'])
+        self.assertEqual(args[1], 100.)
+        self.assertEqual(inverse.tolist(), [0, 1, 0, 1, 2])
+        self.assertEqual(shape, (5,))
+
+        args, inverse, shape = unique_rows('c', self.K, self.t, self.sigma)
+        rows = zip(*(a[inverse] for a in args[1:]))
+        self.assertEqual(rows, zip(self.K, self.t, self.sigma))
+        self.assertEqual(len(args[1]), len(set(rows)))
+
+    def test_results_match(self):
+
+        price = map_unique(black_scholes, self.flag, 100., self.K, self.t, .01, self.sigma)
+        self.assertTrue(numpy.array_equal(price, black_scholes(self.flag, 100., self.K, self.t, .01, self.sigma)))
+
+        sigma, status = map_unique(vectorized_implied_volatility, price, 100., self.K, self.t, .01, self.flag)
+        expected_sigma, expected_status = vectorized_implied_volatility(price, 100., self.K, self.t, .01, self.flag)
+        self.assertTrue(numpy.array_equal(sigma, expected_sigma))
+        self.assertTrue(numpy.array_equal(status, expected_status))
+
+        flag = self.flag.reshape(10, 100)
+        greeks = map_unique(all_greeks, flag, 100., self.K.reshape(10, 100), self.t.reshape(10, 100), .01, .2)
+        expected = all_greeks(flag, 100., self.K.reshape(10, 100), self.t.reshape(10, 100), .01, .2)
+        self.assertEqual(sorted(greeks), sorted(expected))
+        for name in expected:
+            self.assertEqual(greeks[name].shape, (10, 100))
+            self.assertTrue(numpy.array_equal(greeks[name], expected[name]))
+
+    def test_scalars(self):
+
+        self.assertEqual(map_unique(black_scholes, 'c', 100., 90., .5, .01, .2),
+                         black_scholes('c', 100., 90., .5, .01, .2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator
+from vollib.black_scholes import black_scholes
+from vollib.black_scholes.implied_volatility import implied_volatility, vectorized_implied_volatility
+from vollib.implied_volatility_cache import ImpliedVolatilityCache
+
+
+class TestImpliedVolatilityCache(unittest.TestCase):
+
+    def setUp(self):
+
+        df = TestDataIterator().df
+        self.S, self.K, self.t, self.r = [numpy.array(c, dtype=float) for c in (df.S, df.K, df.t, df.R)]
+        self.flag = numpy.where(numpy.arange(len(df)) % 2, 'p', 'c')
+        self.price = black_scholes(self.flag, self.S, self.K, self.t, self.r, numpy.array(df.v, dtype=float))
+        self.price[0] = 1e6  # above the maximum
+
+    def test_vectorized_against_uncached(self):
+
+        cache = ImpliedVolatilityCache()
+        args = self.price, self.S, self.K, self.t, self.r, self.flag
+        expected_sigma, expected_status = vectorized_implied_volatility(*args)
+        for i in range(2):
+            sigma, status = cache.vectorized_implied_volatility(*args)
+            self.assertTrue(numpy.array_equal(sigma[1:], expected_sigma[1:]))
+            self.assertTrue(numpy.isnan(sigma[0]))
+            self.assertTrue(numpy.array_equal(status, expected_status))
+        # The quote above the maximum is flagged without being looked up.
+        n = len(self.price) - 1
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (n, n, n))
+
+        price = self.price.copy()
+        price[1:4] *= 1.01
+        sigma, status = cache.vectorized_implied_volatility(price, self.S, self.K, self.t, self.r, self.flag)
+        self.assertEqual(cache.misses, n + 3)
+        self.assertTrue(numpy.array_equal(
+            sigma[1:4], vectorized_implied_volatility(price, self.S, self.K, self.t, self.r, self.flag)[0][1:4]))
+
+    def test_scalar_shares_entries(self):
+
+        cache = ImpliedVolatilityCache()
+        i = 5
+        args = self.price[i], self.S[i], self.K[i], self.t[i], self.r[i], self.flag[i]
+        self.assertEqual(cache.implied_volatility(*args), implied_volatility(*args))
+        self.assertEqual(cache.implied_volatility(*args), implied_volatility(*args))
+        cache.vectorized_implied_volatility(*args)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertRaises(KeyError, cache.implied_volatility, 1., 100., 90., .5, .01, 'x')
+
+    def test_quantization(self):
+
+        cache = ImpliedVolatilityCache(quantum={'price': 1e-4})
+        first = cache.implied_volatility(5.87602, 100., 100., .5, .01, 'c')
+        self.assertEqual(cache.implied_volatility(5.876024, 100., 100., .5, .01, 'c'), first)
+        sigma, status = cache.vectorized_implied_volatility([5.87598, 5.8761], 100., 100., .5, .01, 'c')
+        self.assertEqual(sigma[0], first)
+        self.assertNotEqual(sigma[1], first)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_invalid_input(self):
+
+        nan = numpy.nan
+        price = numpy.array([nan, 5., 5., 5., 5., 5.])
+        S = numpy.array([100., 100., 100., -1., 100., 100.])
+        K = numpy.array([100., 100., 100., 100., 0., nan])
+        t = numpy.array([.5, .5, 0., .5, .5, .5])
+        expected_sigma, expected_status = vectorized_implied_volatility(price, S, K, t, .01, 'c')
+        for quantum in [None, 1e-4]:
+            cache = ImpliedVolatilityCache(quantum=quantum)
+            for i in range(2):
+                sigma, status = cache.vectorized_implied_volatility(price, S, K, t, .01, 'c')
+                self.assertEqual(status.tolist(), expected_status.tolist())
+                self.assertTrue(numpy.allclose(sigma, expected_sigma, rtol=1e-14, atol=0, equal_nan=True))
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            # nan quotes get keys on both paths
+            self.assertTrue(numpy.isnan(cache.implied_volatility(nan, 100., 100., .5, .01, 'c')))
+
+    def test_least_recently_used_are_evicted(self):
+
+        cache = ImpliedVolatilityCache(maxsize=8)
+        K = numpy.arange(90., 98.)
+        price = black_scholes('c', 100., K, .5, .01, .2)
+        cache.vectorized_implied_volatility(price, 100., K, .5, .01, 'c')
+        cache.vectorized_implied_volatility(price[4:], 100., K[4:], .5, .01, 'c')
+        cache.implied_volatility(1., 100., 120., .5, .01, 'c')
+        self.assertTrue(len(cache) <= 8)
+        misses = cache.misses
+        cache.vectorized_implied_volatility(price[4:], 100., K[4:], .5, .01, 'c')
+        self.assertEqual(cache.misses, misses)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
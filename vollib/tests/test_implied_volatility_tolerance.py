@@ -0,0 +1,114 @@
+import unittest
+
+import numpy
+
+from vollib.black import black
+from vollib.black.implied_volatility import implied_volatility_of_discounted_option_price
+from vollib.black.implied_volatility import implied_volatility_of_discounted_option_price_with_tolerance
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price_with_tolerance
+from vollib.black.implied_volatility import DEFAULT_MAXIMUM_ITERATIONS
+from vollib.black_scholes import black_scholes
+from vollib.black_scholes import implied_volatility as bs_iv
+from vollib.black_scholes_merton import black_scholes_merton
+from vollib.black_scholes_merton import implied_volatility as bsm_iv
+
+
+class TestImpliedVolatilityTolerance(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rs = numpy.random.RandomState(0)
+        cls.K = rs.uniform(60., 160., 5000)
+        cls.t = rs.uniform(.02, 2., 5000)
+        cls.sigma = rs.uniform(.05, 1., 5000)
+        cls.flag = numpy.where(rs.rand(5000) < .5, 'c', 'p')
+
+    def test_black(self):
+
+        prices = black(self.flag, 100., self.K, self.t, .02, self.sigma)
+        exact, exact_status = vectorized_implied_volatility_of_discounted_option_price(
+            prices, 100., self.K, .02, self.t, self.flag)
+
+        sigma, status, iterations = vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+            prices, 100., self.K, .02, self.t, self.flag)
+        self.assertTrue(numpy.array_equal(status, exact_status))
+        self.assertTrue(numpy.allclose(sigma, exact, rtol=1e-14, atol=0, equal_nan=True))
+
+        previous = iterations.sum()
+        for tolerance in [1e-6, 1e-4, 1e-2]:
+            sigma, status, iterations = vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+                prices, 100., self.K, .02, self.t, self.flag, tolerance)
+            self.assertTrue(numpy.array_equal(status, exact_status))
+            self.assertTrue(numpy.nanmax(numpy.abs(sigma - exact)) <= tolerance)
+            self.assertTrue(iterations.max() <= DEFAULT_MAXIMUM_ITERATIONS)
+            self.assertTrue(iterations.sum() <= previous)
+            previous = iterations.sum()
+
+        sigma, status, iterations = vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+            prices, 100., self.K, .02, self.t, self.flag, max_iterations=0)
+        self.assertEqual(iterations.max(), 0)
+
+        for i in range(0, 5000, 499):
+            iv, n = implied_volatility_of_discounted_option_price_with_tolerance(
+                prices[i], 100., self.K[i], .02, self.t[i], self.flag[i])
+            self.assertAlmostEqual(iv, implied_volatility_of_discounted_option_price(
+                prices[i], 100., self.K[i], .02, self.t[i], self.flag[i]), delta=1e-13)
+            iv, n = implied_volatility_of_discounted_option_price_with_tolerance(
+                prices[i], 100., self.K[i], .02, self.t[i], self.flag[i], 1e-3, 1)
+            self.assertTrue(n <= 1)
+
+    def test_scalar_iterations_match_vectorized(self):
+
+        prices = black(self.flag, 100., self.K, self.t, .02, self.sigma)
+        prices[:10] = 0.
+        prices[10:20] = 1000.
+        for tolerance in [None, 1e-2]:
+            sigma, status, iterations = vectorized_implied_volatility_of_discounted_option_price_with_tolerance(
+                prices, 100., self.K, .02, self.t, self.flag, tolerance)
+            for i in range(0, 5000, 97):
+                iv, n = implied_volatility_of_discounted_option_price_with_tolerance(
+                    prices[i], 100., self.K[i], .02, self.t[i], self.flag[i], tolerance)
+                self.assertEqual(n, iterations[i])
+                if status[i] == 0:
+                    self.assertAlmostEqual(iv, sigma[i], delta=1e-12)
+
+    def test_black_scholes(self):
+
+        prices = black_scholes(self.flag, 100., self.K, self.t, .01, self.sigma)
+        exact, exact_status = bs_iv.vectorized_implied_volatility(prices, 100., self.K, self.t, .01, self.flag)
+        sigma, status, iterations = bs_iv.vectorized_implied_volatility_with_tolerance(
+            prices, 100., self.K, self.t, .01, self.flag, 1e-4)
+        self.assertTrue(numpy.array_equal(status, exact_status))
+        self.assertTrue(numpy.nanmax(numpy.abs(sigma - exact)) <= 1e-4)
+
+        for i in range(0, 5000, 499):
+            iv, n = bs_iv.implied_volatility_with_tolerance(
+                prices[i], 100., self.K[i], self.t[i], .01, self.flag[i], 1e-4)
+            self.assertAlmostEqual(iv, sigma[i], delta=1e-12)
+            self.assertEqual(n, iterations[i])
+
+    def test_black_scholes_merton(self):
+
+        prices = black_scholes_merton(self.flag, 100., self.K, self.t, .01, self.sigma, .03)
+        exact, exact_status = bsm_iv.vectorized_implied_volatility(
+            prices, 100., self.K, self.t, .01, .03, self.flag)
+        sigma, status, iterations = bsm_iv.vectorized_implied_volatility_with_tolerance(
+            prices, 100., self.K, self.t, .01, .03, self.flag, 1e-4)
+        self.assertTrue(numpy.array_equal(status, exact_status))
+        self.assertTrue(numpy.nanmax(numpy.abs(sigma - exact)) <= 1e-4)
+
+        for i in range(0, 5000, 499):
+            iv, n = bsm_iv.implied_volatility_with_tolerance(
+                prices[i], 100., self.K[i], self.t[i], .01, .03, self.flag[i], 1e-4)
+            self.assertAlmostEqual(iv, sigma[i], delta=1e-12)
+            self.assertEqual(n, iterations[i])
+            self.assertAlmostEqual(
+                bsm_iv.implied_volatility_limited_iterations(
+                    prices[i], 100., self.K[i], self.t[i], .01, .03, self.flag[i], 2),
+                bsm_iv.implied_volatility(prices[i], 100., self.K[i], self.t[i], .01, .03, self.flag[i]),
+                delta=1e-13)
+
+
+if __name__ == '__main__':
+    unittest.main()
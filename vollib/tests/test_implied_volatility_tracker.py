@@ -0,0 +1,69 @@
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator
+from vollib.black import black
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price
+from vollib.implied_volatility_tracker import ImpliedVolatilityTracker
+from vollib.helper import IV_CONVERGED, IV_BELOW_INTRINSIC, IV_INVALID_INPUT
+
+
+class TestImpliedVolatilityTracker(unittest.TestCase):
+
+    def setUp(self):
+        df = TestDataIterator().df
+        self.F = df.S.values * numpy.exp(df.R.values * df.t.values)
+        self.K,self.t,self.r,self.sigma = df.K.values,df.t.values,df.R.values,df.v.values
+        self.flag = numpy.where(self.K < self.F, 'p', 'c')
+        self.contracts = numpy.arange(len(self.F))
+
+    def tick(self, tracker, F, sigma):
+        prices = black(self.flag, F, self.K, self.t, self.r, sigma)
+        expected, expected_status = vectorized_implied_volatility_of_discounted_option_price(
+            prices, F, self.K, self.r, self.t, self.flag)
+        ivs, status = tracker.implied_volatility(self.contracts, prices, F, self.K, self.r, self.t, self.flag)
+        self.assertEqual(status.tolist(), expected_status.tolist())
+        self.assertTrue(numpy.allclose(ivs, expected, rtol=1e-13, atol=0))
+
+    def test_warm_start_against_full_solver(self):
+
+        tracker = ImpliedVolatilityTracker()
+        self.tick(tracker, self.F, self.sigma)
+        self.assertEqual((tracker.warm_starts, tracker.fallbacks), (0, len(self.F)))
+        for move in [1.0005, 1.001, .999]:
+            self.tick(tracker, self.F * move, self.sigma * move)
+        self.assertTrue(tracker.warm_starts > .9 * 3 * len(self.F))
+
+        # A large move falls back to the full solver where needed.
+        self.tick(tracker, self.F * 1.2, self.sigma * 2)
+
+    def test_status_and_forget(self):
+
+        tracker = ImpliedVolatilityTracker()
+        prices = black('c', 100., 90., .5, .01, .2)
+        ivs, status = tracker.implied_volatility(['A', 'B', 'C'], [prices, 1., prices], 100., 90., .01,
+                                                 [.5, .5, 0.], 'c')
+        self.assertEqual(status.tolist(), [IV_CONVERGED, IV_BELOW_INTRINSIC, IV_INVALID_INPUT])
+        # Quotes outside the no-arbitrage bounds are not solved at all.
+        self.assertEqual((tracker.warm_starts, tracker.fallbacks), (0, 1))
+
+        tracker.forget('A')
+        ivs, status = tracker.implied_volatility(['A', 'B'], [prices, prices], 100., 90., .01, .5, 'c')
+        self.assertEqual((tracker.warm_starts, tracker.fallbacks), (0, 3))
+        self.assertTrue(numpy.allclose(ivs, .2, rtol=1e-14, atol=0))
+
+    def test_remove(self):
+
+        tracker = ImpliedVolatilityTracker()
+        self.tick(tracker, self.F, self.sigma)
+        tracker.remove(self.contracts[::2])
+        self.assertEqual(len(tracker), len(self.F) // 2)
+        self.tick(tracker, self.F, self.sigma)
+        # Removed contracts are solved from scratch and tracked again.
+        self.assertEqual(tracker.fallbacks, len(self.F) + len(self.contracts[::2]))
+        self.assertEqual(len(tracker), len(self.F))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator
+from vollib.black import black, normalised_black
+from vollib.black.lookup_table import NormalisedBlackTable
+
+
+class TestNormalisedBlackTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = NormalisedBlackTable(h_points=1025, s_points=129)
+
+    def test_error_bound(self):
+
+        rs = numpy.random.RandomState(0)
+        x = rs.uniform(-3., 3., 20000)
+        s = rs.uniform(0., 2., 20000)
+        x[:1000] *= 1e-3
+        s[1000:2000] *= 1e-3
+        flag = numpy.where(rs.rand(20000) < .5, 'c', 'p')
+        error = self.table.normalised_black(x, s, flag) - normalised_black(x, s, flag)
+        self.assertTrue(numpy.abs(error).max() <= self.table.max_error)
+
+        for i in range(0, 20000, 997):
+            self.assertTrue(abs(self.table.normalised_black(x[i], s[i], flag[i]) -
+                                normalised_black(x[i], s[i], flag[i])) <= self.table.max_error)
+
+    def test_outside_the_table_is_exact(self):
+
+        x = numpy.array([-0.2, 0.3, 0.1])
+        s = numpy.array([2.5, 0., 10.])
+        self.assertTrue(numpy.allclose(self.table.normalised_black(x, s, 'p'), normalised_black(x, s, 'p'),
+                                       rtol=1e-14, atol=0.))
+
+    def test_black_against_test_data(self):
+
+        df = TestDataIterator().df
+        for i in range(len(df)):
+            F,K,t,r,sigma = df.S[i],df.K[i],df.t[i],df.R[i],df.v[i]
+            flag = 'p' if i % 2 else 'c'
+            bound = numpy.exp(-r*t) * numpy.sqrt(F*K) * self.table.max_error
+            self.assertTrue(abs(self.table.black(flag, F, K, t, r, sigma) - black(flag, F, K, t, r, sigma)) <= bound)
+
+    def test_save_and_load(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'table.npz')
+            self.table.save(path)
+            table = NormalisedBlackTable.load(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(table.max_error, self.table.max_error)
+        self.assertTrue(numpy.array_equal(table.values, self.table.values))
+        self.assertEqual(table.normalised_black(.1, .3, 'c'), self.table.normalised_black(.1, .3, 'c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import almost_equal
+from vollib.option_chain import OptionChain
+from vollib.black import black
+from vollib.black.greeks import analytical as black_analytical
+from vollib.black_scholes_merton import black_scholes_merton
+from vollib.black_scholes_merton.implied_volatility import vectorized_implied_volatility
+from vollib.black_scholes_merton.greeks import analytical
+from vollib.helper import IV_CONVERGED, IV_INVALID_INPUT
+
+
+class TestOptionChain(unittest.TestCase):
+
+    def setUp(self):
+        # two underlyings with three expiries of twenty strikes each
+        strikes = numpy.linspace(.7, 1.3, 20)
+        self.underlying = numpy.repeat(['SPX', 'SX5E'], 60)
+        self.S = numpy.where(self.underlying == 'SPX', 2000., 3500.)
+        self.q = numpy.where(self.underlying == 'SPX', .02, .035)
+        self.t = numpy.tile(numpy.repeat([.1, .5, 2.], 20), 2)
+        self.r = numpy.interp(self.t, [0., 1., 2.], [.01, .015, .02])
+        self.K = self.S * numpy.tile(strikes, 6)
+        self.flag = numpy.where(self.K < self.S, 'p', 'c')
+        self.sigma = .15 + .1 * numpy.abs(numpy.log(self.K / self.S))
+        self.chain = OptionChain(self.flag, self.S, self.K, self.t, self.r, self.q, self.underlying)
+
+    def test_groups(self):
+
+        self.assertEqual(len(self.chain), 120)
+        self.assertEqual(len(self.chain.forward), 6)
+        self.assertRaises(ValueError, OptionChain, 'c', [100., 101.], 100., .5, .01)
+
+    def test_price_and_implied_volatility(self):
+
+        prices = self.chain.price(self.sigma)
+        expected = black_scholes_merton(self.flag, self.S, self.K, self.t, self.r, self.sigma, self.q)
+        self.assertTrue(numpy.all(prices == expected))
+
+        prices[0] = 1.0e6
+        sigma, status = self.chain.implied_volatility(prices)
+        expected_sigma, expected_status = vectorized_implied_volatility(
+            prices, self.S, self.K, self.t, self.r, self.q, self.flag)
+        self.assertEqual(status.tolist(), expected_status.tolist())
+        self.assertTrue(numpy.isnan(sigma[0]))
+        self.assertTrue(numpy.allclose(sigma[1:], expected_sigma[1:], rtol=1e-14, atol=0))
+
+    def test_invalid_input(self):
+
+        t = numpy.array([.5, .5, .5, 0.])
+        chain = OptionChain(['c', 'c', 'p', 'c'], 100., [90., 0., 110., 90.], t, .01)
+        prices = numpy.array([numpy.nan, 5., 12., 10.])
+        sigma, status = chain.implied_volatility(prices)
+        expected_sigma, expected_status = vectorized_implied_volatility(
+            prices, 100., chain.K, t, .01, 0., ['c', 'c', 'p', 'c'])
+        self.assertEqual(status.tolist(), expected_status.tolist())
+        self.assertEqual(status.tolist(), [IV_INVALID_INPUT, IV_INVALID_INPUT, IV_CONVERGED, IV_INVALID_INPUT])
+        self.assertTrue(numpy.isnan(sigma[status != IV_CONVERGED]).all())
+
+    def test_greeks(self):
+
+        greeks = self.chain.greeks(self.sigma)
+        for i in range(len(self.chain)):
+            args = (self.flag[i], self.S[i], self.K[i], self.t[i], self.r[i], self.sigma[i], self.q[i])
+            for name in ['delta', 'gamma', 'theta', 'vega', 'rho']:
+                self.assertTrue(almost_equal(greeks[name][i], getattr(analytical, name)(*args), epsilon=1.0e-10))
+
+    def test_futures_chain(self):
+
+        K = numpy.array([80., 100., 120.])
+        chain = OptionChain.from_futures(['p', 'c', 'c'], 100., K, .75, .03)
+        greeks = chain.greeks(.25)
+        for i, flag in enumerate(['p', 'c', 'c']):
+            self.assertTrue(almost_equal(greeks['price'][i], black(flag, 100., K[i], .75, .03, .25), epsilon=1.0e-12))
+            for name in ['delta', 'gamma', 'theta', 'vega', 'rho']:
+                self.assertTrue(almost_equal(
+                    greeks[name][i], getattr(black_analytical, name)(flag, 100., K[i], .75, .03, .25), epsilon=1.0e-10))
+
+    def test_update_spot(self):
+
+        self.chain.update_spot(3600., 'SX5E')
+        S = numpy.where(self.underlying == 'SPX', 2000., 3600.)
+        chain = OptionChain(self.flag, S, self.K, self.t, self.r, self.q, self.underlying)
+        self.assertTrue(numpy.all(self.chain.price(self.sigma) == chain.price(self.sigma)))
+        self.assertRaises(KeyError, self.chain.update_spot, 100., 'DAX')
+
+
+if __name__ == '__main__':
+    unittest.main()
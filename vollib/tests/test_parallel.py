@@ -0,0 +1,123 @@
+import threading
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator
+from vollib.helper import parallel
+from vollib.helper.parallel import ChunkedExecutor, ProcessExecutor
+from vollib.black_scholes import black_scholes
+from vollib.black_scholes.implied_volatility import vectorized_implied_volatility
+from vollib.black_scholes.greeks.analytical import all_greeks
+from vollib.black.implied_volatility import vectorized_implied_volatility_of_discounted_option_price
+
+
+class TestChunkedExecutor(unittest.TestCase):
+
+    def setUp(self):
+        df = TestDataIterator().df
+        # repeat the benchmark rows with shifted strikes, to get a few chunks
+        n = len(df)
+        self.S = numpy.tile(df.S.values, 20)
+        self.K = numpy.tile(df.K.values, 20) * numpy.repeat(numpy.linspace(.8, 1.2, 20), n)
+        self.t = numpy.tile(df.t.values, 20)
+        self.r = numpy.tile(df.R.values, 20)
+        self.sigma = numpy.tile(df.v.values, 20)
+        self.flag = numpy.where(self.K < self.S, 'p', 'c')
+        self.executor = ChunkedExecutor(workers=3, chunk_size=97)
+
+    def tearDown(self):
+        self.executor.close()
+
+    def test_bit_identical_to_serial(self):
+
+        args = (self.flag, self.S, self.K, self.t, self.r, self.sigma)
+        prices = self.executor.map(black_scholes, *args)
+        self.assertTrue(numpy.array_equal(prices, black_scholes(*args)))
+
+        sigma, status = self.executor.map(
+            vectorized_implied_volatility, prices, self.S, self.K, self.t, self.r, self.flag)
+        expected_sigma, expected_status = vectorized_implied_volatility(
+            prices, self.S, self.K, self.t, self.r, self.flag)
+        self.assertTrue(numpy.array_equal(sigma, expected_sigma))
+        self.assertTrue(numpy.array_equal(status, expected_status))
+
+        F = self.S * numpy.exp(self.r * self.t)
+        sigma, status = self.executor.map(
+            vectorized_implied_volatility_of_discounted_option_price, prices, F, self.K, self.r, self.t, self.flag)
+        expected_sigma, expected_status = vectorized_implied_volatility_of_discounted_option_price(
+            prices, F, self.K, self.r, self.t, self.flag)
+        self.assertTrue(numpy.array_equal(sigma, expected_sigma))
+
+        greeks = self.executor.map(all_greeks, *args)
+        expected = all_greeks(*args)
+        for name in expected:
+            self.assertTrue(numpy.array_equal(greeks[name], expected[name]))
+
+    def test_concurrent_calls_share_one_pool(self):
+
+        pools = []
+        original = parallel.ThreadPool
+
+        class CountingThreadPool(original):
+            def __init__(self, *args, **kwargs):
+                pools.append(self)
+                original.__init__(self, *args, **kwargs)
+
+        parallel.ThreadPool = CountingThreadPool
+        try:
+            args = (self.flag, self.S, self.K, self.t, self.r, self.sigma)
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(self.executor.map(black_scholes, *args)))
+                       for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            parallel.ThreadPool = original
+
+        self.assertEqual(len(pools), 1)
+        self.assertEqual(len(results), 8)
+        for prices in results:
+            self.assertTrue(numpy.array_equal(prices, black_scholes(*args)))
+
+    def test_process_executor(self):
+
+        executor = ProcessExecutor(processes=2, chunk_size=97)
+        args = (self.flag, self.S, self.K, self.t, self.r, self.sigma)
+        prices = executor.map(black_scholes, *args)
+        self.assertTrue(numpy.array_equal(prices, black_scholes(*args)))
+        # The pool is reused by calls that fit its shared buffer
+        pool = executor._pool
+        self.assertTrue(numpy.array_equal(executor.map(black_scholes, *args), prices))
+        self.assertTrue(executor._pool is pool)
+
+        sigma, status = executor.map(
+            vectorized_implied_volatility, prices, self.S, self.K, self.t, self.r, self.flag)
+        expected_sigma, expected_status = vectorized_implied_volatility(
+            prices, self.S, self.K, self.t, self.r, self.flag)
+        self.assertTrue(numpy.array_equal(sigma, expected_sigma))
+        self.assertTrue(numpy.array_equal(status, expected_status))
+
+        greeks = executor.map(all_greeks, *args)
+        expected = all_greeks(*args)
+        for name in expected:
+            self.assertTrue(numpy.array_equal(greeks[name], expected[name]))
+
+        executor.close()
+        self.assertTrue(executor._pool is None)
+        with executor:
+            self.assertTrue(numpy.array_equal(executor.map(black_scholes, *args), prices))
+        self.assertTrue(executor._pool is None)
+
+    def test_shapes_and_scalars(self):
+
+        K = self.K[:600].reshape(20, 30)
+        prices = self.executor.map(black_scholes, 'c', 100., K, .5, .01, .2)
+        self.assertEqual(prices.shape, (20, 30))
+        self.assertTrue(numpy.array_equal(prices, black_scholes('c', 100., K, .5, .01, .2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import time
+import unittest
+
+import numpy
+
+from vollib.tests.test_utils import TestDataIterator, almost_equal
+from vollib.black_scholes import black_scholes
+from vollib.black_scholes.implied_volatility import implied_volatility
+from vollib.black_scholes.greeks import analytical
+from vollib.streaming import micro_batches, implied_volatility_and_greeks
+from vollib.helper import IV_CONVERGED, IV_BELOW_INTRINSIC, IV_INVALID_INPUT
+
+
+class TestStreaming(unittest.TestCase):
+
+    def test_implied_volatility_and_greeks(self):
+
+        df = TestDataIterator().df
+        quotes = []
+        for i in range(len(df)):
+            S,K,t,r,sigma = df.S[i],df.K[i],df.t[i],df.R[i],df.v[i]
+            flag = 'p' if i % 2 else 'c'
+            quotes.append({'id': i, 'flag': flag, 'price': black_scholes(flag, S, K, t, r, sigma),
+                           'S': S, 'K': K, 't': t, 'r': r})
+        quotes.append({'id': -1, 'flag': 'c', 'price': 1., 'S': 100., 'K': 90., 't': .5, 'r': .01})
+
+        records = list(implied_volatility_and_greeks(iter(quotes), batch_size=7))
+        self.assertEqual([record['id'] for record in records], [quote['id'] for quote in quotes])
+        for record in records[:-1]:
+            args = record['S'], record['K'], record['t'], record['r']
+            self.assertEqual(record['iv_status'], IV_CONVERGED)
+            self.assertTrue(almost_equal(
+                record['iv'], implied_volatility(record['price'], *(args + (record['flag'],))), epsilon=1.0e-12))
+            if record['iv'] == 0.:
+                continue  # quoted at intrinsic value, where the greeks are undefined
+            for name in ['delta', 'gamma', 'theta', 'vega', 'rho']:
+                self.assertTrue(almost_equal(
+                    record[name], getattr(analytical, name)(record['flag'], *(args + (record['iv'],))),
+                    epsilon=1.0e-10))
+        self.assertEqual(records[-1]['iv_status'], IV_BELOW_INTRINSIC)
+        self.assertTrue(numpy.isnan(records[-1]['delta']))
+
+    def test_batch_deadline(self):
+
+        def feed():
+            for i in range(3):
+                yield i
+            time.sleep(.5)
+            for i in range(3, 5):
+                yield i
+
+        started = time.time()
+        batches = micro_batches(feed(), batch_size=100, deadline=.05)
+        self.assertEqual(batches.next(), [0, 1, 2])
+        self.assertTrue(time.time() - started < .4)
+        self.assertEqual(list(batches), [[3, 4]])
+
+    def test_errors_are_raised(self):
+
+        def feed():
+            yield 1
+            raise ValueError('feed failed')
+
+        self.assertRaises(ValueError, list, micro_batches(feed()))
+
+    def test_closed_consumer_stops_reader(self):
+
+        closed = []
+
+        def feed():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.append(True)
+
+        readers = threading.active_count()
+        batches = micro_batches(feed(), batch_size=4)
+        self.assertEqual(batches.next(), [0, 1, 2, 3])
+        batches.close()
+        for i in range(50):
+            if closed and threading.active_count() == readers:
+                break
+            time.sleep(.1)
+        self.assertEqual(closed, [True])
+        self.assertEqual(threading.active_count(), readers)
+
+    def test_invalid_records(self):
+
+        price = black_scholes('c', 100., 90., .5, .01, .2)
+        quotes = [{'flag': 'c', 'price': price, 'S': 100., 'K': 90., 't': .5, 'r': .01},
+                  {'flag': 'x', 'price': price, 'S': 100., 'K': 90., 't': .5, 'r': .01},
+                  {'flag': 'c', 'price': price, 'S': 100., 'K': 90., 't': .5},
+                  {'flag': 'c', 'price': 'n/a', 'S': 100., 'K': 90., 't': .5, 'r': .01},
+                  {'flag': 'p', 'price': price, 'S': 100., 'K': 110., 't': .5, 'r': .01}]
+        records = list(implied_volatility_and_greeks(quotes))
+        self.assertEqual([record['iv_status'] for record in records],
+                         [IV_CONVERGED, IV_INVALID_INPUT, IV_INVALID_INPUT, IV_INVALID_INPUT, IV_CONVERGED])
+        self.assertTrue(all(numpy.isnan(record['iv']) and numpy.isnan(record['delta']) for record in records[1:4]))
+        self.assertEqual(records[1]['flag'], 'x')
+
+
+if __name__ == '__main__':
+    unittest.main()